@@ -9,17 +9,40 @@ let currentFontSize = localStorage.getItem('modalFontSize') || 'medium';
 let showTranslation = false;
 let currentTitleData = null;
 let searchTimeout = null;
+// Search runs in js/search-worker.js when available; results stream in as they are found
+let searchWorker = null;
+let activeSearchId = 0;
+const SEARCH_DEBOUNCE_MS = 30;
+// Watches the end of the results while the worker still has content matches to verify
+let searchMoreObserver = null;
 
 // ============================================
 // DATA LOADING
 // ============================================
+// Sharded build (generate_json.py --sharded): catalog.json holds the structure only,
+// each theme's publications are fetched from its shard the first time they are needed.
+const shardThemes = {};
+const shardRequests = {};
+const htmlRequests = {};
+let pendingContentTitle = null;
+// Repeated bodies are stored once: content id -> first publication stub with that id,
+// and the stubs waiting for its content
+const canonicalPublications = {};
+const bodyWaiters = {};
+// duplicates.json (generate_json.py --duplicates): "v/t/ti/p" -> other locations of the same body
+let duplicateLinks = null;
+// ids.json (generate_json.py --ids): stable id -> location, for deep links (#/<id>) and history
+let idLocations = null;
+
 async function loadData() {
     try {
-        const response = await fetch('data/shin_college_data.json');
-        data = await response.json();
-
-
+        data = await loadCatalog();
 
+        if (!data) {
+            // Fallback: monolithic build
+            const response = await fetch('data/shin_college_data.json');
+            data = await response.json();
+        }
 
         initializeApp();
     } catch (error) {
@@ -34,12 +57,436 @@ async function loadData() {
     }
 }
 
+async function loadCatalog() {
+    const response = await fetch('data/catalog.json');
+    if (!response.ok) return null;
+    const catalog = await response.json();
+
+    // Publications start as stubs that only know their content id and shard;
+    // loadShard fills them in place, so grouped copies see the content too
+    catalog.volumes.forEach(volume => {
+        volume.themes.forEach(theme => {
+            shardThemes[theme.shard] = theme;
+            theme.titles.forEach(title => {
+                title.publications = title.content_ids.map(id => {
+                    const stub = { contentId: id, shard: theme.shard };
+                    if (id !== null && !canonicalPublications[id]) canonicalPublications[id] = stub;
+                    return stub;
+                });
+            });
+        });
+    });
+
+    return catalog.volumes;
+}
+
+function loadShard(shardPath) {
+    if (!shardRequests[shardPath]) {
+        shardRequests[shardPath] = fetch(`data/${shardPath}`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(shard => {
+                const theme = shardThemes[shardPath];
+                shard.titles.forEach((pubs, titleIndex) => {
+                    pubs.forEach((pub, pubIndex) => {
+                        const stub = theme.titles[titleIndex].publications[pubIndex];
+                        Object.assign(stub, pub);
+                        delete stub.shard;
+                        resolveBody(stub);
+                    });
+                });
+            })
+            .catch(error => {
+                // Allow a retry on the next request
+                delete shardRequests[shardPath];
+                throw error;
+            });
+    }
+    return shardRequests[shardPath];
+}
+
+function resolveBody(stub) {
+    if (stub.contentId === null || stub.contentId === undefined) return;
+    const canonical = canonicalPublications[stub.contentId];
+
+    if (stub.content === undefined) {
+        if (canonical.content !== undefined) {
+            stub.content = canonical.content;
+        } else {
+            (bodyWaiters[stub.contentId] = bodyWaiters[stub.contentId] || []).push(stub);
+        }
+    } else if (canonical === stub && bodyWaiters[stub.contentId]) {
+        bodyWaiters[stub.contentId].forEach(waiter => { waiter.content = stub.content; });
+        delete bodyWaiters[stub.contentId];
+    }
+}
+
+function getPendingShards(title) {
+    const paths = new Set();
+    title.publications.forEach(pub => {
+        if (pub.shard) {
+            paths.add(pub.shard);
+        } else if (pub.content === undefined && pub.contentId !== null && pub.contentId !== undefined) {
+            // Body stored with the first copy, in another shard
+            const canonical = canonicalPublications[pub.contentId];
+            if (canonical && canonical.shard) paths.add(canonical.shard);
+        }
+    });
+    return Array.from(paths);
+}
+
+// HTML fragments (generate_json.py --html): one file per theme, aligned with theme.titles,
+// fetched the first time a title of the theme is opened
+function loadHtml(v, t) {
+    const key = `${v}/${t}`;
+    if (!htmlRequests[key]) {
+        const theme = data[v].themes[t];
+        htmlRequests[key] = fetch(`data/${theme.html}`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(fragments => {
+                fragments.forEach((titleFragments, titleIndex) => {
+                    titleFragments.forEach((fragment, pubIndex) => {
+                        theme.titles[titleIndex].publications[pubIndex].html = fragment;
+                    });
+                });
+                theme.htmlLoaded = true;
+            })
+            .catch(error => {
+                // Allow a retry on the next request
+                delete htmlRequests[key];
+                throw error;
+            });
+    }
+    return htmlRequests[key];
+}
+
+function getPendingHtml(title) {
+    const keys = new Set();
+    title.publications.forEach(pub => {
+        const [v, t] = pub.location;
+        const theme = data[v].themes[t];
+        if (theme.html && !theme.htmlLoaded) keys.add(`${v}/${t}`);
+    });
+    return Array.from(keys, key => key.split('/').map(Number));
+}
+
+function loadDuplicates() {
+    fetch('data/duplicates.json')
+        .then(response => response.ok ? response.json() : null)
+        .then(duplicates => {
+            if (!duplicates) return;
+            const links = {};
+            duplicates.groups.forEach(group => {
+                group.members.forEach(location => {
+                    links[location.join('/')] = group.members.filter(other => other !== location);
+                });
+            });
+            duplicateLinks = links;
+        })
+        .catch(error => console.warn('duplicates.json not used:', error));
+}
+
+function loadIdIndex() {
+    fetch('data/ids.json')
+        .then(response => response.ok ? response.json() : null)
+        .then(index => {
+            if (!index) return;
+            // Objects learn their id, so the modal can write the deep link of what it shows
+            Object.entries(index.ids).forEach(([id, [v, t, third, p]]) => {
+                const volume = data[v];
+                if (t === undefined) volume.stableId = id;
+                else if (third === undefined) volume.themes[t].stableId = id;
+                else if (p === undefined) volume.themes[t].titleGroups[third].stableId = id;
+                else volume.themes[t].titles[third].publications[p].stableId = id;
+            });
+            idLocations = index.ids;
+            window.addEventListener('hashchange', openDeepLink);
+            openDeepLink();
+        })
+        .catch(error => console.warn('ids.json not used:', error));
+}
+
+// #/<volume>/<theme>/<group>/<publication>, any prefix of it
+function openDeepLink() {
+    const id = decodeURIComponent(window.location.hash.replace(/^#\/?/, ''));
+    if (id) openById(id);
+}
+
+function openById(id) {
+    const target = idLocations ? idLocations[id] : null;
+    if (!target) return false;
+
+    const [v, t, third, p] = target;
+    if (t === undefined) {
+        showThemes(v);
+    } else if (third === undefined) {
+        showTitles(v, t);
+    } else {
+        const theme = data[v].themes[t];
+        const groupIndex = p === undefined ? third : theme.groupOfTitle[third];
+        window.currentGroupedTitles = theme.titleGroups;
+        showContent(theme.titleGroups[groupIndex], p === undefined ? null : id);
+    }
+    return true;
+}
+
+// Id of the group shown for titleData: the group itself, or the group of a single title
+function linkIdOf(titleData) {
+    if (titleData.stableId) return titleData.stableId;
+    const path = titleData.pathInfo;
+    if (!path || path.titleIndex === undefined || !data[path.volumeIndex]) return null;
+    const theme = data[path.volumeIndex].themes[path.themeIndex];
+    const group = theme ? theme.titleGroups[theme.groupOfTitle[path.titleIndex]] : null;
+    return group && group.stableId ? group.stableId : null;
+}
+
+function updateLocationHash(titleData, pubId = null) {
+    const id = pubId || (titleData ? linkIdOf(titleData) : null);
+    const url = window.location.pathname + window.location.search + (id ? `#/${id}` : '');
+    window.history.replaceState(null, '', url);
+}
+
+// Publications remember where they live, for the "also appears in" links
+function tagPublicationLocations() {
+    data.forEach((volume, v) => {
+        volume.themes.forEach((theme, t) => {
+            theme.titles.forEach((title, ti) => {
+                title.publications.forEach((pub, p) => {
+                    pub.location = [v, t, ti, p];
+                });
+            });
+        });
+    });
+}
+
+// Title groups come from the build (scripts/title_groups.py): materialize them once, sharing the
+// publication objects of their titles (catalog stubs are filled in place by loadShard)
+function prepareTitleGroups() {
+    data.forEach((volume, v) => {
+        volume.themes.forEach((theme, t) => {
+            const pathInfo = {
+                volume: formatVolumeName(volume.volume),
+                theme: theme.theme,
+                volumeIndex: v,
+                themeIndex: t
+            };
+            theme.groupOfTitle = [];
+            theme.titleGroups = theme.groups.map((group, g) => {
+                group.titles.forEach(ti => { theme.groupOfTitle[ti] = g; });
+                if (group.title === '---') return { title: '---', publications: [] };
+                return {
+                    id: group.id,
+                    index: g,
+                    title: group.title,
+                    titleIndices: group.titles,
+                    publications: group.titles.flatMap(ti => theme.titles[ti].publications),
+                    pathInfo
+                };
+            });
+        });
+    });
+}
+
+// Group id of a title shown in the modal (a group, or a single title opened from search)
+function groupIdOf(titleData) {
+    if (titleData.id) return titleData.id;
+    const path = titleData.pathInfo;
+    if (!path || path.titleIndex === undefined || !data[path.volumeIndex]) return null;
+    const theme = data[path.volumeIndex].themes[path.themeIndex];
+    const group = theme ? theme.titleGroups[theme.groupOfTitle[path.titleIndex]] : null;
+    return group ? group.id : null;
+}
+
+function prefetchThemeShard(theme) {
+    if (theme && theme.shard && shardThemes[theme.shard]) {
+        loadShard(theme.shard).catch(error => console.error('Error loading shard:', error));
+    }
+}
+
+// ============================================
+// VIRTUALIZED RENDERING
+// ============================================
+// Long lists are split into blocks (one publication, or a run of title rows). A block is only
+// rendered while it is near the visible area of its scroll root; elsewhere it is an empty
+// placeholder of the same height (estimated until it has been rendered once), so the scroll
+// height and element ids (目次 anchors) stay valid while the DOM stays small.
+const VIRTUAL_MARGIN_PX = 1500;
+const TITLE_ROWS_PER_BLOCK = 50;
+const TITLE_ROW_HEIGHT_PX = 60;
+const SEPARATOR_ROW_HEIGHT_PX = 24;
+
+// root: the scrolling element (null for the page). blocks: { id, className, estimate, render }
+function createVirtualList(container, root = null) {
+    clearVirtualList(container);
+
+    const blocks = new Map(); // element -> block
+    const observer = new IntersectionObserver(entries => {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                renderBlock(entry.target);
+            } else {
+                releaseBlock(entry.target);
+            }
+        });
+    }, { root, rootMargin: `${VIRTUAL_MARGIN_PX}px 0px` });
+
+    function renderBlock(element) {
+        const block = blocks.get(element);
+        if (!block || block.rendered) return;
+        const before = element.offsetHeight;
+        element.innerHTML = block.render();
+        element.style.height = '';
+        block.rendered = true;
+        keepScrollPosition(element, element.offsetHeight - before);
+    }
+
+    function releaseBlock(element) {
+        const block = blocks.get(element);
+        if (!block || !block.rendered) return;
+        // Hidden (closed modal, collapsed card): keep it, there is no height to preserve
+        const height = element.offsetHeight;
+        if (height === 0) return;
+        element.style.height = `${height}px`;
+        element.innerHTML = '';
+        block.rendered = false;
+    }
+
+    // A block above the visible area changing height would move the content being read
+    function keepScrollPosition(element, delta) {
+        if (!delta) return;
+        const rootTop = root ? root.getBoundingClientRect().top : 0;
+        if (element.getBoundingClientRect().top < rootTop) {
+            if (root) {
+                root.scrollTop += delta;
+            } else {
+                window.scrollBy(0, delta);
+            }
+        }
+    }
+
+    const list = {
+        // eager: number of leading blocks rendered right away (no placeholder flash)
+        append(newBlocks, eager = 0) {
+            const fragment = document.createDocumentFragment();
+            const elements = newBlocks.map(block => {
+                const element = document.createElement('div');
+                element.className = block.className || '';
+                if (block.id) element.id = block.id;
+                element.style.height = `${block.estimate}px`;
+                blocks.set(element, { render: block.render, rendered: false });
+                fragment.appendChild(element);
+                return element;
+            });
+            container.appendChild(fragment);
+            elements.forEach((element, index) => {
+                if (index < eager) renderBlock(element);
+                observer.observe(element);
+            });
+        },
+        renderAll() {
+            blocks.forEach((block, element) => renderBlock(element));
+        },
+        disconnect() {
+            observer.disconnect();
+            blocks.clear();
+        }
+    };
+
+    container._virtualList = list;
+    return list;
+}
+
+function clearVirtualList(container) {
+    if (container._virtualList) {
+        container._virtualList.disconnect();
+        delete container._virtualList;
+    }
+    container.innerHTML = '';
+}
+
+// Title rows in blocks of TITLE_ROWS_PER_BLOCK; renderRow(title, index) returns the row HTML
+function renderVirtualTitleRows(container, titles, renderRow, root = null, eager = 1) {
+    const list = createVirtualList(container, root);
+    list.append(titleRowBlocks(titles, renderRow, 0), eager);
+    return list;
+}
+
+function titleRowBlocks(titles, renderRow, offset) {
+    const blocks = [];
+    for (let start = 0; start < titles.length; start += TITLE_ROWS_PER_BLOCK) {
+        const rows = titles.slice(start, start + TITLE_ROWS_PER_BLOCK);
+        const estimate = rows.reduce((sum, title) =>
+            sum + (title.title === '---' ? SEPARATOR_ROW_HEIGHT_PX : TITLE_ROW_HEIGHT_PX), 0);
+        blocks.push({
+            className: 'virtual-rows',
+            estimate,
+            render: () => rows.map((title, i) => renderRow(title, offset + start + i)).join('')
+        });
+    }
+    return blocks;
+}
+
+// Rough rendered height of a publication, from its text length and the modal's font metrics
+function estimatePublicationHeight(text, metrics) {
+    let lines = 0;
+    (text || '').split('\n').forEach(line => {
+        lines += Math.max(1, Math.ceil(line.length / metrics.charsPerLine));
+    });
+    return metrics.chrome + lines * metrics.lineHeight;
+}
+
+function publicationMetrics(modalBody) {
+    const fontSize = parseFloat(getComputedStyle(modalBody).fontSize) || 16;
+    const width = modalBody.clientWidth || 600;
+    return {
+        // CJK glyphs are about 1em wide; .publication-content has line-height 1.8
+        charsPerLine: Math.max(10, Math.floor(width / fontSize)),
+        lineHeight: fontSize * 1.8,
+        // Header, margins and bottom border
+        chrome: fontSize * 7
+    };
+}
+
+function getModalScroller() {
+    // Mobile layout scrolls .modal-scrollable-area, desktop scrolls .modal-content
+    const area = document.querySelector('#contentModal .modal-scrollable-area');
+    if (area && getComputedStyle(area).overflowY === 'auto') return area;
+    return document.querySelector('#contentModal .modal-content');
+}
+
 // ============================================
 // INITIALIZATION
 // ============================================
+// Offline cache (sw.js): app shell and the data version listed in data/version.json
+function registerServiceWorker() {
+    // Not under the watch dev server (js/dev-reload.js): it would serve the previous data version
+    if (!('serviceWorker' in navigator) || window.SHIN_DEV_SERVER) return;
+    navigator.serviceWorker.register('sw.js').catch(error => {
+        console.error('Service worker registration failed:', error);
+    });
+    navigator.serviceWorker.addEventListener('message', event => {
+        if (event.data && event.data.type === 'data-updated') {
+            // The new data is used from the next visit on
+            console.log(`Data version ${event.data.version} cached ` +
+                `(${event.data.downloaded} of ${event.data.total} files downloaded)`);
+        }
+    });
+}
+
 function initializeApp() {
+    registerServiceWorker();
+    tagPublicationLocations();
+    prepareTitleGroups();
+    loadDuplicates();
+    loadIdIndex();
     updateStatistics();
     showVolumes();
+    setupSearchWorker();
     setupEventListeners();
     hideLoading();
 }
@@ -85,14 +532,19 @@ function updateStatistics(contextData = null) {
     const uniqueContent = new Set();
     const source = contextData || data;
 
+    // Catalog stubs carry a content id shared by identical bodies; full data only has the text
+    const articleKey = (pub) => {
+        if (pub.contentId !== undefined) return pub.contentId;
+        return pub.content && pub.content.trim() ? pub.content.trim() : null;
+    };
+
     // Helper functions
     const processTitles = (titlesList) => {
         stats.titles += titlesList.length;
         titlesList.forEach(title => {
             title.publications.forEach(pub => {
-                if (pub.content && pub.content.trim()) {
-                    uniqueContent.add(pub.content.trim());
-                }
+                const key = articleKey(pub);
+                if (key !== null) uniqueContent.add(key);
             });
         });
     };
@@ -117,9 +569,8 @@ function updateStatistics(contextData = null) {
                 // For titles/articles in search, we iterate the result items
                 stats.titles++;
                 result.title.publications.forEach(pub => {
-                    if (pub.content && pub.content.trim()) {
-                        uniqueContent.add(pub.content.trim());
-                    }
+                    const key = articleKey(pub);
+                    if (key !== null) uniqueContent.add(key);
                 });
             });
 
@@ -167,12 +618,14 @@ function handleSearch(e) {
 
     // Se o campo estiver vazio, volta para volumes imediatamente
     if (!searchTerm) {
+        activeSearchId++;
         showVolumes();
         return;
     }
 
-    // Requer mínimo de 2 caracteres antes de buscar
-    if (searchTerm.length < 2) {
+    if (searchWorker) {
+        // The worker keeps the main thread free, so only coalesce keystrokes
+        searchTimeout = setTimeout(() => startWorkerSearch(searchTerm), SEARCH_DEBOUNCE_MS);
         return;
     }
 
@@ -183,12 +636,82 @@ function handleSearch(e) {
     }, 500);
 }
 
+function setupSearchWorker() {
+    if (typeof Worker === 'undefined') return;
+    try {
+        searchWorker = new Worker('js/search-worker.js');
+    } catch (error) {
+        console.error('Search worker unavailable:', error);
+        return;
+    }
+
+    searchWorker.onmessage = (event) => {
+        const message = event.data;
+        if (message.type === 'publications') {
+            // Monolithic build: the worker checks content matches against the data loaded here
+            searchWorker.postMessage({
+                type: 'publications',
+                requestId: message.requestId,
+                publications: message.locations.map(([v, t, ti, p]) => {
+                    const pub = data[v].themes[t].titles[ti].publications[p];
+                    return { header: pub.header, content: pub.content };
+                })
+            });
+            return;
+        }
+        // Results of an outdated query
+        if (message.type !== 'results' || message.id !== activeSearchId) return;
+
+        appendSearchResults(message.results.map(result => {
+            const volume = data[result.v];
+            const theme = volume.themes[result.t];
+            return {
+                volume: volume.volume,
+                theme: theme.theme,
+                title: theme.titles[result.ti],
+                volumeIndex: result.v,
+                themeIndex: result.t,
+                titleIndex: result.ti,
+                matchType: result.matchType,
+                snippet: result.snippet,
+                hits: result.hits
+            };
+        }));
+
+        if (message.done) finishSearchResults(message.more);
+    };
+    searchWorker.onerror = (error) => {
+        console.error('Search worker error:', error);
+        searchWorker = null;
+    };
+
+    if (Object.keys(shardThemes).length === 0) {
+        // No catalog: send the names only, publications are sent as the worker asks for them
+        searchWorker.postMessage({
+            type: 'structure',
+            volumes: data.map(volume => ({
+                volume: volume.volume,
+                themes: volume.themes.map(theme => ({
+                    theme: theme.theme,
+                    titles: theme.titles.map(title => ({ title: title.title }))
+                }))
+            }))
+        });
+    }
+}
+
+function startWorkerSearch(term) {
+    activeSearchId++;
+    beginSearchResults();
+    searchWorker.postMessage({ type: 'search', id: activeSearchId, query: term });
+}
+
 function searchContent(term) {
     const results = [];
 
-    data.forEach(volume => {
-        volume.themes.forEach(theme => {
-            theme.titles.forEach(title => {
+    data.forEach((volume, volumeIndex) => {
+        volume.themes.forEach((theme, themeIndex) => {
+            theme.titles.forEach((title, titleIndex) => {
                 const matchVolume = volume.volume.toLowerCase().includes(term);
                 const matchTheme = theme.theme.toLowerCase().includes(term);
                 const matchTitle = title.title.toLowerCase().includes(term);
@@ -198,6 +721,9 @@ function searchContent(term) {
                         volume: volume.volume,
                         theme: theme.theme,
                         title: title,
+                        volumeIndex,
+                        themeIndex,
+                        titleIndex,
                         matchType: matchTitle ? 'title' : (matchTheme ? 'theme' : 'volume')
                     });
                 }
@@ -237,58 +763,108 @@ function displayNoResults() {
 }
 
 function displaySearchResults(results) {
+    beginSearchResults();
+    appendSearchResults(results);
+    finishSearchResults();
+}
+
+function beginSearchResults() {
     hideAllViews();
-    updateStatistics(results);
     const view = document.getElementById('titlesView');
     view.classList.remove('hidden');
 
     document.getElementById('themeTitle').textContent = `検索結果: "${searchTerm}"`;
     document.getElementById('backToThemes').style.display = 'none';
 
+    createVirtualList(document.getElementById('titlesList'));
+    window.currentSearchResults = [];
+
+    updateBreadcrumb([
+        { text: '巻一覧', action: () => { document.getElementById('searchInput').value = ''; showVolumes(); } },
+        { text: `検索: "${searchTerm}"`, active: true }
+    ]);
+}
+
+// Appends a chunk of results without touching the ones already rendered
+function appendSearchResults(results) {
+    if (results.length === 0) return;
     const container = document.getElementById('titlesList');
-    window.currentSearchResults = results;
+    const offset = window.currentSearchResults.length;
+    window.currentSearchResults.push(...results);
 
-    if (results.length === 0) {
+    const renderRow = (result, index) => `
+        <div class="title-item" onclick="openSearchResultByIndex(${index})">
+            <div class="title-item-header">
+                <div class="title-item-name">${result.title.title}</div>
+                <div class="title-item-badge">${result.title.publications.length} 文献</div>
+            </div>
+            ${result.snippet ? `<div class="title-item-snippet">${result.snippet}</div>` : ''}
+        </div>
+    `;
+    const list = container._virtualList || createVirtualList(container);
+    list.append(titleRowBlocks(results, renderRow, offset), offset === 0 ? 1 : 0);
+}
+
+// more: the worker has content candidates left, requested once the end of the list is in view
+function finishSearchResults(more = false) {
+    const results = window.currentSearchResults;
+    updateStatistics(results);
+
+    if (more) {
+        watchSearchEnd();
+    } else if (results.length === 0) {
+        const container = document.getElementById('titlesList');
+        clearVirtualList(container);
         container.innerHTML = `
             <div style="text-align: center; padding: 3rem; color: var(--text-tertiary);">
                 <p style="font-size: 3rem; margin-bottom: 1rem;">🔍</p>
                 <p>見つかりませんでした</p>
             </div>
         `;
-        return;
     }
+}
 
-    container.innerHTML = results.map((result, index) => `
-        <div class="title-item" onclick="openSearchResultByIndex(${index})">
-            <div class="title-item-header">
-                <div class="title-item-name">${result.title.title}</div>
-                <div class="title-item-badge">${result.title.publications.length} 文献</div>
-            </div>
-        </div>
-    `).join('');
+function watchSearchEnd() {
+    stopSearchMore();
+    const searchId = activeSearchId;
+    const sentinel = document.createElement('div');
+    sentinel.className = 'search-more';
+    sentinel.style.cssText = 'text-align: center; padding: 1rem; color: var(--text-tertiary);';
+    sentinel.textContent = '…';
+    document.getElementById('titlesList').after(sentinel);
+
+    searchMoreObserver = new IntersectionObserver(entries => {
+        if (!entries.some(entry => entry.isIntersecting)) return;
+        stopSearchMore();
+        if (searchWorker && searchId === activeSearchId) {
+            searchWorker.postMessage({ type: 'more', id: searchId });
+        }
+    }, { rootMargin: `${VIRTUAL_MARGIN_PX}px 0px` });
+    searchMoreObserver.observe(sentinel);
+}
 
-    updateBreadcrumb([
-        { text: '巻一覧', action: () => { document.getElementById('searchInput').value = ''; showVolumes(); } },
-        { text: `検索: "${searchTerm}"`, active: true }
-    ]);
+function stopSearchMore() {
+    if (searchMoreObserver) {
+        searchMoreObserver.disconnect();
+        searchMoreObserver = null;
+    }
+    document.querySelectorAll('.search-more').forEach(element => element.remove());
 }
 
 function openSearchResultByIndex(index) {
     if (window.currentSearchResults && window.currentSearchResults[index]) {
         const result = window.currentSearchResults[index];
 
-        // Find volume and theme indices
-        const volumeIndex = data.findIndex(v => v.volume === result.volume);
-        const themeIndex = volumeIndex >= 0 ? data[volumeIndex].themes.findIndex(t => t.theme === result.theme) : -1;
-
         // Inject path info into the title object for the modal
         const titleWithContext = {
             ...result.title,
+            searchIndex: index,
             pathInfo: {
                 volume: formatVolumeName(result.volume),
                 theme: result.theme,
-                volumeIndex: volumeIndex,
-                themeIndex: themeIndex
+                volumeIndex: result.volumeIndex,
+                themeIndex: result.themeIndex,
+                titleIndex: result.titleIndex
             }
         };
         showContent(titleWithContext);
@@ -351,25 +927,9 @@ function showThemes(volumeIndex) {
     if (toggleBtn) toggleBtn.style.display = 'none';
 
     const container = document.getElementById('themesList');
+    container.querySelectorAll('.titles-container').forEach(clearVirtualList);
     container.innerHTML = volume.themes.map((theme, themeIndex) => {
-        // Filtrar títulos válidos
-        const validTitles = filterValidTitles(theme.titles);
-        const groupedTitles = groupNumberedTitles(validTitles);
-
-        // Renderizar títulos diretamente
-        const titlesHTML = groupedTitles.map((title, index) => {
-            if (title.title === '---') {
-                return `<div class="separator-item"></div>`;
-            }
-            return `
-            <div class="title-item" onclick="event.stopPropagation(); showContentFromAccordion('${title.title.replace(/'/g, "\\'")}')">
-                <div class="title-item-header">
-                    <div class="title-item-name">${title.title}</div>
-                    <div class="title-item-badge">${title.publications.length} 文献</div>
-                </div>
-            </div>
-            `;
-        }).join('');
+        const groupedTitles = theme.titleGroups;
 
         return `
             <div id="theme-card-${themeIndex}" class="card">
@@ -381,11 +941,17 @@ function showThemes(volumeIndex) {
                         </div>
                     </div>
                 </div>
-                <div id="theme-titles-${themeIndex}" class="titles-container">${titlesHTML}</div>
+                <div id="theme-titles-${themeIndex}" class="titles-container"></div>
             </div>
         `;
     }).join('');
 
+    // Each theme's rows are a virtual list: only the blocks near the viewport are in the DOM
+    volume.themes.forEach((theme, themeIndex) => {
+        renderTitlesInTheme(document.getElementById(`theme-titles-${themeIndex}`), volumeIndex, themeIndex,
+            themeIndex === 0 ? 1 : 0);
+    });
+
     updateBreadcrumb([
         { text: '巻一覧', action: showVolumes },
         { text: formatVolumeName(volume.volume), active: true }
@@ -400,11 +966,13 @@ function toggleTheme(volumeIndex, themeIndex) {
 
     const isExpanded = card.classList.contains('expanded');
 
+    if (!isExpanded) prefetchThemeShard(theme);
+
     if (isExpanded) {
         card.classList.remove('expanded');
     } else {
         if (container.innerHTML.trim() === '') {
-            renderTitlesInTheme(container, theme.titles);
+            renderTitlesInTheme(container, volumeIndex, themeIndex);
         }
 
         // Only expand if there is content to show
@@ -431,16 +999,12 @@ function toggleAllThemes() {
         btn.textContent = '全て開く';
     } else {
         // Open all
-        const volume = data[data.findIndex(v => v.volume === document.getElementById('volumeTitle').textContent)] || data[currentVolume];
-
         cards.forEach((card, index) => {
             const titlesContainer = card.querySelector('.titles-container');
 
-            // Render content if needed
+            // Render content if needed (themesList maps directly to volume.themes)
             if (titlesContainer && titlesContainer.innerHTML.trim() === '') {
-                // Determine index match. themesList maps directly to volume.themes
-                const theme = volume.themes[index];
-                renderTitlesInTheme(titlesContainer, theme.titles);
+                renderTitlesInTheme(titlesContainer, currentVolume, index);
             }
 
             // Only expand if not empty
@@ -468,77 +1032,37 @@ function updateToggleAllButtonState() {
 }
 
 
-function filterValidTitles(titles) {
-    // 1. Filtrar títulos sem publicações (mantendo separadores por enquanto)
-    const filtered = titles.filter(title =>
-        title.title === '---' || (title.publications && title.publications.length > 0)
-    );
-
-    // 2. Verificar se restou algum título real (não-separador)
-    const hasRealContent = filtered.some(title => title.title !== '---');
-
-    // Se só tem separadores, retorna vazio para evitar renderizar apenas linhas
-    if (!hasRealContent) {
-        return [];
+function renderGroupRow(group, onclick) {
+    if (group.title === '---') {
+        return `<div class="separator-item"></div>`;
     }
-
-    return filtered;
-}
-
-function renderTitlesInTheme(container, titles) {
-    // Filtrar títulos vazios e separadores órfãos
-    const titlesWithContent = filterValidTitles(titles);
-
-    const groupedTitles = groupNumberedTitles(titlesWithContent);
-
-    container.innerHTML = groupedTitles.map((title, index) => {
-        if (title.title === '---') {
-            return `<div class="separator-item"></div>`;
-        }
-
-        return `
-        <div class="title-item" onclick="event.stopPropagation(); showContentFromAccordion('${title.title.replace(/'/g, "\\'")}')">
+    return `
+        <div class="title-item" data-group-id="${group.id}" onclick="${onclick}">
             <div class="title-item-header">
-                <div class="title-item-name">${title.title}</div>
-                <div class="title-item-badge">${title.publications.length} 文献</div>
+                <div class="title-item-name">${group.title}</div>
+                <div class="title-item-badge">${group.publications.length} 文献</div>
             </div>
         </div>
-    `}).join('');
+    `;
 }
 
-function showContentFromAccordion(titleString) {
-    if (currentVolume === null) {
-        console.error("Current volume is null");
+// eager: leading blocks rendered right away (see createVirtualList)
+function renderTitlesInTheme(container, volumeIndex, themeIndex, eager = 1) {
+    const groupedTitles = data[volumeIndex].themes[themeIndex].titleGroups;
+    if (groupedTitles.length === 0) {
+        clearVirtualList(container);
         return;
     }
-    const volume = data[currentVolume];
-    console.log(`Attempting to find title: "${titleString}" in volume: ${volume.volume}`);
-
-    for (let t = 0; t < volume.themes.length; t++) {
-        const theme = volume.themes[t];
-        const grouped = groupNumberedTitles(theme.titles);
-        const found = grouped.find(g => g.title === titleString);
-
-        if (found) {
-            console.log(`Title found in theme: ${theme.theme}`);
 
-            // Fix for navigation arrows: Set the current context
-            window.currentGroupedTitles = grouped;
+    renderVirtualTitleRows(container, groupedTitles, (group, index) =>
+        renderGroupRow(group, `event.stopPropagation(); openTitleGroup(${volumeIndex}, ${themeIndex}, ${index})`), null, eager);
+}
 
-            const titleWithContext = {
-                ...found,
-                pathInfo: {
-                    volume: formatVolumeName(volume.volume),
-                    theme: theme.theme,
-                    volumeIndex: currentVolume,
-                    themeIndex: t
-                }
-            };
-            showContent(titleWithContext);
-            return;
-        }
-    }
-    console.warn(`Title "${titleString}" not found in any theme of volume ${volume.volume}`);
+function openTitleGroup(volumeIndex, themeIndex, groupIndex) {
+    const theme = data[volumeIndex].themes[themeIndex];
+    // Context for the navigation arrows
+    window.currentGroupedTitles = theme.titleGroups;
+    showContent(theme.titleGroups[groupIndex]);
 }
 
 
@@ -549,6 +1073,7 @@ function showTitles(volumeIndex, themeIndex) {
 
     const volume = data[volumeIndex];
     const theme = volume.themes[themeIndex];
+    prefetchThemeShard(theme);
 
     const view = document.getElementById('titlesView');
     view.classList.remove('hidden');
@@ -556,27 +1081,14 @@ function showTitles(volumeIndex, themeIndex) {
     // Hide statistics on titles view
     document.getElementById('statsFooter').style.display = 'none';
 
-    // Filtra títulos vazios e separadores órfãos, depois agrupa
-    const titlesWithContent = filterValidTitles(theme.titles);
-    const groupedTitles = groupNumberedTitles(titlesWithContent);
+    const groupedTitles = theme.titleGroups;
     window.currentGroupedTitles = groupedTitles;
 
     document.getElementById('themeTitle').textContent = theme.theme;
     document.getElementById('backToThemes').style.display = 'inline-flex';
 
     const container = document.getElementById('titlesList');
-    container.innerHTML = groupedTitles.map((title, index) => {
-        if (title.title === '---') {
-            return `<div class="separator-item"></div>`;
-        }
-        return `
-        <div class="title-item" onclick="openContentByIndex(${index})">
-            <div class="title-item-header">
-                <div class="title-item-name">${title.title}</div>
-                <div class="title-item-badge">${title.publications.length} 文献</div>
-            </div>
-        </div>
-    `}).join('');
+    renderVirtualTitleRows(container, groupedTitles, (group, index) => renderGroupRow(group, `openContentByIndex(${index})`));
 
     updateBreadcrumb([
         { text: '巻一覧', action: showVolumes },
@@ -587,33 +1099,56 @@ function showTitles(volumeIndex, themeIndex) {
 
 function openContentByIndex(index) {
     if (window.currentGroupedTitles && window.currentGroupedTitles[index]) {
-        const titleData = window.currentGroupedTitles[index];
-
-        // Inject path info if missing and we have context
-        if (!titleData.pathInfo && typeof currentVolume === 'number' && typeof currentTheme === 'number') {
-            const vol = data[currentVolume];
-            const thm = vol ? vol.themes[currentTheme] : null;
-            if (vol && thm) {
-                titleData.pathInfo = {
-                    volume: formatVolumeName(vol.volume),
-                    theme: thm.theme,
-                    volumeIndex: currentVolume,
-                    themeIndex: currentTheme
-                };
-            }
-        }
-
-        showContent(titleData);
+        // Groups carry their path info
+        showContent(window.currentGroupedTitles[index]);
     }
 }
 
 // ============================================
 // MODAL CONTENT
 // ============================================
-function showContent(title) {
+function showContent(title, targetPubId = null) {
     const modal = document.getElementById('contentModal');
     document.getElementById('modalTitle').textContent = title.title;
 
+    // Sharded data: fetch the theme content first, then render. HTML fragments are optional:
+    // without them the bodies are rendered by parseMarkdown
+    const pendingLoads = getPendingShards(title).map(loadShard).concat(
+        getPendingHtml(title).map(([v, t]) => loadHtml(v, t).catch(error => {
+            console.warn('HTML fragments not used:', error);
+            data[v].themes[t].htmlLoaded = true;
+        })));
+    pendingContentTitle = title;
+    if (pendingLoads.length > 0) {
+        document.getElementById('modalMeta').innerHTML = '';
+        document.getElementById('modalBody').innerHTML = `
+            <div class="loading">
+                <div class="spinner"></div>
+                <p>読み込み中...</p>
+            </div>
+        `;
+        modal.classList.remove('hidden');
+        document.body.style.overflow = 'hidden';
+
+        Promise.all(pendingLoads)
+            .then(() => {
+                // Skip if the modal was closed or another title was opened meanwhile
+                if (pendingContentTitle === title && !modal.classList.contains('hidden')) {
+                    showContent(title, targetPubId);
+                }
+            })
+            .catch(error => {
+                console.error('Error loading shard:', error);
+                document.getElementById('modalBody').innerHTML = `
+                    <div style="text-align: center; color: var(--text-secondary);">
+                        <p>データの読み込みエラー</p>
+                        <p style="font-size: 0.9rem; margin-top: 0.5rem; color: var(--text-tertiary);">${error.message}</p>
+                    </div>
+                `;
+            });
+        return;
+    }
+
     // Store current title data for translation toggle
     currentTitleData = title;
     showTranslation = false;
@@ -679,13 +1214,12 @@ function showContent(title) {
     // Metadados - Caminho do conteúdo
     const metaContainer = document.getElementById('modalMeta');
     if (title.pathInfo) {
-        // Prepare title string for passing to function - escape single quotes
-        const titleStringEscaped = title.title.replace(/'/g, "\\'");
+        const groupId = groupIdOf(title);
 
         metaContainer.innerHTML = `
             <div class="modal-meta-item modal-meta-link" onclick="closeModalAndNavigate('volume', ${title.pathInfo.volumeIndex})">${title.pathInfo.volume}</div>
             <div class="modal-meta-item">→</div>
-            <div class="modal-meta-item modal-meta-link" onclick="closeModalAndNavigate('theme', ${title.pathInfo.volumeIndex}, ${title.pathInfo.themeIndex}, '${titleStringEscaped}')">${title.pathInfo.theme}</div>
+            <div class="modal-meta-item modal-meta-link" onclick="closeModalAndNavigate('theme', ${title.pathInfo.volumeIndex}, ${title.pathInfo.themeIndex}${groupId ? `, '${groupId}'` : ''})">${title.pathInfo.theme}</div>
         `;
     } else {
         metaContainer.innerHTML = '';
@@ -693,22 +1227,41 @@ function showContent(title) {
 
     // Save to history
     saveHistory(title);
+    updateLocationHash(title, targetPubId);
 
-    // Gera o HTML do conteúdo
-    const publicationsHTML = navigationItems.map(pub => {
-        const contentToShow = showTranslation && pub.translation ? pub.translation : pub.content;
-        return `
-        <div id="${pub.id}" class="publication">
-            <div class="publication-header">${parseMarkdown(pub.displayTitle)}</div>
-            <div class="publication-content">${parseMarkdown(contentToShow || '内容がありません')}</div>
-        </div>
-    `}).join('');
+    // The modal must be visible to measure it for the height estimates
+    modal.classList.remove('hidden');
+    document.body.style.overflow = 'hidden';
 
-    document.getElementById('modalBody').innerHTML = navHTML + publicationsHTML;
+    const modalBody = document.getElementById('modalBody');
+    clearVirtualList(modalBody);
+    modalBody.innerHTML = navHTML + '<div id="modalPublications"></div>';
 
     // Apply font size
     applyFontSize();
 
+    // Gera o HTML do conteúdo: publications are rendered only near the visible area
+    const metrics = publicationMetrics(modalBody);
+    const publicationList = createVirtualList(document.getElementById('modalPublications'), getModalScroller());
+    publicationList.append(navigationItems.map(pub => {
+        const translated = showTranslation && pub.translation;
+        const contentToShow = translated ? pub.translation : pub.content;
+        // Bodies rendered by the build (--html) are inserted as is
+        const bodyHTML = !translated && pub.html
+            ? `<div class="publication-content rendered">${pub.html}</div>`
+            : `<div class="publication-content">${parseMarkdown(contentToShow || '内容がありません')}</div>`;
+        return {
+            id: pub.id,
+            className: 'publication',
+            estimate: estimatePublicationHeight(contentToShow, metrics),
+            render: () => `
+                <div class="publication-header">${parseMarkdown(pub.displayTitle)}</div>
+                ${bodyHTML}
+                ${renderAlsoAppearsIn(pub)}
+            `
+        };
+    }), 3);
+
     // Update Footer Navigation
     updateModalFooter(title);
 
@@ -720,10 +1273,59 @@ function showContent(title) {
 
         const scrollableArea = modal.querySelector('.modal-scrollable-area');
         if (scrollableArea) scrollableArea.scrollTop = 0;
+
+        // Deep link to a publication: its block exists even before it is rendered
+        const target = targetPubId ? navigationItems.find(pub => pub.stableId === targetPubId) : null;
+        if (target) document.getElementById(target.id).scrollIntoView();
     }, 10);
+}
 
-    modal.classList.remove('hidden');
-    document.body.style.overflow = 'hidden';
+function renderAlsoAppearsIn(pub) {
+    if (!duplicateLinks || !pub.location) return '';
+    const others = duplicateLinks[pub.location.join('/')];
+    if (!others) return '';
+
+    // One link per title, never to the title being shown
+    const seen = new Set([pub.location.slice(0, 3).join('/')]);
+    const links = [];
+    others.forEach(([v, t, ti]) => {
+        const key = `${v}/${t}/${ti}`;
+        if (seen.has(key)) return;
+        seen.add(key);
+        const volume = data[v];
+        const theme = volume.themes[t];
+        links.push(`
+            <button class="also-appears-link" onclick="openTitleAt(${v}, ${t}, ${ti})">
+                ${formatVolumeName(volume.volume)} → ${theme.theme} → ${theme.titles[ti].title}
+            </button>
+        `);
+    });
+    if (links.length === 0) return '';
+
+    return `
+        <div class="also-appears">
+            <div class="also-appears-label">他の掲載箇所</div>
+            ${links.join('')}
+        </div>
+    `;
+}
+
+function openTitleAt(volumeIndex, themeIndex, titleIndex) {
+    const volume = data[volumeIndex];
+    const theme = volume ? volume.themes[themeIndex] : null;
+    const title = theme ? theme.titles[titleIndex] : null;
+    if (!title) return;
+
+    showContent({
+        ...title,
+        pathInfo: {
+            volume: formatVolumeName(volume.volume),
+            theme: theme.theme,
+            volumeIndex: volumeIndex,
+            themeIndex: themeIndex,
+            titleIndex: titleIndex
+        }
+    });
 }
 
 function toggleModalNav(btn) {
@@ -756,6 +1358,7 @@ function parseMarkdown(text) {
 
 function closeModal() {
     document.getElementById('contentModal').classList.add('hidden');
+    updateLocationHash(null);
     document.body.style.overflow = '';
     // Hide footer when modal closes
     const footer = document.getElementById('modalNavFooter');
@@ -790,6 +1393,7 @@ function updateBreadcrumb(items) {
 // UTILITY FUNCTIONS
 // ============================================
 function hideAllViews() {
+    stopSearchMore();
     document.getElementById('volumesView').classList.add('hidden');
     document.getElementById('themesView').classList.add('hidden');
     document.getElementById('titlesView').classList.add('hidden');
@@ -810,42 +1414,6 @@ function extractThemeNumber(themeName) {
     return match ? parseInt(match[1], 10) : null;
 }
 
-function groupNumberedTitles(titles) {
-    const grouped = new Map();
-
-    titles.forEach((title, index) => {
-        // Skip empty titles (without publications), except separators
-        if (title.title !== '---' && (!title.publications || title.publications.length === 0)) {
-            return;
-        }
-
-        // Special handling for separators to prevent merging
-        if (title.title === '---') {
-            grouped.set(`___SEPARATOR___${index}`, {
-                title: '---',
-                publications: []
-            });
-            return;
-        }
-
-        // Remove números do final do título (suporta 1, 2, ３, ４, etc.)
-        const baseTitle = title.title.replace(/[　\s]*[0-9０-９１-９]+\s*$/, '').trim();
-
-        if (grouped.has(baseTitle)) {
-            // Adiciona publicações ao título existente
-            grouped.get(baseTitle).publications.push(...title.publications);
-        } else {
-            // Cria nova entrada com o título base
-            grouped.set(baseTitle, {
-                title: baseTitle,
-                publications: [...title.publications]
-            });
-        }
-    });
-
-    return Array.from(grouped.values());
-}
-
 // ============================================
 // FONT SIZE CONTROL
 // ============================================
@@ -885,55 +1453,43 @@ function applyFontSize() {
 // ============================================
 // MODAL NAVIGATION HELPERS
 // ============================================
-function closeModalAndNavigate(type, volumeIndex, themeIndex, targetTitle = null) {
+function closeModalAndNavigate(type, volumeIndex, themeIndex, targetGroupId = null) {
     closeModal();
 
     if (type === 'volume' && volumeIndex >= 0) {
         showThemes(volumeIndex);
     } else if (type === 'theme' && volumeIndex >= 0 && themeIndex >= 0) {
-        if (targetTitle) {
-            navigateToAndHighlight(volumeIndex, themeIndex, targetTitle);
+        if (targetGroupId) {
+            navigateToAndHighlight(volumeIndex, themeIndex, targetGroupId);
         } else {
             showTitles(volumeIndex, themeIndex);
         }
     }
 }
 
-function navigateToAndHighlight(volumeIndex, themeIndex, titleString) {
+function navigateToAndHighlight(volumeIndex, themeIndex, groupId) {
     // Navega para a view de temas
     showThemes(volumeIndex);
 
-    // Normalize title to match grouped view (remove trailing numbers)
-    // Matches the logic in groupNumberedTitles
-    const normalizedTarget = titleString.replace(/[　\s]*[0-9０-９１-９]+\s*$/, '').trim();
-
     // Aguarda um momento para a view renderizar
     setTimeout(() => {
         // Expande o card do tema
         const card = document.getElementById(`theme-card-${themeIndex}`);
         const container = document.getElementById(`theme-titles-${themeIndex}`);
-        const volume = data[volumeIndex];
-        const theme = volume.themes[themeIndex];
-
         if (card && !card.classList.contains('expanded')) {
             card.classList.add('expanded');
             if (container.innerHTML.trim() === '') {
-                renderTitlesInTheme(container, theme.titles);
+                renderTitlesInTheme(container, volumeIndex, themeIndex);
             }
         }
 
         // Aguarda a renderização dos títulos
         setTimeout(() => {
-            // Encontra o elemento do título dentro do container
-            const titleItems = container.querySelectorAll('.title-item-name');
-            let targetElement = null;
+            // Rows far from the viewport are placeholders: render them to find the target
+            if (container._virtualList) container._virtualList.renderAll();
 
-            titleItems.forEach(item => {
-                // Determine equality based on normalized text
-                if (item.textContent.trim() === normalizedTarget) {
-                    targetElement = item.closest('.title-item');
-                }
-            });
+            // Encontra o elemento do título dentro do container
+            const targetElement = container.querySelector(`[data-group-id="${groupId}"]`);
 
             if (targetElement) {
                 // Scroll suave até o elemento
@@ -998,99 +1554,9 @@ function setupScrollToTop() {
 // ============================================
 // MOBILE FOOTER NAVIGATION
 // ============================================
-let currentNavContext = { list: null, index: -1 };
+let currentNavContext = { list: null, index: -1, titleAt: null, open: null };
 let footerHideTimeout;
 
-function updateModalFooter(titleData) {
-    const footer = document.getElementById('modalNavFooter');
-    if (!footer) return;
-
-    // Determine context
-    currentNavContext.list = null;
-
-    // Check if in current grouped titles (Theme)
-    if (window.currentGroupedTitles && window.currentGroupedTitles.some(t => t.title === titleData.title)) {
-        currentNavContext.list = window.currentGroupedTitles;
-    }
-    // Check if in search results
-    else if (window.currentSearchResults && window.currentSearchResults.some(r => r.title.title === titleData.title)) {
-        currentNavContext.list = window.currentSearchResults.map(r => r.title);
-    }
-
-    // Find index
-    if (currentNavContext.list) {
-        currentNavContext.index = currentNavContext.list.findIndex(t => t.title === titleData.title);
-    } else {
-        currentNavContext.index = -1;
-    }
-
-    // Update UI
-    const prevBtn = document.getElementById('prevTitleBtn');
-    const nextBtn = document.getElementById('nextTitleBtn');
-
-    if (currentNavContext.index !== -1) {
-        prevBtn.disabled = currentNavContext.index <= 0;
-        nextBtn.disabled = currentNavContext.index >= currentNavContext.list.length - 1;
-    } else {
-        prevBtn.disabled = true;
-        nextBtn.disabled = true;
-    }
-
-    resetFooterHideTimer();
-}
-
-function navigateModal(direction) {
-    if (!currentNavContext.list || currentNavContext.index === -1) return;
-
-    const newIndex = currentNavContext.index + direction;
-    if (newIndex >= 0 && newIndex < currentNavContext.list.length) {
-        // Need to ensure pathInfo preservation if possible, but showContent takes titleData.
-        // The objects in currentGroupedTitles usually have pathInfo if it was set? 
-        // In openContentByIndex we injected it. We should inject it here too if missing.
-        // But simpler: just pass the object from the list. 
-        // Wait, currentGroupedTitles objects don't store the pathInfo permanently unless we modified them in place?
-        // openContentByIndex modified the object in the array? Yes: `titleData = ...; titleData.pathInfo = ...`
-        // So safe to assume it's good.
-
-        // For search results, we constructed a new object in openSearchResultByIndex?
-        // Let's check openSearchResultByIndex. It passed titleWithContext to showContent.
-        // It did NOT modify window.currentSearchResults items.
-        // So navigating via search results might lose pathInfo unless we reconstruct it.
-        // However, if we reuse the logic...
-
-        let nextTitle = currentNavContext.list[newIndex];
-
-        // If coming from search results, nextTitle is just the raw title object from JSON.
-        // We need to re-inject path info if it's missing.
-        if (!nextTitle.pathInfo && window.currentSearchResults) {
-            // Try to find it in search results to get metadata
-            const res = window.currentSearchResults.find(r => r.title.title === nextTitle.title);
-            if (res) {
-                // Reconstruct context
-                // Note: we can't easily call openSearchResultByIndex because it takes index in search list.
-                // But we have the index in the mapped list, which corresponds to search results index.
-                // So we CAN call openSearchResultByIndex if we are in search mode!
-
-                // BUT currentNavContext.list is just a map of titles.
-                // If we are in search mode, we should just use openSearchResultByIndex(newIndex).
-                if (window.currentSearchResults.length === currentNavContext.list.length) {
-                    openSearchResultByIndex(newIndex);
-                    return;
-                }
-            }
-        }
-
-        // Check if we are in Theme mode
-        if (window.currentGroupedTitles && window.currentGroupedTitles.length === currentNavContext.list.length) {
-            openContentByIndex(newIndex);
-            return;
-        }
-
-        // Fallback
-        showContent(nextTitle);
-    }
-}
-
 function resetFooterHideTimer() {
     const footer = document.getElementById('modalNavFooter');
     if (!footer) return;
@@ -1166,13 +1632,18 @@ function saveHistory(titleData) {
         history = [];
     }
 
+    const id = linkIdOf(titleData);
+    const groupId = groupIdOf(titleData);
+
     // Remove if exists to move to top
-    history = history.filter(item => item.title !== titleData.title);
+    history = history.filter(item => id ? item.id !== id : (groupId ? item.groupId !== groupId : item.title !== titleData.title));
 
     // Store minimal data to save space
     // We only need indices to reconstruct the object later
     const historyItem = {
         title: titleData.title,
+        id: id,
+        groupId: groupId,
         volume: titleData.pathInfo ? titleData.pathInfo.volume : '',
         theme: titleData.pathInfo ? titleData.pathInfo.theme : '',
         // Store indices if available, otherwise we rely on search later
@@ -1205,28 +1676,19 @@ function saveHistory(titleData) {
 function openHistoryItem(index) {
     let history = JSON.parse(localStorage.getItem(HISTORY_KEY) || '[]');
     const item = history[index];
+    // Stable id: one lookup, valid across rebuilds that reorder the sources
+    if (item && item.id && openById(item.id)) return;
     if (item) {
         // Reconstruct data from indices if valid
         if (item.vIdx >= 0 && item.tIdx >= 0 && data[item.vIdx]) {
             const vol = data[item.vIdx];
             const theme = vol.themes[item.tIdx];
             if (theme) {
-                // We need to find the specific title object within the theme
-                // Since we didn't store title index, we search by title string
-                const grouped = groupNumberedTitles(theme.titles);
-                const found = grouped.find(g => g.title === item.title);
+                // Entries saved before group ids were stored fall back to the title string
+                const found = theme.titleGroups.find(g => item.groupId ? g.id === item.groupId : g.title === item.title);
 
                 if (found) {
-                    const titleWithContext = {
-                        ...found,
-                        pathInfo: {
-                            volume: formatVolumeName(vol.volume),
-                            theme: theme.theme,
-                            volumeIndex: item.vIdx,
-                            themeIndex: item.tIdx
-                        }
-                    };
-                    showContent(titleWithContext);
+                    showContent(found);
                     return;
                 }
             }
@@ -1237,18 +1699,14 @@ function openHistoryItem(index) {
         // Look for exact match
         const exactMatch = results.find(r => r.title.title === item.title);
         if (exactMatch) {
-            openSearchResultByIndex(0); // Not ideal but works for now, or better:
-            // We can manually call showContent like we do in openSearchResultByIndex
-            const volumeIndex = data.findIndex(v => v.volume === exactMatch.volume);
-            const themeIndex = volumeIndex >= 0 ? data[volumeIndex].themes.findIndex(t => t.theme === exactMatch.theme) : -1;
-
             const titleWithContext = {
                 ...exactMatch.title,
                 pathInfo: {
                     volume: formatVolumeName(exactMatch.volume),
                     theme: exactMatch.theme,
-                    volumeIndex: volumeIndex,
-                    themeIndex: themeIndex
+                    volumeIndex: exactMatch.volumeIndex,
+                    themeIndex: exactMatch.themeIndex,
+                    titleIndex: exactMatch.titleIndex
                 }
             };
             showContent(titleWithContext);
@@ -1297,14 +1755,6 @@ function renderHistory() {
     `).join('');
 }
 
-function openHistoryItem(index) {
-    let history = JSON.parse(localStorage.getItem(HISTORY_KEY) || '[]');
-    const item = history[index];
-    if (item && item.data) {
-        showContent(item.data);
-    }
-}
-
 function toggleHistory() {
     const list = document.getElementById('historyList');
     const icon = document.getElementById('historyArrow');
@@ -1324,73 +1774,35 @@ function updateModalFooter(titleData) {
     const footer = document.getElementById('modalNavFooter');
     if (!footer) return;
 
-    // Determine context
-    currentNavContext.list = null;
-
-    // Check if in current grouped titles (Theme)
-    if (window.currentGroupedTitles && window.currentGroupedTitles.some(t => t.title === titleData.title)) {
-        currentNavContext.list = window.currentGroupedTitles;
-    }
-    // Check if in search results
-    else if (window.currentSearchResults && window.currentSearchResults.some(r => r.title.title === titleData.title)) {
-        currentNavContext.list = window.currentSearchResults.map(r => r.title);
-    }
-    // Context Recovery: If missing, attempt to reconstruct from pathInfo
-    else if (titleData.pathInfo && typeof data !== 'undefined') {
-        const vol = data[titleData.pathInfo.volumeIndex];
-        if (vol && vol.themes[titleData.pathInfo.themeIndex]) {
-            // Reconstruct the title list for this theme
-            currentNavContext.list = vol.themes[titleData.pathInfo.themeIndex].titles;
-        }
-    }
-
-    // Find index
-    if (currentNavContext.list) {
-        // Use loose comparison for safety or fallback to string match
-        currentNavContext.index = currentNavContext.list.findIndex(t => {
-            const tTitle = (t.title || t).toString().trim();
-            const currentTitle = (titleData.title || titleData).toString().trim();
-            // Try strict match first, then loose
-            if (tTitle === currentTitle) return true;
-            // Handle cases where title might differ slightly in structure but be logically same
-            if (t.pathInfo && titleData.pathInfo) {
-                return t.pathInfo.volumeIndex === titleData.pathInfo.volumeIndex &&
-                    t.pathInfo.themeIndex === titleData.pathInfo.themeIndex &&
-                    t.pathInfo.titleIndex === titleData.pathInfo.titleIndex;
-            }
-            return false;
-        });
-    } else {
-        currentNavContext.index = -1;
+    // Determine context: the list the title was opened from and its position there
+    currentNavContext = { list: null, index: -1, titleAt: null, open: null };
+    const path = titleData.pathInfo;
+
+    if (titleData.id && path) {
+        // A title group: its theme's groups
+        const groups = data[path.volumeIndex].themes[path.themeIndex].titleGroups;
+        currentNavContext = { list: groups, index: titleData.index, titleAt: i => groups[i].title, open: i => showContent(groups[i]) };
+    } else if (titleData.searchIndex !== undefined && window.currentSearchResults) {
+        const results = window.currentSearchResults;
+        currentNavContext = { list: results, index: titleData.searchIndex, titleAt: i => results[i].title.title, open: openSearchResultByIndex };
+    } else if (path && path.titleIndex !== undefined && data[path.volumeIndex]) {
+        // A single title of a theme ("also appears in")
+        const titles = data[path.volumeIndex].themes[path.themeIndex].titles;
+        currentNavContext = {
+            list: titles,
+            index: path.titleIndex,
+            titleAt: i => titles[i].title,
+            open: i => openTitleAt(path.volumeIndex, path.themeIndex, i)
+        };
     }
 
     // Update UI
     const prevBtn = document.getElementById('prevTitleBtn');
     const nextBtn = document.getElementById('nextTitleBtn');
 
-    // Check for valid items in each direction
-    let hasPrev = false;
-    let hasNext = false;
-
-    // Check Previous
-    for (let i = currentNavContext.index - 1; i >= 0; i--) {
-        if (currentNavContext.list[i].title !== '---') {
-            hasPrev = true;
-            break;
-        }
-    }
-
-    // Check Next
-    for (let i = currentNavContext.index + 1; i < currentNavContext.list.length; i++) {
-        if (currentNavContext.list[i].title !== '---') {
-            hasNext = true;
-            break;
-        }
-    }
-
     if (currentNavContext.index !== -1) {
-        prevBtn.disabled = !hasPrev;
-        nextBtn.disabled = !hasNext;
+        prevBtn.disabled = adjacentNavIndex(-1) === -1;
+        nextBtn.disabled = adjacentNavIndex(1) === -1;
     } else {
         prevBtn.disabled = true;
         nextBtn.disabled = true;
@@ -1399,49 +1811,20 @@ function updateModalFooter(titleData) {
     resetFooterHideTimer();
 }
 
-function navigateModal(direction) {
-    if (!currentNavContext.list || currentNavContext.index === -1) return;
-
-    let newIndex = currentNavContext.index + direction;
-
-    // Loop to skip separators ('---')
-    while (newIndex >= 0 && newIndex < currentNavContext.list.length) {
-        if (currentNavContext.list[newIndex].title !== '---') {
-            break;
-        }
-        newIndex += direction;
+// Next index in direction, skipping separators ('---'); -1 at either end
+function adjacentNavIndex(direction) {
+    const { list, index, titleAt } = currentNavContext;
+    for (let i = index + direction; i >= 0 && i < list.length; i += direction) {
+        if (titleAt(i) !== '---') return i;
     }
+    return -1;
+}
 
-    if (newIndex < 0 || newIndex >= currentNavContext.list.length) return;
-
-    let nextTitle = currentNavContext.list[newIndex];
-
-    // Ensure pathInfo exists by copying from current title if needed
-    if (!nextTitle.pathInfo && currentTitleData && currentTitleData.pathInfo) {
-        // Calculate the new title index if we know the theme structure
-        if (typeof data !== 'undefined') {
-            const vol = data[currentTitleData.pathInfo.volumeIndex];
-            if (vol && vol.themes[currentTitleData.pathInfo.themeIndex]) {
-                const themeList = vol.themes[currentTitleData.pathInfo.themeIndex].titles;
-                const actualIndex = themeList.findIndex(t => (t.title || t) === (nextTitle.title || nextTitle));
-                if (actualIndex !== -1) {
-                    nextTitle = {
-                        ...nextTitle,
-                        pathInfo: {
-                            volume: currentTitleData.pathInfo.volume,
-                            theme: currentTitleData.pathInfo.theme,
-                            volumeIndex: currentTitleData.pathInfo.volumeIndex,
-                            themeIndex: currentTitleData.pathInfo.themeIndex,
-                            titleIndex: actualIndex
-                        }
-                    };
-                }
-            }
-        }
-    }
+function navigateModal(direction) {
+    if (!currentNavContext.list || currentNavContext.index === -1) return;
 
-    // Always use showContent - it handles everything correctly
-    showContent(nextTitle);
+    const newIndex = adjacentNavIndex(direction);
+    if (newIndex !== -1) currentNavContext.open(newIndex);
 }
 
 function resetFooterHideTimer() {
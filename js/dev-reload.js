@@ -0,0 +1,23 @@
+// ============================================
+// DEV RELOAD
+// ============================================
+// Inserted into index.html by the development server of scripts/watch.py (scripts/dev_server.py),
+// never loaded in production. Reloads the page when a rebuild has been written; an open
+// publication comes back through its #/<id> deep link (watch --ids).
+//
+// The service worker would keep serving the previous data version, so it is not used here.
+
+window.SHIN_DEV_SERVER = true;
+
+if ('serviceWorker' in navigator) {
+    navigator.serviceWorker.getRegistrations()
+        .then(registrations => registrations.forEach(registration => registration.unregister()));
+}
+
+(function () {
+    const events = new EventSource('__events');
+    events.addEventListener('reload', event => {
+        console.log(`Rebuilt (data version ${event.data}), reloading`);
+        window.location.reload();
+    });
+})();
@@ -0,0 +1,394 @@
+// ============================================
+// SEARCH WORKER
+// ============================================
+// Runs the search off the main thread.
+//   in:  { type: 'search', id, query }
+//        { type: 'more', id }                       verify the next page of content matches
+//        { type: 'structure', volumes }             monolithic build: names from the page's data
+//        { type: 'publications', requestId, publications }
+//   out: { type: 'results', id, results, done, more }
+//        { type: 'publications', requestId, locations }  monolithic build: asks the page for
+//                                                    the { header, content } of [v, t, ti, p]s
+// Results are streamed in chunks, best first: title/theme/volume name matches, then
+// publications found through the gram index (generate_json.py --search-index, see
+// scripts/search_index.py). Postings of terms of one or two characters are exact; longer
+// terms are verified against the title, header and content, PAGE_SIZE titles at a time:
+// done with more: true means candidates are left and the page asks for them as the user scrolls.
+// Each result is { v, t, ti, matchType: 'title'|'theme'|'volume'|'content', score, snippet?, hits? }.
+// A newer search makes the worker drop the older one at its next step.
+
+const DATA_URL = '../data/';
+const CHUNK_SIZE = 100;
+const SNIPPET_RADIUS = 40;
+const PAGE_SIZE = 50;
+
+let volumes = null;         // catalog.json volumes, or the monolithic data
+let sharded = false;
+let searchMeta = null;      // search/meta.json, null when the index was not built
+let canonicalLocations = {}; // content id -> { shard, titleIndex, pubIndex } of its stored body
+const postingShards = {};
+const contentShards = {};
+let latestSearchId = 0;
+// Content candidates of the latest search not verified yet: { id, terms, titles, next, busy }
+let contentSearch = null;
+
+// Monolithic build: the page already holds the data, the worker asks it instead of refetching it
+let resolveStructure;
+const pageStructure = new Promise(resolve => { resolveStructure = resolve; });
+const publicationRequests = new Map();
+let publicationRequestId = 0;
+
+const ready = loadStructure();
+
+async function fetchJSON(path) {
+    const response = await fetch(DATA_URL + path);
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    return response.json();
+}
+
+async function loadStructure() {
+    try {
+        const catalog = await fetchJSON('catalog.json');
+        volumes = catalog.volumes;
+        sharded = true;
+    } catch (error) {
+        volumes = await pageStructure;
+    }
+
+    volumes.forEach(volume => {
+        volume.normalized = normalize(volume.volume);
+        volume.themes.forEach(theme => {
+            theme.normalized = normalize(theme.theme);
+            theme.titles.forEach((title, titleIndex) => {
+                title.normalized = normalize(title.title);
+                if (!sharded) return;
+                // Repeated bodies are only stored with their first publication (scripts/shards.py)
+                title.content_ids.forEach((id, pubIndex) => {
+                    if (id !== null && !canonicalLocations[id]) {
+                        canonicalLocations[id] = { shard: theme.shard, titleIndex, pubIndex };
+                    }
+                });
+            });
+        });
+    });
+
+    try {
+        searchMeta = await fetchJSON('search/meta.json');
+    } catch (error) {
+        searchMeta = null;
+    }
+}
+
+function normalize(text) {
+    return (text || '').normalize('NFKC').toLowerCase();
+}
+
+// Bigrams over code points, skipping whitespace, as text_bigrams() in search_index.py
+function bigrams(term) {
+    const chars = Array.from(term);
+    const grams = [];
+    for (let i = 0; i + 1 < chars.length; i++) {
+        if (/\s/.test(chars[i]) || /\s/.test(chars[i + 1])) continue;
+        grams.push(chars[i] + chars[i + 1]);
+    }
+    return grams;
+}
+
+// A one-character term is looked up as is, longer terms by their bigrams (query_grams() in search_index.py)
+function termGrams(term) {
+    const chars = Array.from(term);
+    return chars.length === 1 ? chars : bigrams(term);
+}
+
+function gramShard(gram) {
+    const [a, b] = Array.from(gram);
+    if (b === undefined) return a.codePointAt(0) % searchMeta.shard_count;
+    return (a.codePointAt(0) * 31 + b.codePointAt(0)) % searchMeta.shard_count;
+}
+
+function loadPostingShard(index) {
+    if (!postingShards[index]) {
+        postingShards[index] = fetchJSON(searchMeta.files[index]).catch(error => {
+            delete postingShards[index];
+            throw error;
+        });
+    }
+    return postingShards[index];
+}
+
+function decodePostings(encoded) {
+    const ids = new Set();
+    let docId = 0;
+    encoded.split(',').forEach(delta => {
+        docId += parseInt(delta, 36);
+        ids.add(docId);
+    });
+    return ids;
+}
+
+// Doc ids containing every gram of the terms (candidates: phrases are checked on the content)
+async function candidateDocs(terms) {
+    const grams = Array.from(new Set(terms.flatMap(termGrams)));
+    if (grams.length === 0) return null;
+
+    const shards = await Promise.all(grams.map(gram => loadPostingShard(gramShard(gram))));
+    let result = null;
+    for (let i = 0; i < grams.length; i++) {
+        const encoded = shards[i][grams[i]];
+        if (!encoded) return [];
+        const ids = decodePostings(encoded);
+        result = result === null ? ids : new Set([...result].filter(id => ids.has(id)));
+        if (result.size === 0) return [];
+    }
+    return Array.from(result);
+}
+
+function loadContentShard(path) {
+    if (!contentShards[path]) {
+        contentShards[path] = fetchJSON(path).catch(error => {
+            delete contentShards[path];
+            throw error;
+        });
+    }
+    return contentShards[path];
+}
+
+async function getPublication(v, t, ti, p) {
+    const theme = volumes[v].themes[t];
+    const shard = await loadContentShard(theme.shard);
+    const pub = shard.titles[ti][p];
+    if (pub.content !== undefined) return pub;
+
+    const location = canonicalLocations[theme.titles[ti].content_ids[p]];
+    const canonicalShard = await loadContentShard(location.shard);
+    return { ...pub, content: canonicalShard.titles[location.titleIndex][location.pubIndex].content };
+}
+
+function requestPublications(locations) {
+    return new Promise(resolve => {
+        const requestId = ++publicationRequestId;
+        publicationRequests.set(requestId, resolve);
+        self.postMessage({ type: 'publications', requestId, locations });
+    });
+}
+
+// Publications of a page of candidate titles, as one array per title aligned with its pubs
+async function loadPublications(page) {
+    if (sharded) {
+        return Promise.all(page.map(({ v, t, ti, pubs }) =>
+            Promise.all(pubs.map(p => getPublication(v, t, ti, p)))));
+    }
+    const locations = page.flatMap(({ v, t, ti, pubs }) => pubs.map(p => [v, t, ti, p]));
+    const publications = await requestPublications(locations);
+    let next = 0;
+    return page.map(({ pubs }) => publications.slice(next, next += pubs.length));
+}
+
+function escapeHTML(text) {
+    return text.replace(/[&<>"']/g, ch => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' })[ch]);
+}
+
+function escapeRegExp(text) {
+    return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+function countOccurrences(text, term) {
+    let count = 0;
+    for (let i = text.indexOf(term); i >= 0; i = text.indexOf(term, i + term.length)) count++;
+    return count;
+}
+
+function makeSnippet(text, terms) {
+    const at = text.indexOf(terms[0]);
+    const start = Math.max(0, at - SNIPPET_RADIUS);
+    const end = Math.min(text.length, at + terms[0].length + SNIPPET_RADIUS);
+    let snippet = escapeHTML(text.slice(start, end).replace(/\s+/g, ' '));
+    const pattern = new RegExp(terms.map(term => escapeRegExp(escapeHTML(term))).join('|'), 'g');
+    snippet = snippet.replace(pattern, match => `<mark>${match}</mark>`);
+    return (start > 0 ? '…' : '') + snippet + (end < text.length ? '…' : '');
+}
+
+function postChunks(id, results, done, more = false) {
+    for (let i = 0; i < results.length; i += CHUNK_SIZE) {
+        const last = done && i + CHUNK_SIZE >= results.length;
+        self.postMessage({ type: 'results', id, results: results.slice(i, i + CHUNK_SIZE), done: last, more: last && more });
+    }
+    if (results.length === 0 && done) {
+        self.postMessage({ type: 'results', id, results: [], done: true, more });
+    }
+}
+
+function matchNames(terms) {
+    const matches = (text) => terms.every(term => text.includes(term));
+    const results = [];
+
+    volumes.forEach((volume, v) => {
+        const matchVolume = matches(volume.normalized);
+        volume.themes.forEach((theme, t) => {
+            const matchTheme = matches(theme.normalized);
+            theme.titles.forEach((title, ti) => {
+                if (title.title === '---') return;
+                let score = 0;
+                let matchType = null;
+                if (matches(title.normalized)) {
+                    matchType = 'title';
+                    score = 300 + (title.normalized.startsWith(terms[0]) ? 50 : 0);
+                } else if (matchTheme) {
+                    matchType = 'theme';
+                    score = 200;
+                } else if (matchVolume) {
+                    matchType = 'volume';
+                    score = 100;
+                }
+                if (matchType) results.push({ v, t, ti, matchType, score });
+            });
+        });
+    });
+
+    // Array.prototype.sort is stable: equal scores stay in corpus order
+    return results.sort((a, b) => b.score - a.score);
+}
+
+// Candidate publications grouped by title; titles sharing a shard are kept together and the
+// shards with the most candidates come first, so the likely best results are verified first
+function candidateTitles(docs, exclude) {
+    const byShard = new Map();
+    docs.forEach(docId => {
+        const [v, t, ti, p] = searchMeta.docs[docId];
+        const key = `${v}/${t}/${ti}`;
+        if (exclude.has(key)) return;
+        const shardKey = sharded ? volumes[v].themes[t].shard : '';
+        if (!byShard.has(shardKey)) byShard.set(shardKey, new Map());
+        const titles = byShard.get(shardKey);
+        if (!titles.has(key)) titles.set(key, { v, t, ti, pubs: [] });
+        titles.get(key).pubs.push(p);
+    });
+
+    return Array.from(byShard.values())
+        .sort((a, b) => candidateCount(b) - candidateCount(a))
+        .flatMap(titles => Array.from(titles.values()));
+}
+
+function candidateCount(titles) {
+    let count = 0;
+    titles.forEach(title => { count += title.pubs.length; });
+    return count;
+}
+
+// Returns true when candidates are left for a later 'more' request
+async function searchContent(id, terms, exclude) {
+    const docs = await candidateDocs(terms);
+    if (!docs || id !== latestSearchId) return false;
+    const titles = candidateTitles(docs, exclude);
+
+    // A one- or two-character term is a single gram: its postings are the exact matches
+    if (terms.every(term => Array.from(term).length <= 2)) {
+        const results = titles.map(({ v, t, ti, pubs }) => ({ v, t, ti, matchType: 'content', score: pubs.length }));
+        postChunks(id, results.sort((a, b) => b.score - a.score), false);
+        return false;
+    }
+
+    contentSearch = { id, terms, titles, next: 0, busy: false };
+    return verifyNextPage(contentSearch);
+}
+
+// Verifies candidates until a page of results is found or none are left
+async function verifyNextPage(search) {
+    search.busy = true;
+    try {
+        let found = 0;
+        while (found < PAGE_SIZE && search.next < search.titles.length) {
+            const page = search.titles.slice(search.next, search.next + PAGE_SIZE);
+            search.next += page.length;
+            const publications = await loadPublications(page);
+            if (search.id !== latestSearchId) return false;
+
+            const results = [];
+            page.forEach((candidate, i) => {
+                const result = verifyTitle(candidate, publications[i], search.terms);
+                if (result) results.push(result);
+            });
+            postChunks(search.id, results.sort((a, b) => b.score - a.score), false);
+            found += results.length;
+        }
+        return search.next < search.titles.length;
+    } finally {
+        search.busy = false;
+    }
+}
+
+function verifyTitle({ v, t, ti }, publications, terms) {
+    const title = volumes[v].themes[t].titles[ti].normalized;
+    let matched = 0;
+    let hits = 0;
+    let headerHits = 0;
+    let snippet = null;
+    for (const pub of publications) {
+        const header = normalize(pub.header);
+        const content = normalize(pub.content);
+        if (!terms.every(term => title.includes(term) || header.includes(term) || content.includes(term))) continue;
+
+        matched++;
+        hits += terms.reduce((sum, term) => sum + countOccurrences(content, term), 0);
+        headerHits += terms.reduce((sum, term) => sum + countOccurrences(header, term), 0);
+        if (snippet === null && content.includes(terms[0])) snippet = makeSnippet(content, terms);
+    }
+    if (matched === 0) return null;
+    return { v, t, ti, matchType: 'content', score: headerHits * 10 + Math.min(hits, 50), snippet, hits };
+}
+
+async function runSearch(id, query) {
+    await ready;
+    if (id !== latestSearchId) return;
+
+    const terms = normalize(query).split(/\s+/).filter(Boolean);
+    if (terms.length === 0) {
+        postChunks(id, [], true);
+        return;
+    }
+
+    const nameResults = matchNames(terms);
+    postChunks(id, nameResults, false);
+
+    let more = false;
+    if (searchMeta) {
+        const exclude = new Set(nameResults.map(r => `${r.v}/${r.t}/${r.ti}`));
+        try {
+            more = await searchContent(id, terms, exclude);
+        } catch (error) {
+            console.error('Search worker: content search failed', error);
+        }
+    }
+
+    if (id === latestSearchId) postChunks(id, [], true, more);
+}
+
+async function continueSearch(id) {
+    const search = contentSearch;
+    if (!search || search.id !== id || id !== latestSearchId || search.busy) return;
+
+    let more = false;
+    try {
+        more = await verifyNextPage(search);
+    } catch (error) {
+        console.error('Search worker: content search failed', error);
+    }
+    if (id === latestSearchId) postChunks(id, [], true, more);
+}
+
+self.onmessage = (event) => {
+    const message = event.data;
+    if (message.type === 'search') {
+        latestSearchId = message.id;
+        contentSearch = null;
+        runSearch(message.id, message.query);
+    } else if (message.type === 'more') {
+        continueSearch(message.id);
+    } else if (message.type === 'structure') {
+        resolveStructure(message.volumes);
+    } else if (message.type === 'publications') {
+        const resolve = publicationRequests.get(message.requestId);
+        publicationRequests.delete(message.requestId);
+        if (resolve) resolve(message.publications);
+    }
+};
@@ -0,0 +1,141 @@
+import os
+import re
+import sys
+import time
+import argparse
+
+import paths
+from markdown_tokenizer import iter_records
+
+# Default corpus location, same as generate_json.py
+BASE_DIR = paths.MARKDOWN_DIR
+
+# Reference: the parser generate_json.py used before markdown_tokenizer
+def legacy_parse_header(header_line):
+    header_line = re.sub(r'^(\*\*|＊＊)|(\*\*|＊＊)$', '', header_line.strip()).strip()
+
+    source = ""
+    title = ""
+    date = ""
+
+    title_match = re.search(r'「(.*?)」', header_line)
+    if title_match:
+        title = title_match.group(1)
+
+    date_match = re.search(r'（(.*?)）', header_line)
+    if date_match:
+        date = date_match.group(1)
+
+    clean_line = header_line
+    if title_match:
+        clean_line = clean_line.replace(title_match.group(0), '')
+    if date_match:
+        clean_line = clean_line.replace(date_match.group(0), '')
+
+    source = clean_line.strip()
+
+    return {
+        "full_header": header_line.strip(),
+        "source": source,
+        "publication_title": title,
+        "date": date
+    }
+
+def legacy_records(content):
+    """Legacy re.split parser, reshaped into tokenizer records (without line numbers)."""
+    records = []
+    tokens = re.split(r'^((?:#|##)\s+.+)$', content, flags=re.MULTILINE)
+
+    for i in range(1, len(tokens), 2):
+        header_line = tokens[i].strip()
+        section_content = tokens[i+1].strip() if i+1 < len(tokens) else ""
+
+        if header_line.startswith('# '):
+            records.append({"kind": "title", "text": header_line[1:].strip()})
+        elif header_line.startswith('## '):
+            parsed = legacy_parse_header(header_line[3:])
+            records.append({
+                "kind": "publication",
+                "header": parsed["full_header"],
+                "source": parsed["source"],
+                "publication_title": parsed["publication_title"],
+                "date": parsed["date"],
+                "content": section_content
+            })
+
+    return records
+
+def tokenizer_records(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        records = list(iter_records(f))
+    for record in records:
+        del record["line"]
+    return records
+
+def legacy_file_records(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return legacy_records(f.read())
+
+def best_of(func, arg, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def find_largest_files(base_dir, count):
+    files = []
+    for root, _, filenames in os.walk(base_dir):
+        if os.path.basename(root) == 'Indices':
+            continue
+        for filename in filenames:
+            if filename.endswith('.md'):
+                path = os.path.join(root, filename)
+                files.append((os.path.getsize(path), path))
+    return [path for _, path in sorted(files, reverse=True)[:count]]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare markdown_tokenizer against the legacy re.split parser")
+    parser.add_argument('files', nargs='*', help="Markdown files to parse (default: the largest files under --base-dir)")
+    parser.add_argument('--base-dir', default=BASE_DIR)
+    parser.add_argument('--count', type=int, default=5, help="Number of largest files to use when no files are given")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    files = args.files or find_largest_files(args.base_dir, args.count)
+    if not files:
+        print("No Markdown files found.")
+        return 1
+
+    mismatches = 0
+    total_legacy = 0.0
+    total_tokenizer = 0.0
+
+    print(f"{'file':<40} {'size':>8} {'legacy':>10} {'tokenizer':>10} {'speedup':>8}")
+    for path in files:
+        if legacy_file_records(path) != tokenizer_records(path):
+            print(f"MISMATCH: {path}")
+            mismatches += 1
+
+        legacy = best_of(legacy_file_records, path, args.repeat)
+        tokenizer = best_of(tokenizer_records, path, args.repeat)
+        total_legacy += legacy
+        total_tokenizer += tokenizer
+
+        name = os.path.basename(path)
+        size_kb = os.path.getsize(path) // 1024
+        print(f"{name[:40]:<40} {size_kb:>6}KB {legacy * 1000:>8.1f}ms {tokenizer * 1000:>8.1f}ms "
+              f"{legacy / tokenizer:>7.2f}x")
+
+    print(f"{'total':<40} {'':>8} {total_legacy * 1000:>8.1f}ms {total_tokenizer * 1000:>8.1f}ms "
+          f"{total_legacy / total_tokenizer:>7.2f}x")
+
+    if mismatches:
+        print(f"{mismatches} file(s) parse differently")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+import generate_json
+import markdown_tokenizer
+
+# Benchmark harness for the Markdown -> JSON build.
+#
+# Each corpus (the real one and synthetic copies scaled N times) is timed stage by stage:
+#   walk       list_volumes + collect_theme_files
+#   read       reading every source file
+#   split      line tokenizing into header/body records (parse_header stubbed out)
+#   headers    parse_header over every H2 line
+#   assemble   parse_file for every file, merged per theme
+#   separators build_theme_entries (empty-title filtering and '---' separators)
+#   serialize  json.dumps(indent=2) of the whole tree
+# plus an end-to-end convert_to_json() run in a child process for wall time, peak RSS
+# and output size. Results are written as JSON so runs can be compared between commits.
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def stage_walk():
+    plan = []
+    for volume_name, volume_path in generate_json.list_volumes():
+        for theme_order, theme_name, filename in generate_json.collect_theme_files(volume_path):
+            plan.append((volume_name, volume_path, theme_order, theme_name, filename))
+    return plan
+
+def stage_read(plan):
+    contents = []
+    for _, volume_path, _, _, filename in plan:
+        with open(os.path.join(volume_path, filename), 'r', encoding='utf-8') as f:
+            contents.append(f.read())
+    return contents
+
+def stage_split(contents):
+    # Tokenize only: the header parser is swapped for a no-op so it is timed separately
+    original = markdown_tokenizer.parse_header
+    markdown_tokenizer.parse_header = lambda header: {
+        "full_header": header, "source": "", "publication_title": "", "date": ""
+    }
+    try:
+        headers = []
+        for content in contents:
+            for record in markdown_tokenizer.iter_records(io.StringIO(content)):
+                if record["kind"] == "publication":
+                    headers.append(record["header"])
+        return headers
+    finally:
+        markdown_tokenizer.parse_header = original
+
+def stage_headers(headers):
+    for header in headers:
+        markdown_tokenizer.parse_header(header)
+    return len(headers)
+
+def stage_assemble(plan):
+    volumes = {}
+    for volume_name, volume_path, theme_order, theme_name, filename in plan:
+        themes_map = volumes.setdefault(volume_name, {})
+        if theme_order not in themes_map:
+            themes_map[theme_order] = {"name": theme_name, "titles": []}
+        themes_map[theme_order]["titles"].extend(
+            generate_json.parse_file(os.path.join(volume_path, filename), filename))
+    return volumes
+
+def stage_separators(volumes):
+    data = []
+    for volume_name, themes_map in volumes.items():
+        data.append({"volume": volume_name, "themes": generate_json.build_theme_entries(themes_map)})
+    return data
+
+def stage_serialize(data):
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+def run_end_to_end(base_dir, output_file, extra_args):
+    """Runs convert_to_json in a child process; returns (seconds, peak_rss_kb, output_bytes)."""
+    code = (
+        "import sys, resource, generate_json as g\n"
+        f"g.BASE_DIR = {base_dir!r}\n"
+        f"g.OUTPUT_FILE = {output_file!r}\n"
+        f"g.MANIFEST_FILE = {output_file + '.manifest'!r}\n"
+        f"g.CACHE_DIR = {output_file + '.cache'!r}\n"
+        f"g.convert_to_json(**{extra_args!r})\n"
+        "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, file=sys.stderr)\n"
+    )
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-c', code], cwd=SCRIPTS_DIR,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    elapsed = time.perf_counter() - start
+
+    maxrss = int(proc.stderr.strip().splitlines()[-1])
+    if sys.platform == 'darwin':
+        maxrss //= 1024
+    return elapsed, maxrss, os.path.getsize(output_file)
+
+def benchmark_corpus(base_dir, label, scale, work_dir, extra_args):
+    # The stages walk generate_json.BASE_DIR; it is put back afterwards, since the synthetic
+    # corpora are deleted and pipeline.py may run other stages in the same process
+    original_base_dir = generate_json.BASE_DIR
+    generate_json.BASE_DIR = base_dir
+    try:
+        stages = {}
+        stages["walk"], plan = timed(stage_walk)
+        stages["read"], contents = timed(stage_read, plan)
+        stages["split"], headers = timed(stage_split, contents)
+        corpus_bytes = sum(len(c.encode('utf-8')) for c in contents)
+        del contents
+        stages["headers"], _ = timed(stage_headers, headers)
+        stages["assemble"], volumes = timed(stage_assemble, plan)
+        stages["separators"], data = timed(stage_separators, volumes)
+        del volumes
+    finally:
+        generate_json.BASE_DIR = original_base_dir
+    stages["serialize"], text = timed(stage_serialize, data)
+    serialized_bytes = len(text.encode('utf-8'))
+    del data, text
+
+    output_file = os.path.join(work_dir, f"{label}.json")
+    total, rss, output_bytes = run_end_to_end(base_dir, output_file, extra_args)
+    os.remove(output_file)
+    if os.path.exists(output_file + '.manifest'):
+        os.remove(output_file + '.manifest')
+    shutil.rmtree(output_file + '.cache', ignore_errors=True)
+
+    return {
+        "corpus": label,
+        "scale": scale,
+        "files": len(plan),
+        "headers": len(headers),
+        "corpus_bytes": corpus_bytes,
+        "stages": {name: round(seconds, 4) for name, seconds in stages.items()},
+        "end_to_end": {
+            "seconds": round(total, 4),
+            "peak_rss_kb": rss,
+            "output_bytes": output_bytes
+        },
+        "serialized_bytes": serialized_bytes
+    }
+
+def generate_synthetic_corpus(base_dir, target_dir, scale):
+    """
+    Builds a corpus `scale` times larger by repeating every theme file as extra group
+    files of the same theme (real text, so regex and header costs stay representative).
+    Copies are hard links where the filesystem allows it.
+    """
+    for volume_name, volume_path in generate_json.list_volumes(base_dir):
+        target_volume = os.path.join(target_dir, volume_name)
+        os.makedirs(target_volume, exist_ok=True)
+
+        counters = {}
+        for theme_order, theme_name, filename in generate_json.collect_theme_files(volume_path):
+            source = os.path.join(volume_path, filename)
+            for _ in range(scale):
+                counters[theme_order] = counters.get(theme_order, 0) + 1
+                target = os.path.join(target_volume,
+                                      f"{theme_order} - {theme_name}_{counters[theme_order]:04d}_edited.md")
+                try:
+                    os.link(source, target)
+                except OSError:
+                    shutil.copyfile(source, target)
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Markdown -> JSON build stage by stage")
+    parser.add_argument('--base-dir', default=generate_json.BASE_DIR, help="Real Markdown corpus")
+    parser.add_argument('--scales', default="1,10",
+                        help="Comma-separated corpus scales; 1 is the real corpus, N > 1 a synthetic copy (e.g. 1,10,100)")
+    parser.add_argument('--jobs', type=int, default=1, help="--jobs passed to the end-to-end run")
+    parser.add_argument('--work-dir', default=None, help="Where synthetic corpora are generated (default: a temp dir)")
+    parser.add_argument('--output', default="bench_results.json", help="Machine-readable results file")
+    args = parser.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(',') if s.strip()]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="shin_college_bench_")
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S'),
+        "runs": []
+    }
+
+    try:
+        for scale in scales:
+            if scale == 1:
+                base_dir = args.base_dir
+            else:
+                base_dir = os.path.join(work_dir, f"corpus_x{scale}")
+                print(f"Generating synthetic corpus x{scale} in {base_dir}...")
+                generate_synthetic_corpus(args.base_dir, base_dir, scale)
+
+            print(f"Benchmarking x{scale}...")
+            run = benchmark_corpus(base_dir, f"x{scale}", scale, work_dir, {"jobs": args.jobs})
+            results["runs"].append(run)
+
+            if scale != 1:
+                shutil.rmtree(base_dir)
+
+            stages = run["stages"]
+            print("  " + "  ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in stages.items()))
+            e2e = run["end_to_end"]
+            print(f"  end-to-end={e2e['seconds']:.2f}s  peak_rss={e2e['peak_rss_kb'] // 1024}MB  "
+                  f"output={e2e['output_bytes'] // (1024 * 1024)}MB  corpus={run['corpus_bytes'] // (1024 * 1024)}MB")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Results written to: {args.output}")
+
+if __name__ == "__main__":
+    main()
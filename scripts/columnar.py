@@ -0,0 +1,247 @@
+"""
+Compact columnar corpus file (shin_college_data.shcc), written by generate_json.py --columnar.
+
+Layout (little-endian, every section 8-byte aligned):
+
+    0   b'SHCC'  u32 version  u64 directory offset  u64 directory length
+    ... sections (see "sections" in the directory: name -> [offset, byte length, typecode])
+    ... directory: compact JSON
+
+Sections:
+    str_offsets  Q  offsets of every string in str_blob (n_strings + 1 entries)
+    str_blob        UTF-8 strings, each stored once (headers, sources, dates, titles...)
+    pub_header   I  string id of each publication's header
+    pub_source   I  string id of the source
+    pub_title    I  string id of the publication title (「」)
+    pub_date     I  string id of the date (（）)
+    pub_type     B  index into directory["types"]
+    pub_offset   Q  offset of the body in content_blob
+    pub_length   I  byte length of the body
+    content_blob    UTF-8 bodies concatenated; identical bodies are stored once
+
+The directory also holds the small tree: volumes [name, first_theme, theme_count],
+themes [volume, name, first_title, title_count, html] (html: the theme's fragment file
+written by --html, or null) and titles [theme, title, origin_filename, first_publication,
+publication_count] ('---' separators included).
+
+ColumnarCorpus maps the file and reads a publication's body as a zero-copy memoryview.
+"""
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+
+from title_groups import build_title_groups
+
+MAGIC = b'SHCC'
+VERSION = 2
+HEADER = struct.Struct('<4sIQQ')
+PUB_TYPES = ["publication", "intro"]
+
+def _aligned(n):
+    return (n + 7) & ~7
+
+def _le_bytes(arr):
+    if sys.byteorder != 'little':
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+def build_columns(data):
+    strings = {}
+    str_list = []
+
+    def sid(s):
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(str_list)
+            str_list.append(s)
+        return i
+
+    volumes, themes, titles = [], [], []
+    cols = {name: array(code) for name, code in [
+        ('pub_header', 'I'), ('pub_source', 'I'), ('pub_title', 'I'), ('pub_date', 'I'),
+        ('pub_type', 'B'), ('pub_offset', 'Q'), ('pub_length', 'I')
+    ]}
+    bodies = {}
+    content_parts = []
+    content_size = 0
+    n_pubs = 0
+
+    for volume in data:
+        volumes.append([volume["volume"], len(themes), len(volume["themes"])])
+        for theme in volume["themes"]:
+            themes.append([len(volumes) - 1, theme["theme"], len(titles), len(theme["titles"]), theme.get("html")])
+            for title in theme["titles"]:
+                titles.append([len(themes) - 1, title["title"], title.get("origin_filename"),
+                               n_pubs, len(title["publications"])])
+                for pub in title["publications"]:
+                    cols['pub_header'].append(sid(pub["header"]))
+                    cols['pub_source'].append(sid(pub["source"]))
+                    cols['pub_title'].append(sid(pub["publication_title"]))
+                    cols['pub_date'].append(sid(pub["date"]))
+                    cols['pub_type'].append(PUB_TYPES.index(pub["type"]))
+
+                    body = pub["content"]
+                    location = bodies.get(body)
+                    if location is None:
+                        encoded = body.encode('utf-8')
+                        location = bodies[body] = (content_size, len(encoded))
+                        content_parts.append(encoded)
+                        content_size += len(encoded)
+                    cols['pub_offset'].append(location[0])
+                    cols['pub_length'].append(location[1])
+                    n_pubs += 1
+
+    str_offsets = array('Q', [0])
+    str_parts = []
+    for s in str_list:
+        encoded = s.encode('utf-8')
+        str_parts.append(encoded)
+        str_offsets.append(str_offsets[-1] + len(encoded))
+
+    sections = [('str_offsets', str_offsets.typecode, _le_bytes(str_offsets)),
+                ('str_blob', '', b''.join(str_parts))]
+    sections += [(name, arr.typecode, _le_bytes(arr)) for name, arr in cols.items()]
+    sections.append(('content_blob', '', b''.join(content_parts)))
+
+    directory = {
+        "publications": n_pubs,
+        "strings": len(str_list),
+        "types": PUB_TYPES,
+        "volumes": volumes,
+        "themes": themes,
+        "titles": titles
+    }
+    return directory, sections
+
+def write_columnar(data, path):
+    directory, sections = build_columns(data)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        directory["sections"] = {}
+        for name, typecode, payload in sections:
+            offset = _aligned(f.tell())
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(payload)
+            directory["sections"][name] = [offset, len(payload), typecode]
+
+        dir_offset = _aligned(f.tell())
+        f.write(b'\0' * (dir_offset - f.tell()))
+        dir_bytes = json.dumps(directory, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        f.write(dir_bytes)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, dir_offset, len(dir_bytes)))
+    os.replace(tmp_path, path)
+
+    print(f"Columnar corpus generated at: {path} ({os.path.getsize(path) // 1024} KB)")
+
+class ColumnarCorpus:
+    """
+    Read-only view of a .shcc file through mmap.
+    content_bytes() returns memoryviews into the mapping: release them before close().
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mm)
+
+        magic, version, dir_offset, dir_length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} columnar corpus")
+
+        self.directory = json.loads(bytes(self._view[dir_offset:dir_offset + dir_length]).decode('utf-8'))
+        self.volumes = self.directory["volumes"]
+        self.themes = self.directory["themes"]
+        self.titles = self.directory["titles"]
+        self.types = self.directory["types"]
+
+        self._cols = {}
+        for name, (offset, length, typecode) in self.directory["sections"].items():
+            section = self._view[offset:offset + length]
+            if typecode:
+                if sys.byteorder != 'little':
+                    arr = array(typecode, bytes(section))
+                    arr.byteswap()
+                    section = memoryview(arr)
+                else:
+                    section = section.cast(typecode)
+            self._cols[name] = section
+
+    def __len__(self):
+        return self.directory["publications"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._cols = {}
+        if getattr(self, '_view', None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, '_mm', None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._file.close()
+
+    def string(self, string_id):
+        offsets = self._cols['str_offsets']
+        return bytes(self._cols['str_blob'][offsets[string_id]:offsets[string_id + 1]]).decode('utf-8')
+
+    def content_bytes(self, pub_id):
+        """UTF-8 body of a publication as a zero-copy memoryview."""
+        offset = self._cols['pub_offset'][pub_id]
+        return self._cols['content_blob'][offset:offset + self._cols['pub_length'][pub_id]]
+
+    def content(self, pub_id):
+        return str(self.content_bytes(pub_id), 'utf-8')
+
+    def publication(self, pub_id):
+        cols = self._cols
+        return {
+            "header": self.string(cols['pub_header'][pub_id]),
+            "source": self.string(cols['pub_source'][pub_id]),
+            "publication_title": self.string(cols['pub_title'][pub_id]),
+            "date": self.string(cols['pub_date'][pub_id]),
+            "content": self.content(pub_id),
+            "type": self.types[cols['pub_type'][pub_id]]
+        }
+
+    def title_publications(self, title_id):
+        """Publication ids of a title (titles index into self.titles)."""
+        _, _, _, first, count = self.titles[title_id]
+        return range(first, first + count)
+
+    def to_data(self):
+        """Rebuilds the generate_json volume list (same shape as shin_college_data.json)."""
+        data = []
+        for name, first_theme, theme_count in self.volumes:
+            themes = []
+            for theme_id in range(first_theme, first_theme + theme_count):
+                _, theme_name, first_title, title_count, html = self.themes[theme_id]
+                titles = []
+                for title_id in range(first_title, first_title + title_count):
+                    _, title, origin_filename, _, _ = self.titles[title_id]
+                    entry = {
+                        "title": title,
+                        "publications": [self.publication(i) for i in self.title_publications(title_id)]
+                    }
+                    if origin_filename is not None:
+                        entry["origin_filename"] = origin_filename
+                    titles.append(entry)
+                theme = {"theme": theme_name, "titles": titles, "groups": build_title_groups(titles)}
+                if html is not None:
+                    theme["html"] = html
+                themes.append(theme)
+            data.append({"volume": name, "themes": themes})
+        return data
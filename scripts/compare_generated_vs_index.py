@@ -1,23 +1,24 @@
 import json
 import os
 import re
+import sys
+import bisect
+import argparse
+import contextlib
+
+import paths
+import generate_json
 
 # Paths
-JSON_PATH = '/Users/michael/Documents/Ensinamentos/ShinCollege/data/shin_college_data.json'
-INDICES_DIR = '/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown/Indices'
-
-# Map volume index filenames to volume names (or order) to match JSON
-# JSON volumes:
-# 0: 1.経綸・霊主体従・夜昼転換・祖霊祭祀編
-# 1: 2.浄霊・神示の健康法・自然農法編
-# 2: 3.信仰編
-# 3: 4.その他
-
-# Index filenames:
-# 1- 経綸・霊主体従・夜昼転換・祖霊祭祀編.md
-# 2 - 浄霊・神示の健康法・自然農法編.md
-# 3- 信仰編.md
-# 4 - その他.md
+JSON_PATH = os.path.join(paths.DATA_DIR, paths.JSON_NAME)
+INDICES_DIR = os.path.join(paths.MARKDOWN_DIR, paths.INDICES_DIRNAME)
+
+# Index files are matched to volumes by their leading number:
+# JSON volumes:                          Index filenames:
+# 1.経綸・霊主体従・夜昼転換・祖霊祭祀編      1- 経綸・霊主体従・夜昼転換・祖霊祭祀編.md
+# 2.浄霊・神示の健康法・自然農法編           2 - 浄霊・神示の健康法・自然農法編.md
+# 3.信仰編                                3- 信仰編.md
+# 4.その他                                4 - その他.md
 
 def normalize_string(s):
     # Remove "について" (about)
@@ -31,89 +32,271 @@ def normalize_string(s):
 def parse_index_file(filepath):
     """
     Parses an index markdown file.
-    Returns a dict: { "Theme Name": {NormalizedTitle: OriginalTitle} }
+    Returns a dict: { "Theme Name": {NormalizedTitle: OriginalTitle} } (dicts keep file order)
     """
     themes = {}
     current_theme = None
-    
+
     with open(filepath, 'r', encoding='utf-8') as f:
         lines = f.readlines()
-        
+
     for line in lines:
         line = line.strip()
         if not line:
             continue
-            
+
         if line.startswith('・'):
             # It's a title
             title = line[1:].strip()
             if current_theme:
                  norm = normalize_string(title)
-                 themes[current_theme][norm] = title
+                 themes[current_theme].setdefault(norm, title)
         else:
             current_theme = line
             if current_theme not in themes:
                 themes[current_theme] = {}
-                
+
     return themes
 
-def load_json_data(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def load_index(indices_dir):
+    """
+    Parses every index file once and builds the lookup tables used by reconcile():
+      volumes[prefix] = {"file": name, "themes": {norm_theme: {"theme", "titles": {norm: orig}, "positions": {norm: i}}}}
+      titles[norm_title] = [(prefix, norm_theme), ...] across all volumes
+    Index "themes" without titles (the volume heading line) are dropped.
+    """
+    index = {"volumes": {}, "titles": {}}
+
+    for filename in sorted(os.listdir(indices_dir)):
+        match = re.match(r'^(\d+)\s*-', filename)
+        if not match or not filename.endswith('.md'):
+            continue
+        prefix = match.group(1)
+
+        themes = {}
+        for theme_name, titles in parse_index_file(os.path.join(indices_dir, filename)).items():
+            if not titles:
+                continue
+            norm_theme = normalize_string(theme_name)
+            themes[norm_theme] = {
+                "theme": theme_name,
+                "titles": titles,
+                "positions": {norm: i for i, norm in enumerate(titles)}
+            }
+            for norm in titles:
+                index["titles"].setdefault(norm, []).append((prefix, norm_theme))
+
+        index["volumes"][prefix] = {"file": filename, "themes": themes}
+
+    return index
+
+def out_of_order(positions):
+    """
+    Given index positions in JSON order, returns the indices (into positions) that are not
+    part of a longest increasing subsequence, i.e. the smallest set of titles to move.
+    """
+    tails = []       # tails[k] = index into positions of the smallest tail of an increasing run of length k+1
+    tail_values = []
+    parents = [-1] * len(positions)
+
+    for i, pos in enumerate(positions):
+        k = bisect.bisect_left(tail_values, pos)
+        if k > 0:
+            parents[i] = tails[k - 1]
+        if k == len(tails):
+            tails.append(i)
+            tail_values.append(pos)
+        else:
+            tails[k] = i
+            tail_values[k] = pos
+
+    keep = set()
+    i = tails[-1] if tails else -1
+    while i >= 0:
+        keep.add(i)
+        i = parents[i]
 
-def check_mismatches():
-    json_data = load_json_data(JSON_PATH)
-    index_files = sorted(os.listdir(INDICES_DIR))
-    
-    for vol_idx, vol_data in enumerate(json_data):
+    return [i for i in range(len(positions)) if i not in keep]
+
+def reconcile(json_data, index):
+    """
+    Two-way diff of the generated data against the index, in one pass over json_data.
+    Per theme it reports:
+      extra           titles in the data that the index does not list anywhere
+      missing         index titles of that theme that the data does not contain
+      reordered       titles present on both sides but out of index order
+      theme_mismatch  titles the index lists under a different theme (or volume)
+    """
+    report = {
+        "volumes_without_index": [],
+        "themes_not_in_index": [],
+        "index_themes_not_in_data": [],
+        "themes": [],
+        "summary": {"extra": 0, "missing": 0, "reordered": 0, "theme_mismatch": 0}
+    }
+
+    for vol_data in json_data:
         vol_name = vol_data['volume']
         vol_prefix = vol_name.split('.')[0]
-        
-        target_index_file = None
-        for f in index_files:
-            if f.startswith(f"{vol_prefix}-") or f.startswith(f"{vol_prefix} -"):
-                target_index_file = f
-                break
-        
-        if not target_index_file:
-            print(f"Skipping Volume {vol_name}: No matching index file found.")
+
+        index_volume = index["volumes"].get(vol_prefix)
+        if not index_volume:
+            report["volumes_without_index"].append(vol_name)
             continue
-            
-        print(f"Checking Volume: {vol_name}")
-        
-        index_content = parse_index_file(os.path.join(INDICES_DIR, target_index_file))
-        
-        # Flatten index keys for fuzzy matching themes
-        # Map NormalizedTheme -> OriginalIndexTheme
-        index_themes_norm = {normalize_string(k): k for k in index_content.keys()}
+
+        seen_themes = set()
 
         for theme in vol_data['themes']:
             json_theme_name = theme['theme']
-            norm_json_theme = normalize_string(json_theme_name)
-            
-            # Find matching theme in Index
-            matched_index_theme_key = index_themes_norm.get(norm_json_theme)
-            
-            if not matched_index_theme_key:
-                print(f"  [WARNING] JSON Theme '{json_theme_name}' NOT found in Index.")
+            norm_theme = normalize_string(json_theme_name)
+
+            index_theme = index_volume["themes"].get(norm_theme)
+            if not index_theme:
+                report["themes_not_in_index"].append({"volume": vol_name, "theme": json_theme_name})
                 continue
-            
-            expected_titles_map = index_content[matched_index_theme_key] # {Norm: Orig}
-            
-            accidental = []
+            seen_themes.add(norm_theme)
+
+            expected = index_theme["titles"]
+            positions = index_theme["positions"]
+
+            extra = []
+            mismatched = []
+            present = set()
+            common_titles = []
+            common_positions = []
+
             for t in theme['titles']:
-                if t['title'] == '---': continue
+                if t['title'] == '---':
+                    continue
                 json_title = t['title']
-                norm_json_title = normalize_string(json_title)
-                
-                if norm_json_title not in expected_titles_map:
-                    accidental.append(json_title)
-            
-            if accidental:
-                print(f"  Theme: {json_theme_name} (Index: {matched_index_theme_key})")
-                print(f"    Possible Accidental Titles (No match after normalization):")
-                for t in accidental:
-                     print(f"      - {t}")
+                norm = normalize_string(json_title)
+
+                if norm in expected:
+                    if norm not in present:
+                        present.add(norm)
+                        common_titles.append(json_title)
+                        common_positions.append(positions[norm])
+                    continue
+
+                elsewhere = [
+                    f"{index['volumes'][prefix]['themes'][other]['theme']} ({index['volumes'][prefix]['file']})"
+                    for prefix, other in index["titles"].get(norm, [])
+                ]
+                if elsewhere:
+                    mismatched.append({"title": json_title, "index_themes": elsewhere})
+                else:
+                    extra.append(json_title)
+
+            missing = [orig for norm, orig in expected.items() if norm not in present]
+            reordered = [common_titles[i] for i in out_of_order(common_positions)]
+
+            if extra or missing or reordered or mismatched:
+                report["themes"].append({
+                    "volume": vol_name,
+                    "theme": json_theme_name,
+                    "index_theme": index_theme["theme"],
+                    "extra": extra,
+                    "missing": missing,
+                    "reordered": reordered,
+                    "theme_mismatch": mismatched
+                })
+                report["summary"]["extra"] += len(extra)
+                report["summary"]["missing"] += len(missing)
+                report["summary"]["reordered"] += len(reordered)
+                report["summary"]["theme_mismatch"] += len(mismatched)
+
+        for norm_theme, index_theme in index_volume["themes"].items():
+            if norm_theme not in seen_themes:
+                report["index_themes_not_in_data"].append({
+                    "volume": vol_name,
+                    "theme": index_theme["theme"],
+                    "titles": len(index_theme["titles"])
+                })
+
+    return report
+
+def format_report(report):
+    lines = []
+
+    for vol_name in report["volumes_without_index"]:
+        lines.append(f"Skipping Volume {vol_name}: No matching index file found.")
+    for item in report["themes_not_in_index"]:
+        lines.append(f"[WARNING] {item['volume']}: JSON Theme '{item['theme']}' NOT found in Index.")
+    for item in report["index_themes_not_in_data"]:
+        lines.append(f"[WARNING] {item['volume']}: Index Theme '{item['theme']}' ({item['titles']} titles) NOT found in JSON.")
+
+    current_volume = None
+    for theme in report["themes"]:
+        if theme["volume"] != current_volume:
+            current_volume = theme["volume"]
+            lines.append(f"Volume: {current_volume}")
+
+        lines.append(f"  Theme: {theme['theme']} (Index: {theme['index_theme']})")
+        if theme["extra"]:
+            lines.append("    Possible Accidental Titles (not in Index):")
+            lines.extend(f"      - {t}" for t in theme["extra"])
+        if theme["theme_mismatch"]:
+            lines.append("    Titles listed under another Index theme:")
+            lines.extend(f"      - {m['title']} -> {', '.join(m['index_themes'])}" for m in theme["theme_mismatch"])
+        if theme["missing"]:
+            lines.append("    Missing Titles (in Index, not in JSON):")
+            lines.extend(f"      - {t}" for t in theme["missing"])
+        if theme["reordered"]:
+            lines.append("    Out of Index order:")
+            lines.extend(f"      - {t}" for t in theme["reordered"])
+
+    summary = report["summary"]
+    lines.append(f"Summary: {summary['extra']} extra, {summary['missing']} missing, "
+                 f"{summary['reordered']} reordered, {summary['theme_mismatch']} theme mismatches")
+    return '\n'.join(lines)
+
+def load_json_data(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_data(json_input=None):
+    """Generated data: from an existing JSON file, or parsed straight from the Markdown."""
+    if json_input:
+        return load_json_data(json_input)
+    # Keep the parser's progress output off stdout (reports may be written there)
+    with contextlib.redirect_stdout(sys.stderr):
+        return generate_json.build_data()
+
+def check_mismatches(json_input=None, output_format='text', output=None, json_data=None, index=None):
+    """json_data and index, when given, are an already loaded corpus and index (see pipeline.py)."""
+    if json_data is None:
+        json_data = load_data(json_input)
+    if index is None:
+        index = load_index(INDICES_DIR)
+    report = reconcile(json_data, index)
+
+    if output_format == 'json':
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+    else:
+        text = format_report(report)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    return report
+
+def has_differences(report):
+    return bool(any(report["summary"].values()) or report["themes_not_in_index"]
+                or report["index_themes_not_in_data"])
 
 if __name__ == "__main__":
-    check_mismatches()
+    parser = argparse.ArgumentParser(description="Reconcile the generated titles against Markdown/Indices")
+    parser.add_argument('--json-input', nargs='?', const=JSON_PATH, default=None,
+                        help="Read a generated JSON file (default path if no value) instead of parsing the Markdown")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--output', help="Write the report to this file instead of stdout")
+    parser.add_argument('--strict', action='store_true', help="Exit with status 1 if any difference is found")
+    args = parser.parse_args()
+
+    report = check_mismatches(args.json_input, args.format, args.output)
+
+    if args.strict and has_differences(report):
+        sys.exit(1)
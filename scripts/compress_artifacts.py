@@ -0,0 +1,117 @@
+import os
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from data_manifest import COMPRESSED_SUFFIXES, collect_data_files
+
+# Precompressed siblings of the served data files, written by generate_json.py --compress:
+#   <file>.gz  gzip -9 (mtime 0, so unchanged input gives identical output)
+#   <file>.br  brotli quality 11, when the "brotli" module is installed
+# The static host serves them with Content-Encoding instead of compressing at request time
+# (e.g. nginx gzip_static/brotli_static, or the .gz/.br lookup of most CDNs and static servers).
+#
+# A sibling newer than its source is kept, so content-addressed shards are only compressed once;
+# siblings whose source is gone (replaced shards) are removed. A build without --compress removes
+# the siblings of every file it wrote (remove_compressed), so a host never serves an older .gz/.br.
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+def compressors():
+    available = [(".gz", lambda raw: gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0))]
+    if brotli is not None:
+        available.append((".br", lambda raw: brotli.compress(raw, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)))
+    return available
+
+def is_fresh(source_path, compressed_path):
+    return (os.path.exists(compressed_path)
+            and os.path.getmtime(compressed_path) >= os.path.getmtime(source_path))
+
+def remove_orphans(data_dir, subdirs):
+    removed = 0
+    for subdir in subdirs:
+        full_dir = os.path.join(data_dir, subdir)
+        if not os.path.isdir(full_dir):
+            continue
+        for name in os.listdir(full_dir):
+            source, suffix = os.path.splitext(name)
+            if suffix in COMPRESSED_SUFFIXES and not os.path.exists(os.path.join(full_dir, source)):
+                os.remove(os.path.join(full_dir, name))
+                removed += 1
+    return removed
+
+def remove_compressed(data_dir, monolithic_name, outputs):
+    """Removes the .gz/.br siblings of the served files, for a build written without --compress."""
+    files = collect_data_files(data_dir, outputs) + [monolithic_name]
+    removed = 0
+    for path in files:
+        for suffix in COMPRESSED_SUFFIXES:
+            compressed_path = os.path.join(data_dir, path + suffix)
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+                removed += 1
+    removed += remove_orphans(data_dir, {os.path.dirname(path) for path in files})
+    if removed:
+        print(f"Removed {removed} compressed artifacts of an earlier build")
+    return removed
+
+def report_group(path):
+    # One report line per top-level file, one per directory of shards
+    return path.split('/', 1)[0] + '/' if '/' in path else path
+
+def compress_artifacts(data_dir, monolithic_name, outputs):
+    files = collect_data_files(data_dir, outputs)
+    if monolithic_name not in files and os.path.exists(os.path.join(data_dir, monolithic_name)):
+        files.insert(0, monolithic_name)
+
+    methods = compressors()
+    sizes = {}   # report group -> [files, raw bytes, bytes per suffix...]
+    written = 0
+    for path in files:
+        source_path = os.path.join(data_dir, path)
+        raw = None
+        row = sizes.setdefault(report_group(path), [0, 0] + [0] * len(methods))
+        row[0] += 1
+        row[1] += os.path.getsize(source_path)
+
+        for i, (suffix, compress) in enumerate(methods):
+            compressed_path = source_path + suffix
+            if not is_fresh(source_path, compressed_path):
+                if raw is None:
+                    with open(source_path, 'rb') as f:
+                        raw = f.read()
+                tmp_path = compressed_path + ".tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compress(raw))
+                os.replace(tmp_path, compressed_path)
+                written += 1
+            row[2 + i] += os.path.getsize(compressed_path)
+
+    removed = remove_orphans(data_dir, {os.path.dirname(path) for path in files} | {''})
+
+    print(f"Compressed artifacts in: {data_dir} ({written} written, {removed} stale removed"
+          f"{'' if brotli is not None else ', brotli not installed: .gz only'})")
+    print_report(sizes, [suffix for suffix, _ in methods])
+    return sizes
+
+def print_report(sizes, suffixes):
+    def kb(n):
+        return f"{n / 1024:,.0f} KB"
+
+    header = f"  {'artifact':<32} {'files':>5} {'raw':>12}" + ''.join(f" {s:>12} {'ratio':>6}" for s in suffixes)
+    print(header)
+    totals = [0] * (2 + len(suffixes))
+    for group, row in sizes.items():
+        line = f"  {group:<32} {row[0]:>5} {kb(row[1]):>12}"
+        for i in range(len(suffixes)):
+            line += f" {kb(row[2 + i]):>12} {row[1] / max(row[2 + i], 1):>5.1f}x"
+        print(line)
+        totals = [a + b for a, b in zip(totals, row)]
+
+    line = f"  {'total':<32} {totals[0]:>5} {kb(totals[1]):>12}"
+    for i in range(len(suffixes)):
+        line += f" {kb(totals[2 + i]):>12} {totals[1] / max(totals[2 + i], 1):>5.1f}x"
+    print(line)
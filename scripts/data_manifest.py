@@ -0,0 +1,88 @@
+import os
+import shutil
+import hashlib
+
+from shards import CATALOG_NAME, SHARDS_DIRNAME, dump_compact
+from search_index import SEARCH_DIRNAME
+from duplicates import DUPLICATES_NAME
+from date_normalizer import CHRONOLOGY_NAME
+from stable_ids import IDS_NAME
+from html_renderer import HTML_DIRNAME
+
+# Version manifest for the service worker (sw.js), written after every build:
+#   data/version.json  {"version": <hash of the file list>, "files": {path: sha256[:16], ...}}
+# Paths are relative to the data directory. The service worker keeps one cache per version
+# and, when the version changes, downloads only the files whose hash changed.
+#
+# Listed files are what the app needs offline, as given by the build that wrote them: the catalog
+# and its shards when the build is sharded (the monolithic JSON otherwise), plus the search index,
+# HTML fragments, duplicates, chronology and id index when they were generated in that build. Optional outputs
+# left on disk by an earlier build with other options are removed (remove_stale_outputs), since
+# the app would otherwise still load them.
+VERSION_NAME = "version.json"
+
+# Served outputs a build may or may not write; directories hold content-addressed .json files
+OPTIONAL_OUTPUTS = [CATALOG_NAME, SHARDS_DIRNAME, SEARCH_DIRNAME, HTML_DIRNAME, DUPLICATES_NAME, CHRONOLOGY_NAME,
+                    IDS_NAME]
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+def served_outputs(monolithic_name, sharded=False, search_index=False, html=False, duplicates=False,
+                   chronology=False, ids=False):
+    """The outputs (top-level files and directories) the app loads from a build with these options."""
+    outputs = [CATALOG_NAME, SHARDS_DIRNAME] if sharded else [monolithic_name]
+    outputs += [name for name, written in ((SEARCH_DIRNAME, search_index), (HTML_DIRNAME, html),
+                                           (DUPLICATES_NAME, duplicates), (CHRONOLOGY_NAME, chronology),
+                                           (IDS_NAME, ids)) if written]
+    return outputs
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+def collect_data_files(data_dir, outputs):
+    """Expands outputs into the list of files to serve, relative to data_dir."""
+    files = []
+    for name in outputs:
+        full_path = os.path.join(data_dir, name)
+        if os.path.isdir(full_path):
+            files += [f"{name}/{filename}" for filename in sorted(os.listdir(full_path)) if filename.endswith('.json')]
+        elif os.path.exists(full_path):
+            files.append(name)
+    return files
+
+def remove_stale_outputs(data_dir, outputs):
+    """Removes the optional outputs (and their compressed siblings) not written by this build."""
+    removed = []
+    for name in OPTIONAL_OUTPUTS:
+        if name in outputs:
+            continue
+        full_path = os.path.join(data_dir, name)
+        if os.path.isdir(full_path):
+            shutil.rmtree(full_path)
+            removed.append(name + '/')
+            continue
+        for path in [full_path] + [full_path + suffix for suffix in COMPRESSED_SUFFIXES]:
+            if os.path.exists(path):
+                os.remove(path)
+                removed.append(os.path.basename(path))
+    if removed:
+        print(f"Removed outputs of an earlier build: {', '.join(removed)}")
+    return removed
+
+def write_data_manifest(data_dir, outputs):
+    """Writes version.json for the outputs written by this build (see served_outputs)."""
+    remove_stale_outputs(data_dir, outputs)
+    files = {path: file_hash(os.path.join(data_dir, path)) for path in collect_data_files(data_dir, outputs)}
+    version = hashlib.sha256(dump_compact(files).encode('utf-8')).hexdigest()[:16]
+
+    path = os.path.join(data_dir, VERSION_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact({"version": version, "files": files}))
+    os.replace(tmp_path, path)
+
+    print(f"Version manifest generated at: {path} (version {version}, {len(files)} files)")
+    return version
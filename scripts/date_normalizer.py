@@ -0,0 +1,372 @@
+import os
+import re
+import sys
+import json
+import bisect
+import calendar
+import argparse
+import unicodedata
+
+from shards import dump_compact
+
+# Turns the raw header dates captured by parse_header ("昭和24年6月13日", "昭和二十七年八月十三日",
+# "昭和24年8月21発行", "地上天国　16号　昭和25年8月15日発行", "昭和10年代御執筆"...) into
+# ISO dates with a precision, and writes the chronological index (data/chronology.json).
+#
+# normalize_date() returns None for text that is not a date, otherwise:
+#   {"iso": "1949-06" (as precise as the source), "precision": "day|month|season|range|year|decade",
+#    "start": "1949-06-01", "end": "1949-06-30", "kind": "published|written|None",
+#    "qualifier": "circa|after|None", "periodical": "地上天国|None", "issue": 16|None}
+#
+# chronology.json:
+#   {"version", "docs": [[v, t, ti, p], ...] sorted by start date, "start": [...], "end": [...],
+#    "max_end": [...] (running maximum of end), "precision": [...], "undated": [[v, t, ti, p], ...]}
+# A range query is two binary searches: max_end finds the first entry that can end after the
+# range start, start finds the last entry beginning before the range end.
+
+CHRONOLOGY_NAME = "chronology.json"
+CHRONOLOGY_VERSION = 1
+
+ERA_START = {"明治": 1868, "大正": 1912, "昭和": 1926, "平成": 1989}
+
+# Known periodicals, longest first so that "東方の光" wins over "光"
+PERIODICALS = ["新宗教新聞", "地上天国", "東方の光", "観音講座", "健康", "栄光", "救世", "光"]
+PERIODICAL_RE = re.compile(r'(' + '|'.join(PERIODICALS) + r')」?\s*(\d+)\s*号')
+
+KANJI_DIGITS = {"〇": 0, "一": 1, "二": 2, "三": 3, "四": 4, "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+KANJI_NUMBER_RE = re.compile(r'[〇一二三四五六七八九十]+(?=[年月日代])')
+
+ERA_RE = re.compile(r'(明治|大正|昭和|平成)\s*(元|\d+)\s*(?:\(\d{4}\))?\s*[年念]?')
+YEAR_RE = re.compile(r'\s*(元|\d+)\s*年')
+MONTH_RE = re.compile(r'\s*(\d+)\s*(?:月|年(?=\s*\d+\s*日))')
+MONTH_PAIR_RE = re.compile(r'\s*(\d+)\s*月?\s*[・、]\s*(\d+)\s*月')
+DAY_RE = re.compile(r'\s*(\d+)\s*[日年]?')
+XUN_RE = re.compile(r'\s*([上中下])旬')
+SEASON_RE = re.compile(r'\s*([春夏秋冬])')
+RANGE_RE = re.compile(r'\s*[～〜~\-－]\s*')
+
+# Season -> (first month, last month); winter runs into the next year
+SEASONS = {"春": (3, 5), "夏": (6, 8), "秋": (9, 11), "冬": (12, 14)}
+
+def kanji_to_int(text):
+    """二十七 -> 27, 十三 -> 13, 二〇 -> 20 (positional form), 十五六 -> 15"""
+    if "十" not in text:
+        value = 0
+        for ch in text:
+            value = value * 10 + KANJI_DIGITS[ch]
+        return value
+    tens, _, units = text.partition("十")
+    value = (kanji_to_int(tens) if tens else 1) * 10
+    # "十五六年" (15 or 16): keep the first candidate
+    return value + (KANJI_DIGITS[units[0]] if units else 0)
+
+def normalize_text(raw):
+    # NFKC folds full-width digits, spaces and brackets; kanji numbers before 年/月/日 become digits
+    text = unicodedata.normalize('NFKC', raw).strip()
+    return KANJI_NUMBER_RE.sub(lambda m: str(kanji_to_int(m.group(0))), text)
+
+def _last_day(year, month):
+    return calendar.monthrange(year, month)[1]
+
+def _iso(year, month=None, day=None):
+    if month is None:
+        return f"{year:04d}"
+    if day is None:
+        return f"{year:04d}-{month:02d}"
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+def _era_year(era, year_text):
+    # 元年 is the first year of the era
+    return ERA_START[era] + (1 if year_text == "元" else int(year_text)) - 1
+
+def _new_info(era, year):
+    return {"era": era, "year": year, "month": None, "day": None,
+            "year_end": year, "month_end": None, "day_end": None, "precision": "year"}
+
+def _parse_point(text, pos, era=None, previous=None):
+    """
+    Parses one era date starting at pos. The era may be omitted when inherited (second half
+    of a range, e.g. "昭和23年10月～24年4月"); so may the year, or the year and month, that the
+    range shares with its start (previous): "昭和24年5月～6月", "昭和24年5月10日～20日".
+    Returns (info, end_pos) or (None, pos); info = {"year", "month", "day", "month_end",
+    "day_end", "precision"}.
+    """
+    match = ERA_RE.match(text, pos)
+    if match:
+        era = match.group(1)
+        year = _era_year(era, match.group(2))
+        pos = match.end()
+    elif era:
+        match = YEAR_RE.match(text, pos)
+        if match:
+            year = _era_year(era, match.group(1))
+            pos = match.end()
+        elif previous is not None and previous["month_end"] is not None:
+            return _parse_partial(text, pos, previous)
+        else:
+            return None, pos
+    else:
+        return None, pos
+
+    info = _new_info(era, year)
+
+    if text.startswith("代", pos):
+        # 昭和10年代: 昭和10年 to 昭和19年
+        info["year_end"] = year + 9
+        info["precision"] = "decade"
+        return info, pos + 1
+
+    match = MONTH_PAIR_RE.match(text, pos)
+    if match and 1 <= int(match.group(1)) <= 12 and 1 <= int(match.group(2)) <= 12:
+        info["month"], info["month_end"] = int(match.group(1)), int(match.group(2))
+        info["precision"] = "range"
+        return info, match.end()
+
+    match = SEASON_RE.match(text, pos)
+    if match:
+        first, last = SEASONS[match.group(1)]
+        info["month"] = first
+        if last > 12:
+            info["year_end"], info["month_end"] = year + 1, last - 12
+        else:
+            info["month_end"] = last
+        info["precision"] = "season"
+        return info, match.end()
+
+    return _parse_month_day(text, pos, info)
+
+def _parse_month_day(text, pos, info):
+    match = MONTH_RE.match(text, pos)
+    if not match or not 1 <= int(match.group(1)) <= 12:
+        return info, pos
+    info["month"] = info["month_end"] = int(match.group(1))
+    info["precision"] = "month"
+    return _parse_day(text, match.end(), info)
+
+def _parse_day(text, pos, info):
+    year, month = info["year"], info["month"]
+
+    match = XUN_RE.match(text, pos)
+    if match:
+        first = {"上": 1, "中": 11, "下": 21}[match.group(1)]
+        info["day"] = first
+        info["day_end"] = first + 9 if first < 21 else _last_day(year, month)
+        info["precision"] = "range"
+        return info, match.end()
+
+    match = DAY_RE.match(text, pos)
+    if match and 1 <= int(match.group(1)) <= _last_day(year, month):
+        info["day"] = info["day_end"] = int(match.group(1))
+        info["precision"] = "day"
+        pos = match.end()
+    return info, pos
+
+def _parse_partial(text, pos, previous):
+    """Range end without a year: a month in the year the start ends in, or a day in its month."""
+    info = _new_info(previous["era"], previous["year_end"])
+    info, end_pos = _parse_month_day(text, pos, info)
+    if end_pos != pos:
+        return info, end_pos
+    if previous["day_end"] is None:
+        return None, pos
+
+    info["month"] = info["month_end"] = previous["month_end"]
+    info, end_pos = _parse_day(text, pos, info)
+    if end_pos == pos:
+        return None, pos
+    return info, end_pos
+
+def _bounds(info):
+    start = _iso(info["year"], info["month"] or 1, info["day"] or 1)
+    year_end = info["year_end"]
+    month_end = info["month_end"] or 12
+    end = _iso(year_end, month_end, info["day_end"] or _last_day(year_end, month_end))
+    return start, end
+
+def parse_era_date(text):
+    """Finds the first era date in normalized text. Returns a normalize_date() dict without periodical fields."""
+    match = ERA_RE.search(text)
+    if not match:
+        return None
+
+    info, pos = _parse_point(text, match.start())
+    start, end = _bounds(info)
+    precision = info["precision"]
+
+    # Explicit range: "昭和23年10月～24年4月"
+    range_match = RANGE_RE.match(text, pos)
+    if range_match:
+        second, second_pos = _parse_point(text, range_match.end(), era=info["era"], previous=info)
+        if second:
+            end = _bounds(second)[1]
+            precision = "range"
+            pos = second_pos
+
+    if precision == "day":
+        iso = start
+    elif precision == "month":
+        iso = start[:7]
+    elif precision == "year":
+        iso = start[:4]
+    else:
+        iso = start
+
+    rest = text[pos:]
+    if "発行" in rest or rest.startswith("発"):
+        kind = "published"
+    elif "執筆" in rest:
+        kind = "written"
+    else:
+        kind = None
+
+    if "頃" in rest:
+        qualifier = "circa"
+    elif "以後" in rest or "以降" in rest:
+        qualifier = "after"
+    else:
+        qualifier = None
+
+    return {"iso": iso, "precision": precision, "start": start, "end": end,
+            "kind": kind, "qualifier": qualifier}
+
+def find_periodical(text):
+    match = PERIODICAL_RE.search(text)
+    if not match:
+        return None, None
+    return match.group(1), int(match.group(2))
+
+def normalize_date(raw, issue_dates=None):
+    """
+    Normalizes a raw date string. A bare periodical reference ("地上天国　1号") is resolved
+    through issue_dates, {(periodical, issue): normalized date} (see learn_issue_dates).
+    """
+    if not raw:
+        return None
+    text = normalize_text(raw)
+    periodical, issue = find_periodical(text)
+
+    result = parse_era_date(text)
+    if result is None:
+        if periodical is None or not issue_dates or (periodical, issue) not in issue_dates:
+            return None
+        result = dict(issue_dates[(periodical, issue)])
+
+    result["periodical"] = periodical
+    result["issue"] = issue
+    return result
+
+def iter_publications(data):
+    for v, volume in enumerate(data):
+        for t, theme in enumerate(volume["themes"]):
+            for ti, title in enumerate(theme["titles"]):
+                for p, pub in enumerate(title["publications"]):
+                    yield [v, t, ti, p], pub
+
+def learn_issue_dates(data):
+    """
+    {(periodical, issue): date} from publications that give both, e.g. the header
+    "巻頭言　地上天国２号　（昭和24年3月1日発行）".
+    """
+    issue_dates = {}
+    for _, pub in iter_publications(data):
+        text = normalize_text(pub["header"])
+        periodical, issue = find_periodical(text)
+        if periodical is None:
+            continue
+        date = parse_era_date(normalize_text(pub["date"])) or parse_era_date(text)
+        if date:
+            issue_dates.setdefault((periodical, issue), date)
+    return issue_dates
+
+def publication_date(pub, issue_dates=None):
+    """
+    Normalized date of a publication: its date field, else the last parenthesized part of its
+    header (parse_header misses unbalanced ones like "（昭和24年9・10月)").
+    """
+    result = normalize_date(pub["date"], issue_dates)
+    if result is None and pub["header"]:
+        header = normalize_text(pub["header"])
+        opening = header.rfind("(")
+        if opening >= 0:
+            result = normalize_date(header[opening + 1:], issue_dates)
+    return result
+
+def build_chronology(data):
+    issue_dates = learn_issue_dates(data)
+
+    dated = []
+    undated = []
+    for doc, pub in iter_publications(data):
+        date = publication_date(pub, issue_dates)
+        if date:
+            dated.append((date["start"], date["end"], date["precision"], doc))
+        else:
+            undated.append(doc)
+
+    # Python's sort is stable, so publications on the same date keep corpus order
+    dated.sort(key=lambda item: item[0])
+
+    max_end = []
+    running = ""
+    for _, end, _, _ in dated:
+        running = max(running, end)
+        max_end.append(running)
+
+    return {
+        "version": CHRONOLOGY_VERSION,
+        "docs": [item[3] for item in dated],
+        "start": [item[0] for item in dated],
+        "end": [item[1] for item in dated],
+        "max_end": max_end,
+        "precision": [item[2] for item in dated],
+        "undated": undated
+    }
+
+def write_chronology(data, data_dir):
+    chronology = build_chronology(data)
+    path = os.path.join(data_dir, CHRONOLOGY_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact(chronology))
+    os.replace(tmp_path, path)
+
+    print(f"Chronology generated at: {path} "
+          f"({len(chronology['docs'])} dated, {len(chronology['undated'])} undated publications)")
+    return chronology
+
+def publications_between(chronology, start, end):
+    """
+    Docs whose date range overlaps [start, end] (ISO strings, "1949" or "1949-06" allowed),
+    in chronological order.
+    """
+    if len(start) == 4:
+        start += "-01-01"
+    elif len(start) == 7:
+        start += "-01"
+    if len(end) == 4:
+        end += "-12-31"
+    elif len(end) == 7:
+        end = _iso(int(end[:4]), int(end[5:7]), _last_day(int(end[:4]), int(end[5:7])))
+
+    first = bisect.bisect_left(chronology["max_end"], start)
+    last = bisect.bisect_right(chronology["start"], end)
+    return [chronology["docs"][i] for i in range(first, last) if chronology["end"][i] >= start]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize header dates / query the chronological index")
+    parser.add_argument('dates', nargs='*', help="Raw dates to normalize (e.g. 昭和二十七年八月十三日)")
+    parser.add_argument('--chronology', help="chronology.json to query with --start/--end")
+    parser.add_argument('--start', default="0000")
+    parser.add_argument('--end', default="9999")
+    args = parser.parse_args()
+
+    for raw in args.dates:
+        print(raw, json.dumps(normalize_date(raw), ensure_ascii=False))
+
+    if args.chronology:
+        with open(args.chronology, 'r', encoding='utf-8') as f:
+            chronology = json.load(f)
+        docs = publications_between(chronology, args.start, args.end)
+        for doc in docs:
+            print(doc)
+        print(f"{len(docs)} publication(s)", file=sys.stderr)
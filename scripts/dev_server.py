@@ -0,0 +1,91 @@
+import os
+import threading
+import http.server
+
+# Local development server used by watch.py:
+#   /             the app (repository root), /data/... from the data directory
+#   /__events     Server-Sent Events stream: "reload" (data: the data version) after each rebuild
+# index.html is served with js/dev-reload.js inserted, which listens to /__events and reloads
+# the page. Responses are sent with "Cache-Control: no-store" so a reload always sees the new catalog.
+EVENTS_PATH = "/__events"
+DATA_PREFIX = "/data/"
+RELOAD_SCRIPT = '<script src="js/dev-reload.js"></script>'
+KEEPALIVE_SECONDS = 15
+
+# Last rebuild, shared with the handler threads waiting on /__events
+reload_state = {"generation": 0, "version": None}
+reload_condition = threading.Condition()
+
+def notify_reload(version):
+    with reload_condition:
+        reload_state["generation"] += 1
+        reload_state["version"] = version
+        reload_condition.notify_all()
+
+class DevRequestHandler(http.server.SimpleHTTPRequestHandler):
+    data_dir = None
+
+    def translate_path(self, path):
+        if path.split('?', 1)[0].startswith(DATA_PREFIX):
+            # Resolved against the data directory instead of the repository root
+            relative = super().translate_path('/' + path[len(DATA_PREFIX):])
+            return os.path.join(self.data_dir, os.path.relpath(relative, self.directory))
+        return super().translate_path(path)
+
+    def end_headers(self):
+        self.send_header("Cache-Control", "no-store")
+        super().end_headers()
+
+    def do_GET(self):
+        path = self.path.split('?', 1)[0]
+        if path == EVENTS_PATH:
+            self.send_events()
+        elif path in ("/", "/index.html"):
+            self.send_index()
+        else:
+            super().do_GET()
+
+    def send_index(self):
+        with open(os.path.join(self.directory, "index.html"), 'r', encoding='utf-8') as f:
+            page = f.read()
+        body = page.replace("</head>", f"    {RELOAD_SCRIPT}\n</head>", 1).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+        with reload_condition:
+            seen = reload_state["generation"]
+        try:
+            while True:
+                with reload_condition:
+                    reload_condition.wait_for(lambda: reload_state["generation"] != seen, KEEPALIVE_SECONDS)
+                    generation, version = reload_state["generation"], reload_state["version"]
+                if generation != seen:
+                    seen = generation
+                    self.wfile.write(f"event: reload\ndata: {version}\n\n".encode('utf-8'))
+                else:
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        # One line per request would drown the rebuild reports
+        pass
+
+def start_dev_server(root_dir, data_dir, host="127.0.0.1", port=8000):
+    """Serves root_dir (and data_dir under /data/) from a background thread. Returns the server."""
+    handler = type("Handler", (DevRequestHandler,), {"data_dir": os.path.abspath(data_dir)})
+    server = http.server.ThreadingHTTPServer(
+        (host, port), lambda *args: handler(*args, directory=os.path.abspath(root_dir)))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Dev server: http://{host}:{port}/ (reloads after each rebuild)")
+    return server
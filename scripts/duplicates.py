@@ -0,0 +1,130 @@
+import os
+import re
+import zlib
+import random
+import unicodedata
+
+from shards import dump_compact
+from date_normalizer import iter_publications
+
+# Duplicate publication detection, written by generate_json.py --duplicates (data/duplicates.json)
+#
+# Bodies are compared in normalized form: NFKC, all whitespace removed. Two passes:
+#   exact  identical normalized bodies (a dict lookup per body)
+#   near   MinHash signatures over sentence shingles, bucketed with LSH; only bodies that
+#          share a bucket are compared, so the cost grows with the corpus instead of its square.
+#          Candidates are kept when the Jaccard similarity of their shingle sets is >= NEAR_THRESHOLD.
+#
+# duplicates.json:
+#   {"version", "threshold", "groups": [{"kind": "exact|near", "members": [[v, t, ti, p], ...]}]}
+# Members are in corpus order, so members[0] is the canonical copy; [v, t, ti, p] are indices into
+# the generated data (titleIndex counts '---' separators, as in theme.titles).
+DUPLICATES_NAME = "duplicates.json"
+DUPLICATES_VERSION = 1
+
+# Bodies shorter than this (normalized) are headings or captions, not articles
+MIN_BODY_CHARS = 50
+NEAR_THRESHOLD = 0.8
+
+# 32 hash functions = 8 bands of 4 rows: pairs above ~0.6 similarity almost always share a band
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240611)
+PERMUTATIONS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+SENTENCE_SPLIT_RE = re.compile(r'[。！？!?\n]+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+def sentence_parts(body):
+    text = unicodedata.normalize('NFKC', body)
+    return [WHITESPACE_RE.sub('', part) for part in SENTENCE_SPLIT_RE.split(text)]
+
+def shingles(parts):
+    # Sentences are long enough in Japanese prose to be good shingles, and far fewer than n-grams
+    return {zlib.crc32(part.encode('utf-8')) for part in parts if part}
+
+def minhash_signature(shingle_set):
+    return [min((a * h + b) % MERSENNE_PRIME for h in shingle_set) for a, b in PERMUTATIONS]
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def lsh_candidates(signatures):
+    """Pairs (i, j), i < j, of signatures that agree on every row of at least one band."""
+    buckets = {}
+    for i, signature in enumerate(signatures):
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS:(band + 1) * ROWS]))
+            buckets.setdefault(key, []).append(i)
+
+    pairs = set()
+    for members in buckets.values():
+        for k, i in enumerate(members):
+            for j in members[k + 1:]:
+                pairs.add((i, j))
+    return pairs
+
+def find_duplicate_groups(data):
+    # Unique normalized bodies, each with the docs that use it
+    bodies = {}          # normalized body -> index into body_docs
+    body_docs = []
+    body_parts = []
+    for doc, pub in iter_publications(data):
+        parts = sentence_parts(pub["content"])
+        normalized = ''.join(parts)
+        if len(normalized) < MIN_BODY_CHARS:
+            continue
+        index = bodies.get(normalized)
+        if index is None:
+            index = bodies[normalized] = len(body_docs)
+            body_docs.append([])
+            body_parts.append(parts)
+        body_docs[index].append(doc)
+
+    # Union-find over unique bodies for the near-duplicate pairs
+    parent = list(range(len(body_docs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    shingle_sets = [shingles(parts) for parts in body_parts]
+    signatures = [minhash_signature(s) for s in shingle_sets]
+    near_pairs = 0
+    for i, j in lsh_candidates(signatures):
+        if jaccard(shingle_sets[i], shingle_sets[j]) >= NEAR_THRESHOLD:
+            near_pairs += 1
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    components = {}
+    for i in range(len(body_docs)):
+        components.setdefault(find(i), []).append(i)
+
+    groups = []
+    for members in components.values():
+        docs = sorted(doc for i in members for doc in body_docs[i])
+        if len(docs) < 2:
+            continue
+        groups.append({"kind": "exact" if len(members) == 1 else "near", "members": docs})
+
+    groups.sort(key=lambda group: group["members"][0])
+    return groups, near_pairs
+
+def write_duplicates(data, data_dir):
+    groups, near_pairs = find_duplicate_groups(data)
+    path = os.path.join(data_dir, DUPLICATES_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact({"version": DUPLICATES_VERSION, "threshold": NEAR_THRESHOLD, "groups": groups}))
+    os.replace(tmp_path, path)
+
+    copies = sum(len(group["members"]) - 1 for group in groups)
+    print(f"Duplicates generated at: {path} ({len(groups)} groups, {copies} extra copies, "
+          f"{near_pairs} near-duplicate pairs)")
+    return groups
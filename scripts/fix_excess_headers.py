@@ -1,136 +1,148 @@
 import os
-import json
-import re
-
-JSON_PATH = '/Users/michael/Documents/Ensinamentos/ShinCollege/data/shin_college_data.json'
-INDICES_DIR = '/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown/Indices'
-BASE_MARKDOWN_DIR = '/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown'
-
-def normalize_string(s):
-    # Same normalization as before
-    s = s.replace('について', '')
-    s = s.replace('「', '').replace('」', '')
-    s = s.replace('　', '').replace(' ', '')
-    return s
-
-def load_json_data(filepath):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def parse_index_file(filepath):
-    themes = {}
-    current_theme = None
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    for line in lines:
-        line = line.strip()
-        if not line: continue
-        if line.startswith('・'):
-            title = line[1:].strip()
-            if current_theme:
-                 norm = normalize_string(title)
-                 themes[current_theme][norm] = title
-        else:
-            current_theme = line
-            if current_theme not in themes:
-                themes[current_theme] = {}
-    return themes
-
-def fix_excess_headers():
-    json_data = load_json_data(JSON_PATH)
-    index_files = sorted(os.listdir(INDICES_DIR))
-    
-    modified_files = set()
-    edits_count = 0
+import time
+import argparse
+import tempfile
+
+import paths
+from compare_generated_vs_index import INDICES_DIR, JSON_PATH, normalize_string, load_index, load_data
+from markdown_tokenizer import header_level
+
+BASE_MARKDOWN_DIR = paths.MARKDOWN_DIR
+
+# Excess headers are H1 titles that the index does not list for their theme.
+# Fixing one means removing its '#' so the text stays but is no longer a title.
+#
+# The script works in two phases:
+#   plan   collect, per source file, every title to demote (one pass over the data)
+#   apply  read each file once, rewrite all its header lines, write it back atomically
+
+def plan_edits(json_data, index, markdown_dir=BASE_MARKDOWN_DIR):
+    """
+    Returns {file_path: set(json_titles)} for the titles missing from their theme's index.
+    """
+    plan = {}
 
     for vol_data in json_data:
         vol_name = vol_data['volume']
         vol_prefix = vol_name.split('.')[0]
-        
-        target_index_file = None
-        for f in index_files:
-             if f.startswith(f"{vol_prefix}-") or f.startswith(f"{vol_prefix} -"):
-                target_index_file = f
-                break
-        
-        if not target_index_file:
+
+        index_volume = index["volumes"].get(vol_prefix)
+        if not index_volume:
             continue
-            
-        index_content = parse_index_file(os.path.join(INDICES_DIR, target_index_file))
-        index_themes_norm = {normalize_string(k): k for k in index_content.keys()}
 
         for theme in vol_data['themes']:
-            json_theme_name = theme['theme']
-            norm_json_theme = normalize_string(json_theme_name)
-            
-            matched_index_theme_key = index_themes_norm.get(norm_json_theme)
-            if not matched_index_theme_key:
+            index_theme = index_volume["themes"].get(normalize_string(theme['theme']))
+            if not index_theme:
                 continue
-            
-            expected_titles_map = index_content[matched_index_theme_key]
-            
+
+            expected_titles_map = index_theme["titles"]
+
             for t_entry in theme['titles']:
                 if t_entry['title'] == '---': continue
-                
+
                 json_title = t_entry['title']
-                norm_json_title = normalize_string(json_title)
-                
-                # Check if it's a mismatch
-                if norm_json_title not in expected_titles_map:
-                    # FOUND A MISMATCH - EXCESS ITEM
-                    # We need to remove '#' from the file
-                    origin_filename = t_entry.get('origin_filename')
-                    if not origin_filename:
-                        print(f"Warning: No origin_filename for {json_title}")
-                        continue
-                        
-                    # Find full path
-                    # Volume is known from loop
-                    # But parse_json structure: volume is a dir in Markdown
-                    # vol_name is '1.経綸...'
-                    
-                    file_path = os.path.join(BASE_MARKDOWN_DIR, vol_name, origin_filename)
-                    if not os.path.exists(file_path):
-                        print(f"Warning: File not found {file_path}")
-                        continue
-                        
-                    # Read file and replace
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        lines = f.readlines()
-                    
-                    new_lines = []
-                    file_modified = False
-                    
-                    for line in lines:
-                        # Match the header line
-                        # The line in file starts with '# ' and may have 'について'
-                        if line.strip().startswith('# '):
-                            header_content = line.strip()[2:].strip()
-                            # Apply 'replace' logic that generate_json used
-                            cleaned_header_content = header_content.replace('について', '')
-                            
-                            # Compare with json_title (which also had つい stripped in generate_json)
-                            # But wait, json_title is exactly what generate_json produced
-                            # So if I apply the same transform to the line, they should match
-                            
-                            if cleaned_header_content == json_title:
-                                # MATCH! Remove '#'
-                                print(f"Removing '#' from: {header_content} in {origin_filename}")
-                                new_lines.append(header_content + '\n') # Keep text, remove '#'
-                                file_modified = True
-                                edits_count += 1
-                            else:
-                                new_lines.append(line)
-                        else:
-                            new_lines.append(line)
-                    
-                    if file_modified:
-                        with open(file_path, 'w', encoding='utf-8') as f:
-                            f.writelines(new_lines)
-                        modified_files.add(file_path)
-
-    print(f"Total edits: {edits_count}")
-    print(f"Modified files: {len(modified_files)}")
+                if normalize_string(json_title) in expected_titles_map:
+                    continue
+
+                # FOUND A MISMATCH - EXCESS ITEM
+                origin_filename = t_entry.get('origin_filename')
+                if not origin_filename:
+                    print(f"Warning: No origin_filename for {json_title}")
+                    continue
+
+                file_path = os.path.join(markdown_dir, vol_name, origin_filename)
+                plan.setdefault(file_path, set()).add(json_title)
+
+    return plan
+
+def compute_file_edits(lines, titles):
+    """
+    Returns [(line_index, new_line)] for the H1 lines whose title (with 'について'
+    removed, as generate_json does) is in titles.
+    """
+    edits = []
+    for i, line in enumerate(lines):
+        if header_level(line) != 1:
+            continue
+        header_content = line.strip()[2:].strip()
+        if header_content.replace('について', '') in titles:
+            # Keep text, remove '#'
+            edits.append((i, header_content + '\n'))
+    return edits
+
+def print_diff(file_path, lines, edits, markdown_dir=BASE_MARKDOWN_DIR):
+    rel_path = os.path.relpath(file_path, markdown_dir)
+    print(f"--- a/{rel_path}")
+    print(f"+++ b/{rel_path}")
+    for i, new_line in edits:
+        print(f"@@ -{i + 1} +{i + 1} @@")
+        print(f"-{lines[i].rstrip(chr(10))}")
+        print(f"+{new_line.rstrip(chr(10))}")
+
+def write_atomically(file_path, lines, prefix='.fix_headers_'):
+    # Temp file in the same directory, then rename: an interrupted run never leaves a half-written source
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=prefix, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+        # mkstemp creates 0600 files: keep the original permissions
+        os.chmod(tmp_path, os.stat(file_path).st_mode & 0o7777)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def fix_excess_headers(json_input=None, dry_run=False, json_data=None, index=None, markdown_dir=BASE_MARKDOWN_DIR):
+    """
+    json_data and index, when given, are an already loaded corpus and index (see pipeline.py).
+    Returns the number of edits (planned, with dry_run).
+    """
+    if json_data is None:
+        json_data = load_data(json_input)
+    if index is None:
+        index = load_index(INDICES_DIR)
+    plan = plan_edits(json_data, index, markdown_dir)
+
+    modified_files = 0
+    edits_count = 0
+
+    for file_path in sorted(plan):
+        if not os.path.exists(file_path):
+            print(f"Warning: File not found {file_path}")
+            continue
+
+        start = time.perf_counter()
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        edits = compute_file_edits(lines, plan[file_path])
+        if not edits:
+            continue
+
+        print_diff(file_path, lines, edits, markdown_dir)
+
+        if not dry_run:
+            for i, new_line in edits:
+                lines[i] = new_line
+            write_atomically(file_path, lines)
+
+        elapsed = time.perf_counter() - start
+        print(f"# {len(edits)} edit(s) in {os.path.basename(file_path)} ({elapsed * 1000:.1f} ms)")
+        modified_files += 1
+        edits_count += len(edits)
+
+    if dry_run:
+        print(f"Dry run: {edits_count} edits planned in {modified_files} files (nothing written)")
+    else:
+        print(f"Total edits: {edits_count}")
+        print(f"Modified files: {modified_files}")
+    return edits_count
 
 if __name__ == "__main__":
-    fix_excess_headers()
+    parser = argparse.ArgumentParser(description="Remove '#' from H1 titles that are not listed in the index")
+    parser.add_argument('--dry-run', action='store_true', help="Only show the planned edits as a diff")
+    parser.add_argument('--json-input', nargs='?', const=JSON_PATH, default=None,
+                        help="Read a generated JSON file (default path if no value) instead of parsing the Markdown")
+    args = parser.parse_args()
+
+    fix_excess_headers(args.json_input, args.dry_run)
@@ -1,67 +1,409 @@
 import os
 import json
 import re
+import argparse
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
-# Base directory
-BASE_DIR = "/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown"
-OUTPUT_FILE = "/Users/michael/Documents/Ensinamentos/ShinCollege/data/shin_college_data.json"
-
-def parse_header(header_line):
-    """
-    Parses the H2 header line to extract Source, Title, and Date.
-    Example: 明主様御教え　「救世主の出現」　（昭和10年8月5日発行）
-    """
-    # Clean markdown formatting (bold)
-    header_line = re.sub(r'^(\*\*|＊＊)|(\*\*|＊＊)$', '', header_line.strip()).strip()
-
-    # Initialize defaults
-    source = ""
-    title = ""
-    date = ""
-
-    # Try to find content inside 「」 for title
-    title_match = re.search(r'「(.*?)」', header_line)
-    if title_match:
-        title = title_match.group(1)
-    
-    # Try to find content inside （） for date (looking for date-like chars or ends with 发行/published)
-    # Using a broad catch for parentheses at the end of the string usually containing date info
-    date_match = re.search(r'（(.*?)）', header_line)
-    if date_match:
-        date = date_match.group(1)
-
-    # Source is usually the part before the title
-    # We remove the title and date parts to get the source
-    clean_line = header_line
-    if title_match:
-        clean_line = clean_line.replace(title_match.group(0), '')
-    if date_match:
-        clean_line = clean_line.replace(date_match.group(0), '')
-    
-    # Strip whitespace to get the source
-    source = clean_line.strip()
-
-    return {
-        "full_header": header_line.strip(),
-        "source": source,
-        "publication_title": title,
-        "date": date
+import paths
+from markdown_tokenizer import iter_file_records
+from columnar import write_columnar
+from compress_artifacts import compress_artifacts, remove_compressed
+from data_manifest import served_outputs, write_data_manifest
+from date_normalizer import write_chronology
+from duplicates import write_duplicates
+from html_renderer import write_html_fragments
+from shards import write_sharded_output
+from title_groups import build_title_groups
+from sqlite_export import export_sqlite
+from stable_ids import write_id_index
+from search_index import write_search_index
+
+# Base directory (see paths.py; configure() points them elsewhere)
+BASE_DIR = paths.MARKDOWN_DIR
+OUTPUT_FILE = os.path.join(paths.DATA_DIR, paths.JSON_NAME)
+# Per-file size/mtime/hash, used by --incremental; the parsed titles of each file are cached
+# separately in CACHE_DIR/<sha256[:16]>.json, keyed by the file's content hash
+MANIFEST_FILE = os.path.join(paths.DATA_DIR, paths.BUILD_MANIFEST_NAME)
+CACHE_DIR = os.path.join(paths.DATA_DIR, paths.BUILD_CACHE_DIRNAME)
+MANIFEST_VERSION = 2
+
+def configure(markdown_dir=None, data_dir=None):
+    """Points the build at another corpus and/or output directory."""
+    global BASE_DIR, OUTPUT_FILE, MANIFEST_FILE, CACHE_DIR
+    if markdown_dir:
+        BASE_DIR = markdown_dir
+    if data_dir:
+        OUTPUT_FILE = os.path.join(data_dir, paths.JSON_NAME)
+        MANIFEST_FILE = os.path.join(data_dir, paths.BUILD_MANIFEST_NAME)
+        CACHE_DIR = os.path.join(data_dir, paths.BUILD_CACHE_DIRNAME)
+
+def collect_theme_files(volume_path):
+    """
+    Lists the theme files of a volume in processing order.
+    Returns a list of (theme_order, theme_name, filename) tuples.
+    """
+    theme_files = []
+
+    # We process all files, sorting ensures _01, _02, etc are processed in order
+    all_files = sorted(os.listdir(volume_path))
+    all_files_set = set(all_files)
+
+    for filename in all_files:
+        if filename.startswith('.'):
+            continue
+
+        # Allow .md or no extension provided it matches pattern
+        # Regex to parse: [Order] - [Name]_[Group]...
+        match = re.match(r'^(\d+)\s*-\s*(.+?)(?:_(\d+))?(?:_edited)?\.md$', filename)
+
+        if not match:
+            continue
+
+        # Skip unedited file if edited version exists
+        if not filename.endswith('_edited.md'):
+            potential_edited = filename[:-3] + "_edited.md"
+            if potential_edited in all_files_set:
+                print(f"DEBUG: Skipping {filename} in favor of {potential_edited}")
+                continue
+
+        theme_order = int(match.group(1))
+        theme_name = match.group(2).strip()
+        # group_order is ignored now - we merge all files for the same theme
+        theme_files.append((theme_order, theme_name, filename))
+
+    return theme_files
+
+def parse_file(file_path, filename):
+    """
+    Parses one theme file into its list of title entries.
+    Each entry keeps "origin_filename" so separators can be computed later.
+    """
+    titles = []
+    current_title_entry = None
+    pending_source = None
+
+    for record in iter_file_records(file_path):
+        if record["kind"] == "title":
+            # H1 - New Title
+            # Normalize title: Remove 'について' (About) to match Index format
+            title_text = record["text"].replace('について', '')
+
+            current_title_entry = {
+                "title": title_text,
+                "publications": []
+            }
+
+            # Add pending source if any (H2 appeared before H1)
+            if pending_source:
+                pub_entry = {
+                    "header": pending_source["header"],
+                    "source": pending_source["source"],
+                    "publication_title": pending_source["publication_title"],
+                    "date": pending_source["date"],
+                    "content": "", # Intro content attached to H2 usually? Or empty.
+                    "type": "intro"
+                }
+
+                current_title_entry["publications"].append(pub_entry)
+                pending_source = None
+
+            # Store origin filename to handle separators later
+            current_title_entry["origin_filename"] = filename
+            titles.append(current_title_entry)
+
+        elif current_title_entry:
+            # H2 - Publication Source
+            pub_entry = {
+                "header": record["header"],
+                "source": record["source"],
+                "publication_title": record["publication_title"],
+                "date": record["date"],
+                "content": record["content"],
+                "type": "publication"
+            }
+            current_title_entry["publications"].append(pub_entry)
+
+        else:
+            # Treat as pending source for next H1
+            pending_source = record
+
+    return titles
+
+def build_theme_entries(themes_map):
+    """
+    Flattens themes_map ({theme_order: {"name", "titles"}}) into the list of
+    theme entries of a volume, inserting '---' separators between files.
+    """
+    theme_entries = []
+    sorted_theme_keys = sorted(themes_map.keys())
+
+    for t_key in sorted_theme_keys:
+        theme_obj = themes_map[t_key]
+
+        # Filter out empty titles
+        filtered_titles = [
+            title for title in theme_obj["titles"]
+            if title.get("publications") and len(title["publications"]) > 0
+        ]
+
+        if not filtered_titles:
+            continue
+
+        final_titles_list = []
+        last_filename = None
+
+        for title in filtered_titles:
+            current_filename = title.get("origin_filename")
+
+            # If filename changed and it's not the first item, add separator
+            if last_filename and current_filename and current_filename != last_filename:
+                 final_titles_list.append({
+                    "title": "---",
+                    "publications": []
+                })
+
+            # origin_filename is kept: fix_excess_headers uses it to locate the source file,
+            # extra keys are ignored by the frontend
+            final_titles_list.append(title)
+            last_filename = current_filename
+
+        theme_entries.append({
+            "theme": theme_obj["name"],
+            "titles": final_titles_list,
+            "groups": build_title_groups(final_titles_list)
+        })
+
+    return theme_entries
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        print(f"DEBUG: Ignoring unreadable manifest {MANIFEST_FILE}")
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+def save_manifest(files):
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+    # Write to a temp file first so an interrupted build never leaves a truncated manifest
+    tmp_path = MANIFEST_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "files": files}, f, ensure_ascii=False)
+    os.replace(tmp_path, MANIFEST_FILE)
+
+def cache_path(digest):
+    return os.path.join(CACHE_DIR, digest[:16] + ".json")
+
+def load_cached_titles(digest):
+    """The titles cached for a file content hash, or None if the cache entry is missing or unreadable."""
+    try:
+        with open(cache_path(digest), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_cached_titles(digest, titles):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cache_path(digest)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(titles, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+def prune_cache(files):
+    """Removes the cache entries no manifest record refers to any more."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    current = {os.path.basename(cache_path(record["sha256"])) for record in files.values()}
+    for filename in os.listdir(CACHE_DIR):
+        if filename not in current:
+            os.remove(os.path.join(CACHE_DIR, filename))
+
+def file_sha256(file_path):
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def cached_titles(file_path, manifest_key, old_manifest, new_manifest):
+    """
+    Returns the cached title entries of a file if it is unchanged since the last build, else None.
+    A size/mtime match is trusted as is; otherwise the content hash decides.
+    Records the file's new manifest entry (its cache entry is written when it is re-parsed).
+    """
+    stat = os.stat(file_path)
+    record = old_manifest.get(manifest_key)
+
+    if record and record["size"] == stat.st_size and record["mtime"] == stat.st_mtime_ns:
+        digest = record["sha256"]
+    else:
+        digest = file_sha256(file_path)
+
+    new_manifest[manifest_key] = {
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "sha256": digest
     }
+    # Also covers a file that was touched but not modified: same hash, same cache entry
+    return load_cached_titles(digest)
 
-def convert_to_json():
-    data = []
+def parse_files(jobs_to_parse, jobs=1):
+    """
+    Parses [(file_path, filename), ...] and returns the title lists in the same order.
+    With jobs > 1 the files are parsed in a process pool; results are collected in
+    submission order so the merge is identical to the serial build.
+    """
+    if jobs <= 1 or len(jobs_to_parse) <= 1:
+        return [parse_file(file_path, filename) for file_path, filename in jobs_to_parse]
+
+    # Largest files first so one big file does not end up alone at the tail of the schedule
+    order = sorted(range(len(jobs_to_parse)), key=lambda i: -os.path.getsize(jobs_to_parse[i][0]))
+    results = [None] * len(jobs_to_parse)
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {
+            executor.submit(parse_file, *jobs_to_parse[i]): i
+            for i in order
+        }
+        for future, i in futures.items():
+            results[i] = future.result()
+
+    return results
+
+def list_volumes(base_dir=None):
+    """Returns [(volume_name, volume_path), ...] for the volume directories under base_dir (default BASE_DIR)."""
+    base_dir = base_dir or BASE_DIR
+    volumes = []
 
-    # Iterate over volumes (directories)
     # Sorting to ensure "1.xxx", "2.xxx" order
-    for volume_name in sorted(os.listdir(BASE_DIR)):
-        volume_path = os.path.join(BASE_DIR, volume_name)
-        
+    for volume_name in sorted(os.listdir(base_dir)):
+        volume_path = os.path.join(base_dir, volume_name)
+
         if not os.path.isdir(volume_path) or volume_name.startswith('.'):
             continue
 
         if volume_name == 'Indices':
             continue
 
+        volumes.append((volume_name, volume_path))
+
+    return volumes
+
+def write_indented(f, obj, level):
+    """
+    Writes obj as json.dump(..., indent=2) would render it nested `level` levels deep.
+    JSON strings never contain raw newlines, so re-indenting line starts is safe.
+    """
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    f.write(text.replace('\n', '\n' + '  ' * level))
+
+def stream_to_json():
+    """
+    Writes OUTPUT_FILE theme by theme instead of building the whole tree first.
+    Only the files of the theme being written are parsed and held in memory, so peak
+    memory follows the largest theme rather than the corpus. Output is byte-identical
+    to convert_to_json().
+    """
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        volumes = list_volumes()
+        if not volumes:
+            f.write('[]')
+
+        for v_idx, (volume_name, volume_path) in enumerate(volumes):
+            f.write('[\n  ' if v_idx == 0 else ',\n  ')
+            f.write('{\n    "volume": ' + json.dumps(volume_name, ensure_ascii=False) + ',\n    "themes": ')
+
+            # Group the file list by theme first (cheap), then parse one theme at a time
+            theme_files = {}
+            for theme_order, theme_name, filename in collect_theme_files(volume_path):
+                theme_files.setdefault(theme_order, (theme_name, []))[1].append(filename)
+
+            written_themes = 0
+            for theme_order in sorted(theme_files):
+                theme_name, filenames = theme_files[theme_order]
+
+                titles = []
+                for filename in filenames:
+                    print(f"DEBUG: Processing file: {filename}")
+                    titles.extend(parse_file(os.path.join(volume_path, filename), filename))
+
+                theme_entries = build_theme_entries({theme_order: {"name": theme_name, "titles": titles}})
+                for theme_entry in theme_entries:
+                    f.write('[\n      ' if written_themes == 0 else ',\n      ')
+                    write_indented(f, theme_entry, 3)
+                    written_themes += 1
+
+                # Drop the parsed theme before the next one is read
+                del titles, theme_entries
+
+            f.write('\n    ]' if written_themes else '[]')
+            f.write('\n  }')
+
+        if volumes:
+            f.write('\n]')
+
+    print(f"JSON generated at: {OUTPUT_FILE}")
+    outputs = served_outputs(os.path.basename(OUTPUT_FILE))
+    write_data_manifest(os.path.dirname(OUTPUT_FILE), outputs)
+    remove_compressed(os.path.dirname(OUTPUT_FILE), os.path.basename(OUTPUT_FILE), outputs)
+
+def build_data(incremental=False, jobs=1):
+    """
+    Parses the corpus under BASE_DIR and returns the volume list written to OUTPUT_FILE.
+    Validation tools call this directly to work on the in-memory tree.
+    """
+    data = []
+
+    old_manifest = load_manifest() if incremental else {}
+    new_manifest = {}
+
+    # First pass: walk the tree and decide which files need parsing
+    # volume_plans: [(volume_name, [(theme_order, theme_name, slot), ...])]
+    # Each slot indexes file_titles, which is filled from the manifest or by the parser
+    volume_plans = []
+    file_titles = []
+    to_parse = []  # (slot, file_path, filename, manifest_key)
+
+    # Iterate over volumes (directories)
+    for volume_name, volume_path in list_volumes():
+        theme_slots = []
+
+        # Iterate over themes (files)
+        for theme_order, theme_name, filename in collect_theme_files(volume_path):
+            file_path = os.path.join(volume_path, filename)
+            manifest_key = f"{volume_name}/{filename}"
+            slot = len(file_titles)
+
+            titles = None
+            if incremental:
+                titles = cached_titles(file_path, manifest_key, old_manifest, new_manifest)
+
+            if titles is None:
+                print(f"DEBUG: Processing file: {filename}")
+                to_parse.append((slot, file_path, filename, manifest_key))
+
+            file_titles.append(titles)
+            theme_slots.append((theme_order, theme_name, slot))
+
+        volume_plans.append((volume_name, theme_slots))
+
+    # Second pass: parse what is missing (serially or in a process pool)
+    parsed = parse_files([(file_path, filename) for _, file_path, filename, _ in to_parse], jobs)
+    for (slot, _, _, manifest_key), titles in zip(to_parse, parsed):
+        file_titles[slot] = titles
+        if incremental:
+            save_cached_titles(new_manifest[manifest_key]["sha256"], titles)
+
+    # Third pass: merge files into themes in sorted filename order
+    for volume_name, theme_slots in volume_plans:
         volume_data = {
             "volume": volume_name,
             "themes": []
@@ -70,172 +412,128 @@ def convert_to_json():
         # Structure:
         # themes_map[theme_order] = {
         #   "name": theme_name,
-        #   "groups": {
         #   "titles": [list of titles]
         # }
         themes_map = {}
 
-        # Iterate over themes (files)
-        # We process all files, sorting ensures _01, _02, etc are processed in order
-        all_files = sorted(os.listdir(volume_path))
-        all_files_set = set(all_files)
-
-        for filename in all_files:
-            if filename.startswith('.'):
-                continue
-            
-            # Allow .md or no extension provided it matches pattern
-            # Regex to parse: [Order] - [Name]_[Group]...
-            match = re.match(r'^(\d+)\s*-\s*(.+?)(?:_(\d+))?(?:_edited)?\.md$', filename)
-            
-            if not match:
-                continue
-
-            # Skip unedited file if edited version exists
-            if not filename.endswith('_edited.md'):
-                potential_edited = filename[:-3] + "_edited.md"
-                if potential_edited in all_files_set:
-                    print(f"DEBUG: Skipping {filename} in favor of {potential_edited}")
-                    continue
-
-            print(f"DEBUG: Processing file: {filename}")
-
-            theme_order = int(match.group(1))
-            theme_name = match.group(2).strip()
-            # group_order is ignored now - we merge all files for the same theme
-
+        for theme_order, theme_name, slot in theme_slots:
             # Initialize theme entry if not exists
             if theme_order not in themes_map:
                 themes_map[theme_order] = {
                     "name": theme_name,
                     "titles": []
                 }
-            
-            file_path = os.path.join(volume_path, filename)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Split by H1 (# ) or H2 (## )
-            # We want to capture the header itself to identify type
-            tokens = re.split(r'^((?:#|##)\s+.+)$', content, flags=re.MULTILINE)
-            
-            current_title_entry = None
-            pending_source = None
-            
-            # Token 0 is text before first header (usually empty or intro)
-            # Token 1 is Header
-            # Token 2 is Content following Header
-            # ...
-            
-            for i in range(1, len(tokens), 2):
-                header_line = tokens[i].strip()
-                section_content = tokens[i+1].strip() if i+1 < len(tokens) else ""
-                
-                if header_line.startswith('# '):
-                    # H1 - New Title
-                    title_text = header_line[1:].strip() # remove '# '
-                    
-                    # Normalize title: Remove 'について' (About) to match Index format
-                    title_text = title_text.replace('について', '')
-                    
-                    current_title_entry = {
-                        "title": title_text,
-                        "publications": []
-                    }
-                    
-                    # Add pending source if any (H2 appeared before H1)
-                    if pending_source:
-                        parsed = parse_header(pending_source)
-                        pub_entry = {
-                            "header": parsed["full_header"],
-                            "source": parsed["source"],
-                            "publication_title": parsed["publication_title"],
-                            "date": parsed["date"],
-                            "content": "", # Intro content attached to H2 usually? Or empty.
-                            "type": "intro"
-                        }
-                        
-                        current_title_entry["publications"].append(pub_entry)
-                        pending_source = None
-
-                    # Store origin filename to handle separators later
-                    current_title_entry["origin_filename"] = filename
-                    themes_map[theme_order]["titles"].append(current_title_entry)
-                    
-                    pass
-
-                elif header_line.startswith('## '):
-                    # H2 - Publication Source
-                    if current_title_entry:
-                        # Parse header
-                        parsed = parse_header(header_line[3:]) # remove '## '
-                        
-                        pub_entry = {
-                            "header": parsed["full_header"],
-                            "source": parsed["source"],
-                            "publication_title": parsed["publication_title"],
-                            "date": parsed["date"],
-                            "content": section_content,
-                            "type": "publication"
-                        }
-                        current_title_entry["publications"].append(pub_entry)
-                    else:
-                        # Treat as pending source for next H1
-                        pending_source = header_line[3:]
-        
-        # After processing all files in volume, flatten into volume_data
-        sorted_theme_keys = sorted(themes_map.keys())
-        
-        for t_key in sorted_theme_keys:
-            theme_obj = themes_map[t_key]
-            
-            # Filter out empty titles
-            filtered_titles = [
-                title for title in theme_obj["titles"]
-                if title.get("publications") and len(title["publications"]) > 0
-            ]
-            
-            if not filtered_titles:
-                continue
+            themes_map[theme_order]["titles"].extend(file_titles[slot])
 
-            final_titles_list = []
-            last_filename = None
-
-            for title in filtered_titles:
-                current_filename = title.get("origin_filename")
-                
-                # If filename changed and it's not the first item, add separator
-                if last_filename and current_filename and current_filename != last_filename:
-                     final_titles_list.append({
-                        "title": "---",
-                        "publications": []
-                    })
-                
-                # Remove origin_filename before adding to final list to keep JSON clean (optional, but good practice)
-                # title_copy = title.copy()
-                # if "origin_filename" in title_copy:
-                #    del title_copy["origin_filename"]
-                # final_titles_list.append(title_copy)
-                # Actually, keeping it might be useful for debugging, but let's keep it clean
-                
-                # For now just append the object, extra keys are ignored by frontend usually
-                final_titles_list.append(title)
-                last_filename = current_filename
-
-            theme_entry = {
-                "theme": theme_obj["name"],
-                "titles": final_titles_list
-            }
-            
-            volume_data["themes"].append(theme_entry)
-        
+        # After processing all files in volume, flatten into volume_data
+        volume_data["themes"] = build_theme_entries(themes_map)
         data.append(volume_data)
 
-    # Write JSON output
+    if incremental:
+        print(f"DEBUG: Incremental build: {len(to_parse)} of {len(file_titles)} files re-parsed")
+        # A no-change run leaves the manifest and the cache as they are
+        if new_manifest != old_manifest:
+            save_manifest(new_manifest)
+            prune_cache(new_manifest)
+
+    return data
+
+def convert_to_json(incremental=False, jobs=1, sharded=False, search_index=False, columnar=False,
+                    sqlite=False, chronology=False, duplicates=False, ids=False, html=False, compress=False,
+                    data=None):
+    """Writes OUTPUT_FILE and the requested outputs; data, when given, is an already parsed corpus."""
+    os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
+    if data is None:
+        data = build_data(incremental=incremental, jobs=jobs)
+
+    if html:
+        # Before any output, so the themes of the JSON and the catalog point to their fragment file
+        write_html_fragments(data, os.path.dirname(OUTPUT_FILE))
+
+    # Write JSON output (minified when it is served precompressed)
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        if compress:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
 
     print(f"JSON generated at: {OUTPUT_FILE}")
 
+    if sharded:
+        # Catalog + per-theme shards next to the monolithic file, loaded lazily by the app
+        write_sharded_output(data, os.path.dirname(OUTPUT_FILE))
+
+    if search_index:
+        write_search_index(data, os.path.dirname(OUTPUT_FILE))
+
+    if columnar:
+        write_columnar(data, os.path.splitext(OUTPUT_FILE)[0] + '.shcc')
+
+    if sqlite:
+        export_sqlite(data, os.path.splitext(OUTPUT_FILE)[0] + '.sqlite')
+
+    if chronology:
+        write_chronology(data, os.path.dirname(OUTPUT_FILE))
+
+    if duplicates:
+        write_duplicates(data, os.path.dirname(OUTPUT_FILE))
+
+    if ids:
+        write_id_index(data, os.path.dirname(OUTPUT_FILE))
+
+    # Last, so the service worker manifest covers every output of this build (and only those)
+    outputs = served_outputs(os.path.basename(OUTPUT_FILE), sharded=sharded, search_index=search_index,
+                             html=html, duplicates=duplicates, chronology=chronology, ids=ids)
+    write_data_manifest(os.path.dirname(OUTPUT_FILE), outputs)
+
+    if compress:
+        compress_artifacts(os.path.dirname(OUTPUT_FILE), os.path.basename(OUTPUT_FILE), outputs)
+    else:
+        # Siblings left by an earlier --compress build would be served instead of the new files
+        remove_compressed(os.path.dirname(OUTPUT_FILE), os.path.basename(OUTPUT_FILE), outputs)
+
+# Output options, shared with pipeline.py build
+OUTPUT_OPTIONS = ["sharded", "search_index", "columnar", "sqlite", "chronology", "duplicates", "ids", "html", "compress"]
+
+def add_build_arguments(parser):
+    parser.add_argument('--incremental', action='store_true',
+                        help="Re-parse only files changed since the last build (uses the build manifest)")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Number of worker processes used to parse files (default: 1, serial)")
+    parser.add_argument('--sharded', action='store_true',
+                        help="Also write catalog.json and per-theme content shards for lazy loading")
+    parser.add_argument('--search-index', action='store_true',
+                        help="Also write the sharded bigram full-text search index under data/search")
+    parser.add_argument('--columnar', action='store_true',
+                        help="Also write the mmap-able columnar corpus (shin_college_data.shcc)")
+    parser.add_argument('--sqlite', action='store_true',
+                        help="Also write/update the SQLite database with an FTS5 trigram index (shin_college_data.sqlite)")
+    parser.add_argument('--chronology', action='store_true',
+                        help="Also write chronology.json, the date-sorted index of publications")
+    parser.add_argument('--duplicates', action='store_true',
+                        help="Also write duplicates.json, the exact and near-duplicate publication groups")
+    parser.add_argument('--ids', action='store_true',
+                        help="Also write ids.json, the stable id -> location index used by deep links and history")
+    parser.add_argument('--html', action='store_true',
+                        help="Also render the publication bodies to sanitized HTML fragments, "
+                             "one file per theme under data/html")
+    parser.add_argument('--compress', action='store_true',
+                        help="Write the JSON minified, plus precompressed .gz (and .br, with the brotli module) "
+                             "siblings of every data file and a size report")
+
+def output_kwargs(args):
+    return {name: getattr(args, name) for name in OUTPUT_OPTIONS}
+
 if __name__ == "__main__":
-    convert_to_json()
+    parser = argparse.ArgumentParser(description="Convert the Markdown corpus into shin_college_data.json")
+    add_build_arguments(parser)
+    parser.add_argument('--stream', action='store_true',
+                        help="Write the JSON theme by theme to bound memory (serial, JSON output only)")
+    args = parser.parse_args()
+
+    if args.stream:
+        if args.incremental or any(output_kwargs(args).values()) or args.jobs > 1:
+            parser.error("--stream only writes the JSON file and runs serially")
+        stream_to_json()
+    else:
+        convert_to_json(incremental=args.incremental, jobs=args.jobs, **output_kwargs(args))
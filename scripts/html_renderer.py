@@ -0,0 +1,176 @@
+import os
+import re
+import html
+import hashlib
+
+from shards import dump_compact
+
+# Build-time rendering of publication bodies, used by generate_json.py --html. The fragments are
+# written apart from the bodies, one file per theme, so the JSON and the shards keep a single
+# representation and a reader only downloads the HTML of the themes it opens:
+#   html/<sha256[:16]>.json  [[fragment per publication, ...] per title, ...], aligned with theme.titles
+# Each theme gets "html": <that path> in the JSON and the catalog; the app fetches the file when a
+# title of the theme is opened and inserts the fragments as is (parseMarkdown stays as the fallback
+# for data built without them).
+#
+# The fragment is sanitized by construction: all text is escaped, and the only tags are the ones
+# produced here:
+#   <p>            paragraphs (blank-line separated); line breaks inside a paragraph become <br>
+#   <section class="qa qa-master|qa-visitor"><p class="qa-speaker">…</p>…</section>
+#                  Q&A turns, opened by a bold speaker line such as **信者の質問** or
+#                  **明主様御垂示　「水供養」** and running until the next speaker, rule or heading
+#   <strong>, <em> **text** and *text* on one line (a single "*" or "＊" is left as text)
+#   <hr>, <h3>     "---" rules and "## " headings
+#   <img>          Markdown image references to embedded data:image URIs (png/jpeg/gif/webp)
+RULE_RE = re.compile(r'^-{3,}$')
+HEADING_RE = re.compile(r'^#{1,6}\s+(.*)$')
+SPEAKER_LINE_RE = re.compile(r'^\*\*\s*(?P<label>[^*]+?)\s*\*\*$')
+SPEAKER_RE = re.compile(
+    r'^(?P<speaker>明主様|[^「」\s]{1,12}?(?:質問|発言|御垂示|御発言|御講話|御言葉|御教え|御解説))'
+    r'(?:\s*(?P<topic>「[^」]*」))?$')
+IMAGE_DEF_RE = re.compile(r'^\[(?P<ref>[^\]]+)\]:\s*<?(?P<uri>data:image/(?:png|jpeg|gif|webp);base64,[A-Za-z0-9+/=]+)>?$')
+IMAGE_RE = re.compile(r'!\[(?P<alt>[^\]]*)\]\[(?P<ref>[^\]]+)\]')
+MARKDOWN_ESCAPE_RE = re.compile(r'\\([\\`*_{}\[\]()#+\-.!])')
+STRONG_RE = re.compile(r'\*\*(?=\S)(.+?)\*\*')
+EM_RE = re.compile(r'(?<!\*)\*(?=[^\s*])([^*]+?)(?<=[^\s*])\*(?!\*)')
+
+def render_inline(text, images):
+    # Backslash escapes become character references, so they can no longer open emphasis
+    text = html.escape(text, quote=True)
+    text = MARKDOWN_ESCAPE_RE.sub(lambda m: f"&#{ord(m.group(1))};", text)
+    text = STRONG_RE.sub(r'<strong>\1</strong>', text)
+    text = EM_RE.sub(r'<em>\1</em>', text)
+
+    def image(match):
+        uri = images.get(html.unescape(match.group('ref')))
+        if uri is None:
+            return ''
+        return f'<img src="{uri}" alt="{match.group("alt")}">'
+    return IMAGE_RE.sub(image, text)
+
+def speaker_of(line):
+    label = SPEAKER_LINE_RE.match(line.strip())
+    return SPEAKER_RE.match(label.group('label').strip()) if label else None
+
+def split_blocks(lines):
+    """
+    Groups lines into paragraphs; rules and headings are blocks of their own, and a speaker
+    line always starts a block (it often follows the previous answer without a blank line).
+    """
+    block = []
+    for line in lines:
+        if not line.strip():
+            if block:
+                yield block
+                block = []
+        elif RULE_RE.match(line.strip()) or HEADING_RE.match(line.strip()):
+            if block:
+                yield block
+                block = []
+            yield [line]
+        elif speaker_of(line):
+            if block:
+                yield block
+            block = [line]
+        else:
+            block.append(line)
+    if block:
+        yield block
+
+def render_html(body):
+    if not body or not body.strip():
+        return ''
+
+    images = {}
+    lines = []
+    for line in body.split('\n'):
+        definition = IMAGE_DEF_RE.match(line.strip())
+        if definition:
+            images[definition.group('ref')] = definition.group('uri')
+        else:
+            lines.append(line.rstrip())
+
+    parts = []
+    in_turn = False
+    for block in split_blocks(lines):
+        first = block[0].strip()
+
+        heading = HEADING_RE.match(first)
+        if RULE_RE.match(first) or heading:
+            if in_turn:
+                parts.append('</section>')
+                in_turn = False
+            parts.append('<hr>' if not heading else f'<h3>{render_inline(heading.group(1), images)}</h3>')
+            continue
+
+        speaker = speaker_of(first)
+        if speaker:
+            if in_turn:
+                parts.append('</section>')
+            role = 'qa-master' if speaker.group('speaker').startswith('明主様') else 'qa-visitor'
+            topic = speaker.group('topic')
+            topic_html = f' <span class="qa-topic">{html.escape(topic)}</span>' if topic else ''
+            parts.append(f'<section class="qa {role}"><p class="qa-speaker">'
+                         f'{html.escape(speaker.group("speaker"))}{topic_html}</p>')
+            in_turn = True
+            block = block[1:]
+            if not block:
+                continue
+
+        # Ideographic spaces (indentation) are kept: HTML does not collapse them
+        rendered = '<br>'.join(render_inline(line.strip(' \t'), images) for line in block)
+        if rendered:
+            parts.append(f'<p>{rendered}</p>')
+
+    if in_turn:
+        parts.append('</section>')
+    return ''.join(parts)
+
+HTML_DIRNAME = "html"
+
+def render_theme(theme, cache):
+    """The fragments of a theme, one list per title; cache maps bodies to their fragment."""
+    fragments = []
+    for title in theme["titles"]:
+        title_fragments = []
+        for pub in title["publications"]:
+            content = pub["content"]
+            if content not in cache:
+                cache[content] = render_html(content)
+            title_fragments.append(cache[content])
+        fragments.append(title_fragments)
+    return fragments
+
+def write_html_fragments(data, data_dir):
+    """
+    Writes the fragment file of every theme under data_dir/html and sets theme["html"] in place.
+    Files are content-addressed: a theme that still has its "html" file (watch.py keeps unchanged
+    theme objects between rebuilds) is not rendered again, and unreferenced files are removed.
+    """
+    html_dir = os.path.join(data_dir, HTML_DIRNAME)
+    os.makedirs(html_dir, exist_ok=True)
+
+    cache = {}
+    written = 0
+    current = set()
+    for volume in data:
+        for theme in volume["themes"]:
+            path = theme.get("html")
+            if path is None or not os.path.exists(os.path.join(data_dir, path)):
+                text = dump_compact(render_theme(theme, cache))
+                digest = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+                path = f"{HTML_DIRNAME}/{digest}.json"
+                full_path = os.path.join(data_dir, path)
+                if not os.path.exists(full_path):
+                    with open(full_path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    written += 1
+                theme["html"] = path
+            current.add(os.path.basename(path))
+
+    for filename in os.listdir(html_dir):
+        if filename.endswith('.json') and filename not in current:
+            os.remove(os.path.join(html_dir, filename))
+
+    print(f"HTML fragments generated at: {html_dir} ({len(current)} themes, {written} written)")
+    return written
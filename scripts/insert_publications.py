@@ -0,0 +1,237 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+import generate_json
+from lint import summarize_titles
+from stable_ids import build_id_index
+from title_groups import SEPARATOR_TITLE
+from markdown_tokenizer import iter_records, iter_file_records
+from fix_excess_headers import write_atomically
+
+# Bulk insertion of publications into the Markdown sources, targeted by stable id (ids.json, see
+# stable_ids.py). Replaces one-off scripts appending literals to a hard-coded file.
+#
+# Input, JSON:
+#   {"insertions": [{"target": <id>, "title": <optional>, "publications": [<publication>, ...]}, ...]}
+#   (or the list alone), a publication being {"header", "content"} or {"source", "publication_title",
+#   "date", "content"}
+# Input, Markdown (with --target): "## " publications, optionally under "# " titles.
+#
+# Targets:
+#   <volume>/<theme>/<group>   appended to the last title of the group (its last numbered part)
+#   <volume>/<theme>           with "title" (or under a "# " title): appended to the last title of the
+#                              theme with that name, or to a new title at the end of the theme
+# A publication whose body (header when it has none) is already in the target theme, or earlier in
+# the batch, is skipped (compared by hash, whitespace and bold markers aside), so a batch can be re-run safely. Every target is resolved before anything
+# is written; each file is then rewritten once, atomically.
+INSERT_TMP_PREFIX = '.insert_'
+# Ignored by the content hash: a publication reformatted by the editors (bold speaker labels,
+# line breaks, indentation, "---" rules between publications) still counts as present
+HASH_IGNORED_RE = re.compile(r'^-{3,}$|[\s*＊]+', re.MULTILINE)
+
+def content_hash(pub):
+    text = HASH_IGNORED_RE.sub('', pub["content"]) or HASH_IGNORED_RE.sub('', pub["header"])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def publication_header(pub):
+    if pub.get("header"):
+        return pub["header"].strip()
+    parts = [pub.get("source", "").strip()]
+    if pub.get("publication_title"):
+        parts.append(f"「{pub['publication_title'].strip()}」")
+    if pub.get("date"):
+        parts.append(f"（{pub['date'].strip()}）")
+    return '　'.join(part for part in parts if part)
+
+def render_publication(pub):
+    """
+    Returns (markdown, parsed record): the record is what the build will read back, and the
+    text is rejected if it does not read back as exactly one publication.
+    """
+    header = publication_header(pub)
+    if not header:
+        raise ValueError("publication without a header")
+    text = f"## {header}\n\n{pub.get('content', '').strip()}\n\n"
+    records = list(iter_records(text.splitlines(keepends=True)))
+    if len(records) != 1 or records[0]["kind"] != "publication":
+        raise ValueError(f"'{header}': the content contains header lines")
+    return text, records[0]
+
+def load_json_insertions(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data["insertions"] if isinstance(data, dict) else data
+
+def load_markdown_insertions(path, target):
+    """One insertion per "# " title of the fragment (publications before any title go to target itself)."""
+    insertions = [{"target": target, "publications": []}]
+    for record in iter_file_records(path):
+        if record["kind"] == "title":
+            insertions.append({"target": target, "title": record["text"], "publications": []})
+        else:
+            insertions[-1]["publications"].append({"header": record["header"], "content": record["content"]})
+    return [insertion for insertion in insertions if insertion["publications"] or "title" in insertion]
+
+def title_lines(file_path):
+    """Line numbers of the titles of a file as they appear in the build (titles without publications dropped)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return [line for line, _, publications in summarize_titles(iter_records(f)) if publications]
+
+def title_location(volume, theme, title_index):
+    """(source file, index among the titles of that file) of theme["titles"][title_index]."""
+    title = theme["titles"][title_index]
+    occurrence = sum(1 for other in theme["titles"][:title_index]
+                     if other.get("origin_filename") == title["origin_filename"])
+    return os.path.join(generate_json.BASE_DIR, volume["volume"], title["origin_filename"]), occurrence
+
+def plan_insertions(data, insertions):
+    """
+    Resolves the insertions against the parsed corpus.
+    Returns (edits, skipped, errors):
+    edits {file_path: [(title occurrence in the file or None for the end, text, publication count), ...]}.
+    """
+    ids = build_id_index(data)
+    edits = {}
+    skipped = 0
+    errors = []
+    theme_hashes = {}   # (v, t) -> content hashes present in the theme, batch included
+    new_titles = {}     # (v, t, title) -> (file_path, position in edits[file_path]) of a title created by the batch
+
+    for n, insertion in enumerate(insertions, 1):
+        target = insertion.get("target", "")
+        location = ids.get(target)
+        if location is None or len(location) not in (2, 3):
+            errors.append(f"insertion {n}: '{target}' is not a theme or group id")
+            continue
+        volume = data[location[0]]
+        theme = volume["themes"][location[1]]
+        name = insertion.get("title", "").replace('について', '').strip()
+
+        if len(location) == 3:
+            title_index = theme["groups"][location[2]]["titles"][-1]
+        elif name:
+            matches = [i for i, title in enumerate(theme["titles"]) if title["title"] == name]
+            title_index = matches[-1] if matches else None
+        else:
+            errors.append(f"insertion {n}: a theme target needs a title")
+            continue
+
+        hashes = theme_hashes.get(tuple(location[:2]))
+        if hashes is None:
+            hashes = theme_hashes[tuple(location[:2])] = {
+                content_hash(pub) for title in theme["titles"] for pub in title["publications"]}
+
+        texts = []
+        for pub in insertion.get("publications", []):
+            try:
+                text, record = render_publication(pub)
+            except ValueError as e:
+                errors.append(f"insertion {n}: {e}")
+                continue
+            digest = content_hash(record)
+            if digest in hashes:
+                skipped += 1
+                continue
+            hashes.add(digest)
+            texts.append(text)
+        if not texts:
+            continue
+
+        if title_index is not None:
+            file_path, occurrence = title_location(volume, theme, title_index)
+            edits.setdefault(file_path, []).append((occurrence, ''.join(texts), len(texts)))
+        else:
+            # New title at the end of the theme's last file
+            key = (location[0], location[1], name)
+            if key in new_titles:
+                file_path, position = new_titles[key]
+                _, text, count = edits[file_path][position]
+                edits[file_path][position] = (None, text + ''.join(texts), count + len(texts))
+                continue
+            last = [title for title in theme["titles"] if title["title"] != SEPARATOR_TITLE][-1]
+            file_path = os.path.join(generate_json.BASE_DIR, volume["volume"], last["origin_filename"])
+            edits.setdefault(file_path, []).append((None, f"# {insertion['title'].strip()}\n\n" + ''.join(texts),
+                                                    len(texts)))
+            new_titles[key] = (file_path, len(edits[file_path]) - 1)
+
+    return edits, skipped, errors
+
+def apply_file_edits(file_path, file_edits):
+    """Inserts every block of file_edits at the end of its title (in input order), in one write."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+    starts = title_lines(file_path)
+    h1_lines = [record["line"] for record in iter_records(lines) if record["kind"] == "title"]
+
+    blocks = {}   # insertion index (0-based line) -> [text, ...]
+    for occurrence, text, _ in file_edits:
+        end = len(lines)
+        if occurrence is not None:
+            following = [line for line in h1_lines if line > starts[occurrence]]
+            if following:
+                end = following[0] - 1
+        blocks.setdefault(end, []).append(text)
+
+    if lines and not lines[-1].endswith('\n'):
+        lines[-1] += '\n'
+    for index in sorted(blocks, reverse=True):
+        text = ''.join(blocks[index])
+        if index > 0 and lines[index - 1].strip():
+            text = '\n' + text
+        lines[index:index] = [text]
+    write_atomically(file_path, lines, INSERT_TMP_PREFIX)
+
+def insert_publications(insertions, dry_run=False, data=None):
+    """
+    data, when given, is an already parsed corpus (see pipeline.py).
+    Returns the number of publications inserted (planned, with dry_run), or None on errors.
+    """
+    if data is None:
+        data = generate_json.build_data()
+    edits, skipped, errors = plan_insertions(data, insertions)
+    if errors:
+        for error in errors:
+            print(f"Error: {error}")
+        print("Nothing written.")
+        return None
+
+    inserted = 0
+    for file_path in sorted(edits):
+        count = sum(pub_count for _, _, pub_count in edits[file_path])
+        inserted += count
+        print(f"{os.path.relpath(file_path, generate_json.BASE_DIR)}: {count} publication(s)")
+        if not dry_run:
+            apply_file_edits(file_path, edits[file_path])
+
+    verb = "would be inserted" if dry_run else "inserted"
+    print(f"{inserted} publication(s) {verb} in {len(edits)} file(s), {skipped} already present")
+    return inserted
+
+def add_arguments(parser):
+    parser.add_argument('input', help="JSON insertions, or a Markdown fragment (.md) with --target")
+    parser.add_argument('--target', help="Theme or group id for a Markdown fragment")
+    parser.add_argument('--dry-run', action='store_true', help="Only report what would be inserted")
+
+def load_insertions(args):
+    if args.input.endswith('.md'):
+        if not args.target:
+            raise ValueError("a Markdown fragment needs --target")
+        return load_markdown_insertions(args.input, args.target)
+    return load_json_insertions(args.input)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Insert publications into themes and titles by stable id")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    try:
+        insertions = load_insertions(args)
+    except ValueError as e:
+        parser.error(str(e))
+    return 0 if insert_publications(insertions, args.dry_run) is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import hashlib
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+
+import generate_json
+from generate_json import list_volumes, collect_theme_files, build_theme_entries
+from markdown_tokenizer import iter_records, header_level, BOLD_MARKERS
+from title_groups import SEPARATOR_TITLE, TRAILING_NUMBER_RE
+
+# Lint engine for the Markdown corpus: structural problems the build passes over silently.
+#
+# Rules are plain functions registered in FILE_RULES or VOLUME_RULES ({code: (check, severity, description)}):
+#   file rules    check(lines, records) -> [(line, message)]; lines of one file and its tokenizer records
+#   volume rules  check(volume) -> [(relative_path, line, message)]; volume is
+#                 {"name", "filenames", "themes": [{"name", "titles"}]}, the theme titles being the
+#                 entries the build would produce (with "line" and "origin_filename") and their "groups"
+#
+# File rules run in a process pool, and their results are cached per file content (sha256) in
+# the data directory (.lint_cache.json), so a rerun only lints the files that changed. Their
+# title summary is cached with them: volume rules never re-read the files.
+# Diagnostics: {"file": <path relative to the Markdown root>, "line": <1-based, null for the whole file>,
+#               "rule", "severity": "error"|"warning", "message"}
+LINT_CACHE_NAME = ".lint_cache.json"
+LINT_VERSION = 1   # bump when a file rule changes, to drop cached results
+BRACKET_PAIRS = (('「', '」'), ('（', '）'))
+BRACKET_RE = re.compile('[「」（）]')
+
+# ---------- file rules ----------
+
+def check_h2_before_h1(lines, records):
+    """
+    H2 records before the first H1 of a file: generate_json keeps the last one as an empty
+    "intro" publication of the next title (its body is dropped) and discards the others.
+    """
+    orphans = []
+    for record in records:
+        if record["kind"] == "title":
+            break
+        orphans.append(record)
+    else:
+        return [(record["line"], "H2 with no H1 in the file: dropped from the build") for record in orphans]
+
+    diagnostics = [(record["line"], f"H2 before the first H1: dropped (replaced by the H2 at line {orphans[-1]['line']})")
+                   for record in orphans[:-1]]
+    if orphans:
+        diagnostics.append((orphans[-1]["line"],
+                            "H2 before the first H1: becomes an empty intro publication of the next title "
+                            "(its body is dropped)"))
+    return diagnostics
+
+def check_brackets(lines, records):
+    """
+    Unbalanced 「」/（） within a header line, or within the body between two headers.
+    Reported at the unmatched closing bracket, or at each opening bracket left open.
+    """
+    diagnostics = []
+    closing_of = dict(BRACKET_PAIRS)
+    opening_of = {closing: opening for opening, closing in BRACKET_PAIRS}
+
+    def scan(segment, where):
+        open_lines = {opening: [] for opening in closing_of}
+        for line_no, brackets in segment:
+            for char in brackets:
+                if char in closing_of:
+                    open_lines[char].append(line_no)
+                elif open_lines[opening_of[char]]:
+                    open_lines[opening_of[char]].pop()
+                else:
+                    diagnostics.append((line_no, f"{char} without a matching {opening_of[char]} {where}"))
+        for opening, line_numbers in open_lines.items():
+            for line_no in line_numbers:
+                diagnostics.append((line_no, f"{opening} not closed {where}"))
+
+    body = []
+    for line_no, line in enumerate(lines, 1):
+        # Only the bracket characters of each line are scanned
+        brackets = BRACKET_RE.findall(line)
+        if header_level(line):
+            scan(body, "in this body")
+            body = []
+            scan([(line_no, brackets)], "in the header")
+        elif brackets:
+            body.append((line_no, brackets))
+    scan(body, "in this body")
+    return diagnostics
+
+def check_stray_bold(lines, records):
+    """
+    "**" that does not pair up on its line, bold markers inside a header (parse_header only
+    strips them at both ends, the rest ends up in the title or source), and headers hidden
+    behind a leading bold marker ("**## ...").
+    """
+    diagnostics = []
+    for line_no, line in enumerate(lines, 1):
+        if '**' not in line and '＊＊' not in line:
+            continue
+        text = line.strip()
+        if (text.count('**') + text.count('＊＊')) % 2:
+            diagnostics.append((line_no, "unpaired ** on this line"))
+
+        level = header_level(line)
+        if level:
+            inner = text[level + 1:].strip()
+            if inner.startswith(BOLD_MARKERS):
+                inner = inner[2:]
+            if inner.endswith(BOLD_MARKERS):
+                inner = inner[:-2]
+            if level == 1 and inner != text[2:].strip():
+                diagnostics.append((line_no, "** around an H1: kept in the title"))
+            elif '**' in inner or '＊＊' in inner:
+                diagnostics.append((line_no, "** inside the header: kept in its title or source"))
+        elif text.lstrip('*＊').lstrip().startswith('#') and header_level(text.lstrip('*＊').lstrip()):
+            diagnostics.append((line_no, "header behind a bold marker: not read as a header"))
+    return diagnostics
+
+FILE_RULES = {
+    "h2-before-h1": (check_h2_before_h1, "error", "H2 headers before the first H1 of a file"),
+    "brackets": (check_brackets, "warning", "Unbalanced 「」 or （） in a header or a body"),
+    "stray-bold": (check_stray_bold, "warning", "Unpaired ** and bold markers the header parser keeps"),
+}
+
+# ---------- volume rules ----------
+
+def check_raw_edited_pairs(volume):
+    """A raw file next to its _edited version is skipped by the build."""
+    diagnostics = []
+    filenames = set(volume["filenames"])
+    for filename in sorted(filenames):
+        if filename.endswith('.md') and not filename.endswith('_edited.md') \
+                and filename[:-3] + "_edited.md" in filenames:
+            diagnostics.append((f"{volume['name']}/{filename}", None,
+                                f"raw file skipped in favor of {filename[:-3]}_edited.md"))
+    return diagnostics
+
+def check_group_merges(volume):
+    """
+    Title groups (title_groups.build_title_groups) that merge more than numbered parts in order:
+    repeated titles, unnumbered titles, parts out of order, parts apart from each other.
+    """
+    diagnostics = []
+    for theme in volume["themes"]:
+        titles = theme["titles"]
+        real_positions = {}
+        for index, title in enumerate(titles):
+            if title["title"] != SEPARATOR_TITLE:
+                real_positions[index] = len(real_positions)
+
+        for group in theme["groups"]:
+            if "id" not in group or len(group["titles"]) < 2:
+                continue
+            first = titles[group["titles"][0]]
+            numbers = []
+            previous_index = group["titles"][0]
+            for index in group["titles"]:
+                title = titles[index]
+                number = TRAILING_NUMBER_RE.search(title["title"])
+                numbers.append(int(number.group().strip(' \t　')) if number else None)
+                if index == group["titles"][0]:
+                    continue
+
+                where = f"{volume['name']}/{title['origin_filename']}"
+                origin = f"{first['origin_filename']}:{first['line']}"
+                if title["title"] == first["title"]:
+                    message = f"same title as {origin}: both are shown as one title"
+                elif number is None or numbers[0] is None:
+                    message = f"numbered and unnumbered titles merged into '{group['title']}' ({origin})"
+                elif numbers[-2] is not None and numbers[-1] <= numbers[-2]:
+                    message = f"part {numbers[-1]} after part {numbers[-2]} of '{group['title']}'"
+                elif real_positions[index] - real_positions[previous_index] > 1:
+                    between = real_positions[index] - real_positions[previous_index] - 1
+                    message = f"joins '{group['title']}' ({origin}) across {between} other title(s)"
+                else:
+                    message = None
+                if message:
+                    diagnostics.append((where, title["line"], message))
+                previous_index = index
+    return diagnostics
+
+VOLUME_RULES = {
+    "raw-edited-pair": (check_raw_edited_pairs, "warning", "Raw files shadowed by their _edited version"),
+    "group-merge": (check_group_merges, "warning", "Title groups that merge more than consecutive numbered parts"),
+}
+
+# ---------- engine ----------
+
+def summarize_titles(records):
+    """[[line, title, publication count], ...] as parse_file() builds them (orphan H2s included)."""
+    titles = []
+    pending = False
+    for record in records:
+        if record["kind"] == "title":
+            titles.append([record["line"], record["text"].replace('について', ''), 1 if pending else 0])
+            pending = False
+        elif titles:
+            titles[-1][2] += 1
+        else:
+            pending = True
+    return titles
+
+def lint_file(file_path):
+    """Runs every file rule on one file. Returns {"diagnostics": [...], "titles": [...]} (cacheable)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    records = list(iter_records(line + '\n' for line in lines))
+
+    diagnostics = []
+    for code, (check, severity, _) in FILE_RULES.items():
+        for line, message in check(lines, records):
+            diagnostics.append({"line": line, "rule": code, "severity": severity, "message": message})
+    return {"diagnostics": diagnostics, "titles": summarize_titles(records)}
+
+def load_cache(cache_path):
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache["files"] if cache.get("version") == LINT_VERSION else {}
+
+def save_cache(cache_path, files):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": LINT_VERSION, "files": files}, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, cache_path)
+
+def plan_volumes():
+    """[(volume_name, volume_path, all filenames, [(theme_order, theme_name, filename), ...])] as the build sees them."""
+    volumes = []
+    for volume_name, volume_path in list_volumes():
+        # collect_theme_files reports the skipped raw files; raw-edited-pair does too
+        with contextlib.redirect_stdout(io.StringIO()):
+            theme_files = collect_theme_files(volume_path)
+        volumes.append((volume_name, volume_path, sorted(os.listdir(volume_path)), theme_files))
+    return volumes
+
+def build_volume(volume_name, filenames, theme_files, results):
+    """The volume passed to the volume rules, from the cached title summaries."""
+    themes_map = {}
+    for theme_order, theme_name, filename in theme_files:
+        theme = themes_map.setdefault(theme_order, {"name": theme_name, "titles": []})
+        for line, title, publications in results[f"{volume_name}/{filename}"]["titles"]:
+            theme["titles"].append({"title": title, "publications": [None] * publications,
+                                    "origin_filename": filename, "line": line})
+
+    themes = [{"name": entry["theme"], "titles": entry["titles"], "groups": entry["groups"]}
+              for entry in build_theme_entries(themes_map)]
+    return {"name": volume_name, "filenames": filenames, "themes": themes}
+
+def lint(jobs=1, use_cache=True, rules=None):
+    """
+    Lints the corpus under generate_json.BASE_DIR. rules limits the report to these rule codes.
+    Returns the report: {"diagnostics": [...], "summary": {...}}.
+    """
+    start = time.perf_counter()
+    base_dir = generate_json.BASE_DIR
+    cache_path = os.path.join(os.path.dirname(generate_json.OUTPUT_FILE), LINT_CACHE_NAME)
+    old_cache = load_cache(cache_path) if use_cache else {}
+
+    volumes = plan_volumes()
+    results = {}
+    to_lint = []   # (relative path, sha256)
+    for volume_name, volume_path, _, theme_files in volumes:
+        for _, _, filename in theme_files:
+            rel_path = f"{volume_name}/{filename}"
+            with open(os.path.join(volume_path, filename), 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            cached = old_cache.get(rel_path)
+            if cached and cached["sha256"] == digest:
+                results[rel_path] = cached
+            else:
+                to_lint.append((rel_path, digest))
+
+    file_paths = [os.path.join(base_dir, rel_path) for rel_path, _ in to_lint]
+    if jobs > 1 and len(file_paths) > 1:
+        # Largest files first, as generate_json.parse_files
+        order = sorted(range(len(file_paths)), key=lambda i: -os.path.getsize(file_paths[i]))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            linted = dict(zip(order, executor.map(lint_file, [file_paths[i] for i in order])))
+        linted = [linted[i] for i in range(len(file_paths))]
+    else:
+        linted = [lint_file(file_path) for file_path in file_paths]
+
+    for (rel_path, digest), result in zip(to_lint, linted):
+        result["sha256"] = digest
+        results[rel_path] = result
+    if use_cache and (to_lint or set(old_cache) != set(results)):
+        save_cache(cache_path, results)
+
+    diagnostics = []
+    for rel_path in sorted(results):
+        for diagnostic in results[rel_path]["diagnostics"]:
+            diagnostics.append({"file": rel_path, **diagnostic})
+    for volume_name, _, filenames, theme_files in volumes:
+        volume = build_volume(volume_name, filenames, theme_files, results)
+        for code, (check, severity, _) in VOLUME_RULES.items():
+            for rel_path, line, message in check(volume):
+                diagnostics.append({"file": rel_path, "line": line, "rule": code,
+                                    "severity": severity, "message": message})
+
+    if rules:
+        diagnostics = [d for d in diagnostics if d["rule"] in rules]
+    diagnostics.sort(key=lambda d: (d["file"], d["line"] or 0, d["rule"]))
+
+    summary = {
+        "files": len(results),
+        "linted": len(to_lint),
+        "cached": len(results) - len(to_lint),
+        "errors": sum(1 for d in diagnostics if d["severity"] == "error"),
+        "warnings": sum(1 for d in diagnostics if d["severity"] == "warning"),
+        "by_rule": {code: sum(1 for d in diagnostics if d["rule"] == code)
+                    for code in list(FILE_RULES) + list(VOLUME_RULES) if not rules or code in rules},
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+    return {"diagnostics": diagnostics, "summary": summary}
+
+def format_report(report):
+    lines = []
+    for d in report["diagnostics"]:
+        location = f"{d['file']}:{d['line']}" if d["line"] else d["file"]
+        lines.append(f"{location}: {d['severity']}: {d['message']} [{d['rule']}]")
+
+    summary = report["summary"]
+    lines.append(f"{summary['errors']} error(s), {summary['warnings']} warning(s) in {summary['files']} files "
+                 f"({summary['linted']} linted, {summary['cached']} cached, {summary['seconds']:.2f} s)")
+    lines.append("  " + "  ".join(f"{code}={count}" for code, count in summary["by_rule"].items()))
+    return '\n'.join(lines)
+
+def write_report(report, output_format='text', output=None):
+    if output_format == 'json':
+        text = json.dumps(report, ensure_ascii=False, indent=2)
+    else:
+        text = format_report(report)
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+def exit_status(report, strict=False):
+    summary = report["summary"]
+    return 1 if summary["errors"] or (strict and summary["warnings"]) else 0
+
+def rule_list():
+    return '\n'.join(f"  {code:<16} {severity:<8} {description}"
+                     for code, (_, severity, description) in {**FILE_RULES, **VOLUME_RULES}.items())
+
+def add_arguments(parser):
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--output', help="Write the report to this file instead of stdout")
+    parser.add_argument('--rules', help="Comma-separated rule codes to report (default: all)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for the file rules (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help=f"Ignore and do not update {LINT_CACHE_NAME}")
+    parser.add_argument('--strict', action='store_true', help="Exit with status 1 on warnings too (always on errors)")
+
+def run(args):
+    rules = [code.strip() for code in args.rules.split(',')] if args.rules else None
+    unknown = set(rules or []) - set(FILE_RULES) - set(VOLUME_RULES)
+    if unknown:
+        print(f"Unknown rule(s): {', '.join(sorted(unknown))}\n{rule_list()}")
+        return 2
+    report = lint(jobs=args.jobs, use_cache=not args.no_cache, rules=rules)
+    write_report(report, args.format, args.output)
+    return exit_status(report, args.strict)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lint the Markdown corpus",
+                                     epilog="rules:\n" + rule_list(), formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+if __name__ == "__main__":
+    sys.exit(main())
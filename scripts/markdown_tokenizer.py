@@ -0,0 +1,120 @@
+"""
+Line-oriented tokenizer for the theme Markdown files.
+
+Reads a file line by line and lazily yields one record per header:
+
+    {"kind": "title", "text": ..., "line": n}
+        an H1 line ("# ...") with the marker removed (について is kept, callers normalize)
+
+    {"kind": "publication", "header": ..., "source": ..., "publication_title": ...,
+     "date": ..., "content": ..., "line": n}
+        an H2 line ("## ...") with its parsed header fields and the stripped body up to
+        the next header
+
+"line" is the 1-based line number of the header. Text before the first header is ignored.
+This matches the re.split(r'^((?:#|##)\\s+.+)$') parser generate_json.py used before, for
+headers that fit on one line (the corpus has no other kind).
+"""
+
+BOLD_MARKERS = ('**', '＊＊')
+
+def parse_header(header_line):
+    """
+    Parses the H2 header line to extract Source, Title, and Date in a single scan.
+    Example: 明主様御教え　「救世主の出現」　（昭和10年8月5日発行）
+    """
+    # Clean markdown formatting (bold)
+    header_line = header_line.strip()
+    if header_line.startswith(BOLD_MARKERS):
+        header_line = header_line[2:]
+    if header_line.endswith(BOLD_MARKERS):
+        header_line = header_line[:-2]
+    header_line = header_line.strip()
+
+    title = ""
+    title_full = None
+    start = header_line.find('「')
+    if start >= 0:
+        end = header_line.find('」', start + 1)
+        if end >= 0:
+            title = header_line[start + 1:end]
+            title_full = header_line[start:end + 1]
+
+    date = ""
+    date_full = None
+    start = header_line.find('（')
+    if start >= 0:
+        end = header_line.find('）', start + 1)
+        if end >= 0:
+            date = header_line[start + 1:end]
+            date_full = header_line[start:end + 1]
+
+    # Source is the rest of the line once the title and date parts are removed
+    source = header_line
+    if title_full is not None:
+        source = source.replace(title_full, '')
+    if date_full is not None:
+        source = source.replace(date_full, '')
+
+    return {
+        "full_header": header_line,
+        "source": source.strip(),
+        "publication_title": title,
+        "date": date
+    }
+
+def header_level(line):
+    """Returns 1 or 2 for an H1/H2 header line, 0 otherwise."""
+    if line.startswith('# '):
+        return 1 if line[2:].strip() else 0
+    if line.startswith('## '):
+        return 2 if line[3:].strip() else 0
+    return 0
+
+def _make_record(level, header_text, body_lines, line_no):
+    if level == 1:
+        return {"kind": "title", "text": header_text, "line": line_no}
+
+    parsed = parse_header(header_text)
+    return {
+        "kind": "publication",
+        "header": parsed["full_header"],
+        "source": parsed["source"],
+        "publication_title": parsed["publication_title"],
+        "date": parsed["date"],
+        "content": ''.join(body_lines).strip(),
+        "line": line_no
+    }
+
+def iter_records(lines):
+    """
+    Yields title/publication records from an iterable of lines (e.g. an open file).
+    A publication is yielded once its body is complete (next header or end of input);
+    only that body is buffered.
+    """
+    level = 0
+    header_text = None
+    header_line_no = 0
+    body_lines = []
+
+    for line_no, line in enumerate(lines, 1):
+        new_level = header_level(line)
+        if not new_level:
+            if level == 2:
+                body_lines.append(line)
+            continue
+
+        if level:
+            yield _make_record(level, header_text, body_lines, header_line_no)
+
+        level = new_level
+        header_text = line.strip()[new_level + 1:].strip()
+        header_line_no = line_no
+        body_lines = []
+
+    if level:
+        yield _make_record(level, header_text, body_lines, header_line_no)
+
+def iter_file_records(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        yield from iter_records(f)
@@ -0,0 +1,16 @@
+import os
+
+# Default locations of the corpus and the generated data, shared by every script.
+# They follow the repository layout (Markdown/ and data/ next to scripts/) and can be moved
+# with environment variables, or per run with pipeline.py --markdown-dir/--data-dir.
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MARKDOWN_DIR = os.environ.get("SHIN_COLLEGE_MARKDOWN_DIR", os.path.join(REPO_DIR, "Markdown"))
+DATA_DIR = os.environ.get("SHIN_COLLEGE_DATA_DIR", os.path.join(REPO_DIR, "data"))
+# Output of watch.py, kept apart from DATA_DIR so a watch session never mixes with a published build
+DEV_DATA_DIR = os.environ.get("SHIN_COLLEGE_DEV_DATA_DIR", os.path.join(REPO_DIR, "data-dev"))
+
+JSON_NAME = "shin_college_data.json"
+BUILD_MANIFEST_NAME = ".build_manifest.json"
+BUILD_CACHE_DIRNAME = ".build_cache"
+INDICES_DIRNAME = "Indices"
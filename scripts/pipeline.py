@@ -0,0 +1,228 @@
+import os
+import sys
+import argparse
+
+import paths
+import generate_json
+import benchmark_build
+import split_markdown_groups
+import compare_generated_vs_index
+import fix_excess_headers
+import watch
+import lint
+import insert_publications
+
+# Single entry point for the build scripts, with configurable input and output roots:
+#
+#   python3 scripts/pipeline.py [--markdown-dir DIR] [--data-dir DIR] [--json-input [FILE]] STAGE [options] [STAGE [options] ...]
+#
+#   build        generate_json.py (same output options: --sharded, --ids, --html, ...)
+#   validate     compare_generated_vs_index.py (--format, --output, --strict)
+#   lint         lint.py (--format, --output, --rules, --jobs, --no-cache, --strict)
+#   fix-headers  fix_excess_headers.py (--dry-run)
+#   split        split_markdown_groups.py (--check, dirs; default: the volume folders under --markdown-dir)
+#   insert       insert_publications.py (input, --target, --dry-run)
+#   bench        benchmark_build.py (its options; --base-dir defaults to --markdown-dir)
+#   watch        watch.py (--html, --ids, --no-serve, --host, --port, --dev-data-dir; writes to its own
+#                directory, not --data-dir); runs until interrupted, so give it last
+#
+# Stages run in the order given, in one process, e.g.
+#   pipeline.py --data-dir /srv/data build --ids --html validate --strict
+# parses the Markdown once: validate and fix-headers reuse the corpus built (or loaded) by an earlier
+# stage, and the index files are read once. A stage that rewrites the Markdown (fix-headers, split,
+# insert) drops the corpus, so the next stage parses the edited files again.
+# Defaults come from paths.py (SHIN_COLLEGE_MARKDOWN_DIR / SHIN_COLLEGE_DATA_DIR).
+
+def global_arguments(parser):
+    parser.add_argument('--markdown-dir', default=paths.MARKDOWN_DIR, help="Markdown corpus root (default: %(default)s)")
+    parser.add_argument('--data-dir', default=paths.DATA_DIR, help="Output directory (default: %(default)s)")
+    parser.add_argument('--json-input', nargs='?', const=True, default=None,
+                        help="Load the corpus from a generated JSON file (the one in --data-dir if no value) "
+                             "instead of parsing the Markdown; build always parses")
+
+def build_arguments(parser):
+    generate_json.add_build_arguments(parser)
+
+def validate_arguments(parser):
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--output', help="Write the report to this file instead of stdout")
+    parser.add_argument('--strict', action='store_true', help="Fail if any difference is found")
+
+def lint_arguments(parser):
+    lint.add_arguments(parser)
+
+def fix_headers_arguments(parser):
+    parser.add_argument('--dry-run', action='store_true', help="Only show the planned edits as a diff")
+
+def insert_arguments(parser):
+    insert_publications.add_arguments(parser)
+
+def split_arguments(parser):
+    split_markdown_groups.add_arguments(parser)
+
+def watch_arguments(parser):
+    watch.add_arguments(parser)
+
+def corpus(state):
+    """The parsed corpus, built on first use and shared by the following stages."""
+    if state["data"] is None:
+        state["data"] = compare_generated_vs_index.load_data(state["json_input"])
+    return state["data"]
+
+def index(state):
+    if state["index"] is None:
+        state["index"] = compare_generated_vs_index.load_index(state["indices_dir"])
+    return state["index"]
+
+def run_build(state, args):
+    if state["data"] is None:
+        state["data"] = generate_json.build_data(incremental=args.incremental, jobs=args.jobs)
+    elif args.incremental or args.jobs > 1:
+        print("Warning: --incremental/--jobs ignored, the corpus parsed by an earlier stage is reused")
+    generate_json.convert_to_json(data=state["data"], **generate_json.output_kwargs(args))
+    return 0
+
+def run_validate(state, args):
+    report = compare_generated_vs_index.check_mismatches(output_format=args.format, output=args.output,
+                                                         json_data=corpus(state), index=index(state))
+    return 1 if args.strict and compare_generated_vs_index.has_differences(report) else 0
+
+def run_lint(state, args):
+    # Works on the Markdown lines, with its own per-file cache
+    return lint.run(args)
+
+def run_fix_headers(state, args):
+    edits = fix_excess_headers.fix_excess_headers(dry_run=args.dry_run, json_data=corpus(state),
+                                                  index=index(state), markdown_dir=state["markdown_dir"])
+    if edits and not args.dry_run:
+        state["data"] = None
+        state["json_input"] = None
+    return 0
+
+def run_split(state, args):
+    target_dirs = args.dirs or [os.path.join(state["markdown_dir"], d) for d in split_markdown_groups.DEFAULT_DIRS]
+    would_split = split_markdown_groups.split_dirs(target_dirs, args.check)
+    if args.check:
+        return 1 if would_split else 0
+    if would_split:
+        state["data"] = None
+        state["json_input"] = None
+    return 0
+
+def run_insert(state, args):
+    try:
+        insertions = insert_publications.load_insertions(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 2
+    # Targets are resolved to source lines: a corpus loaded from a JSON file may be stale
+    data = corpus(state) if not state["json_input"] else None
+    inserted = insert_publications.insert_publications(insertions, args.dry_run, data)
+    if inserted is None:
+        return 1
+    if inserted and not args.dry_run:
+        state["data"] = None
+    return 0
+
+def run_bench(state, argv):
+    # The benchmark times the parse itself, so it never uses the shared corpus
+    benchmark_build.main(argv)
+    return 0
+
+def run_watch(state, args):
+    # Keeps its own per-file corpus, to re-parse only what changes
+    watch.watch(args.html, args.ids, not args.no_serve, args.host, args.port, args.dev_data_dir)
+    return 0
+
+# name -> (add_arguments, run, help); bench keeps benchmark_build's own parser
+STAGES = {
+    "build": (build_arguments, run_build, "Convert the Markdown corpus into the data files"),
+    "validate": (validate_arguments, run_validate, "Reconcile the generated titles against the index files"),
+    "lint": (lint_arguments, run_lint, "Lint the Markdown corpus (structural problems the build passes over)"),
+    "fix-headers": (fix_headers_arguments, run_fix_headers, "Remove '#' from H1 titles that are not in the index"),
+    "split": (split_arguments, run_split, "Split monolithic theme files into one file per title group"),
+    "insert": (insert_arguments, run_insert, "Insert publications into themes and titles by stable id"),
+    "bench": (None, run_bench, "Benchmark the build stage by stage"),
+    "watch": (watch_arguments, run_watch, "Rebuild the sharded output on every change and live-reload the app"),
+}
+
+def value_options(add_arguments):
+    """Option strings taking a value in the parser built by add_arguments (None: any --option, as in bench)."""
+    if add_arguments is None:
+        return None
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    return {option for action in parser._actions if action.nargs not in (0, '?') for option in action.option_strings}
+
+def split_stages(argv):
+    """
+    Splits argv into the global options and [(stage, stage_argv)]. A stage name starts a new stage
+    unless it is the value of the option before it (e.g. "insert x.md --target lint"); a positional
+    argument spelled like a stage name has to be written as a path ("./lint").
+    """
+    global_argv = []
+    stages = []
+    options = value_options(global_arguments)
+    expects_value = False
+    for arg in argv:
+        if arg in STAGES and not expects_value:
+            stages.append((arg, []))
+            options = value_options(STAGES[arg][0])
+            expects_value = False
+            continue
+        (stages[-1][1] if stages else global_argv).append(arg)
+        expects_value = (arg.startswith('-') and '=' not in arg
+                         and (arg in options if options is not None else arg.startswith('--')))
+    return global_argv, stages
+
+def main(argv=None):
+    global_argv, stages = split_stages(sys.argv[1:] if argv is None else argv)
+
+    parser = argparse.ArgumentParser(
+        description="Run the build scripts as one pipeline",
+        usage="%(prog)s [options] STAGE [stage options] [STAGE [stage options] ...]",
+        epilog="stages: " + "; ".join(f"{name}: {help_text}" for name, (_, _, help_text) in STAGES.items()))
+    global_arguments(parser)
+    args = parser.parse_args(global_argv)
+    if not stages:
+        parser.error("no stage given (" + ", ".join(STAGES) + ")")
+
+    generate_json.configure(args.markdown_dir, args.data_dir)
+    split_markdown_groups.BASE_DIR = args.markdown_dir
+    json_input = args.json_input
+    if json_input is True:
+        json_input = generate_json.OUTPUT_FILE
+
+    state = {
+        "markdown_dir": args.markdown_dir,
+        "indices_dir": os.path.join(args.markdown_dir, paths.INDICES_DIRNAME),
+        "json_input": json_input,
+        "data": None,
+        "index": None,
+    }
+
+    # Parse every stage's options up front, so a typo fails before anything runs
+    parsed = []
+    for name, stage_argv in stages:
+        add_arguments, run, help_text = STAGES[name]
+        if add_arguments is None:
+            parsed.append((name, run, stage_argv))
+            continue
+        stage_parser = argparse.ArgumentParser(prog=f"{parser.prog} {name}", description=help_text)
+        add_arguments(stage_parser)
+        parsed.append((name, run, stage_parser.parse_args(stage_argv)))
+
+    for name, run, stage_args in parsed:
+        print(f"== {name}")
+        if name == "build" and state["json_input"]:
+            # The JSON being rebuilt is not a source
+            state["data"] = None
+            state["json_input"] = None
+        status = run(state, stage_args)
+        if status:
+            print(f"Stage {name} failed (status {status})")
+            return status
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
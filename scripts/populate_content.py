@@ -1,436 +0,0 @@
-
-import os
-
-filename = "/Users/michael/Documents/Ensinamentos/EstudoAprofundado/Markdown/3.信仰編/御神体とお光_edited.md"
-
-content = """
-
-## 明主様御垂示　「御神体奉斎で馬鹿が治った事例」　（昭和23年2月8日）
-
-信者の質問
-「茨城の太田町で先日日蓮宗の行者が四、五十名集まって修行中、その指導者格の人に金色の光が見えたので、よく調べたところその中に一人御守りをいただいた人がおりました。」
-
-
-明主様御垂示
-「光明如来をお祀りすると離縁もなくなる。
-
-こんなのがある。少し頭の足りない主人があり、その細君が光明如来をお祀りしたところ、だんだん主人の頭がよくなり、この分なら一生つれ添っても大丈夫だというわけで納まってしまいました。
-
-夫婦喧嘩もしなくなります。光のために動物霊が萎縮するんです。
-
-喧嘩は動物霊ですからね。
-
-支那でも道教の信者は霊格が高いようです。
-
-新しい信者が掟を破って肉食などして帰ると門番に見破られ殴られるそうです。」
-
-
-
-## 明主様御垂示　「御神体をお腹にのせて病気を治して良い場合もある」　（昭和26年10月1日）
-
-信者の質問
-「浄化が強く、浄霊をしてもおさまらないので、脈もなくなるし、顔色もなくなってしかたがないので、
-
-余ってあります光明如来様を病人の上に拡げましたところが治りました」
-
-
-明主様御垂示
-「お祀りしてない・・・余分の御神体なら良いですよ。
-
-しかし、それは浄霊する人の霊力が弱いんです。
-
-拡げなくても巻いたままお腹の上にのせても良いです。
-
-お願いしてね。
-
-いまの・・・力を入れないやり方だと、そんなことをしなくても治るわけですがね。」
-
-
-
-## 体験談　妙智力の現れ　（地上天国　1号　昭和23年12月1日発行）
-
-神奈川県足柄上郡金田村　ＮＴ子（21）
-
-「右の婦人は六月二日突然発作的にうつぶせになって会話はできずその症状は死の刹那の形相で、今にも死にそうになったので、
-
-家の者は右往左往手を施す術もなく救けるべき方法もなし、医者に来て貰っても手遅れと云われるだろうし、
-
-実弟が神におすがりするより外ないと私の所へ馳け込んで救けてくれとの嘆願に私は、一目散に訪れ急いで浄霊に取りかかりました。
-
-所が患者は苦しそうに「二人では助からぬ」と口ぐせにうなっているのです。
-
-このうなり方が死の格好をするのでこれは死霊に違いないと思い
-
-即座に私は家の人に「家族の中で変死した人はないか」と聞きましたところ
-
-「関東大震災で病院へ入院した実姉が亡くなった。その時付添いの看護婦がその実姉を救おうとして遂に二人共死んでしまった」と事実を語り終ると次第に苦しみも柔らぎました。
-
-間もなく落ち着いたので私は帰途につきました。
-
-すると夜中の一時頃再びその家族から迎えがきたので、私は再発作したものと直感し、もう自分の力ではとても鎮圧は出来ないと思い。
-
-勿体ない事ですが、光明如来の御書（顧問大先生御揮毫）を胸に抱き再び急ぎました。
-
-行ってみると想像以上に物すごく、狂人の如き形相をして自分の方を凝視しているのです。
-
-すぐ御浄霊にとりかかると暴れ出しどうしてよいか手のつけようもなく家の人も途方にくれ、ただああと云い、呆気にとられ私の処置のみを待っているのでした。
-
-私自身もはや呑まれた形で胸に抱いたお軸のみをただ一つの頼りとしてその御書を病人の頭上にのせてしまいました。
-
-すると驚いた事には私が予想していた通りみるみる中に病人は静かになり、家の者も余りの奇蹟に愕然とし、観音の妙智力の偉大さに思わず讃仰の言葉を発しました。
-
-直ちに御浄霊に取りかかりますと、今度は何事もなく一回目が終ると同時に病人が物凄く大きな声で「黒い手が神様と神様のの間をくるから、その手を止めてくれ」と云うのです。
-
-私は突差の声に一寸迷いましたか「神様」と云った声を深く感じ、
-
-「その神様は何とおっしゃる方だ」と聞きながら私は御浄霊特に頭に深く霊射しました。
-
-すると再び彼女は口を開き「今の御浄霊で黒い手は消え去り、それと一緒に観音様が多勢の神様を連れて私を助けにきて下さっている」というのです。
-
-それをもっとくわしく聞き正すと、足の方に観音様が現われて、向って右側に雨で濡れてしずくのたれたはだしの神様が先頭にたって助けに来られている。
-
-左側におられる神様は観音様がまぶしくてよく解らないと云いました。
-
-私はすぐ脳裏にこの偉大なる浄霊に黒い手は忽ち消え去り、観音様が側に助けに来て下された事を有難く感ぜずにはいられませんでした。
-
-家族の者ももう黙って私のする行動を見守っていました。
-
-私は彼女が神がかりになったのではないかと感じました。
-
-それは家の祖先の事や現在の事など色々と云うのです。
-
-今主人がシベリヤの方へ行ってまだ帰って来ないが、必ず帰って来るから安心して待っていなさいとハキハキ答えたりするのです。
-
-彼女は「主人が帰ってきたら御礼方々二人で観音様へ参拝に行く」と云いました。
-
-その時の本人は全く自己意識がなく無我でありました。
-
-そのまま彼女は「これで助かった、安心して下さい」と云い「善言讃詞はどうしてやるのですか」と尋ねた。
-
-私は直ちに善言讃詞を彼女に向って音読しながら一緒に称えた。
-
-唱え終った時彼女は「観音様がお帰りになった」と云って正気に帰りました。
-
-その夜より三日位で平常の仕事につけるようになりました。
-
-家の者もまた私も彼女に神ががりや一切の今の現象を次々と思い浮かべ全く観音妙智力は死に際会しても否日常生活においても眼に見えない御守護のある事を感謝し、
-
-また家の事や遠く故郷を離れシベリヤにいる主人の事をも教えて戴いた事数々ならぬ御守護は肝を貫く感があります。
-
-家族一同感慨無量ひたすら朝に夕に妙智力をあがめ尊んでいます。」
-
-
-
-## 明主様御講話　「御神体を奉斎するとオデキができる」　（昭和10年12月1日）
-
-「今晩の御讃歌の中に、大審判ということがありましたが、あれは、あの御讃歌の通りなんで、昔からいう世の終わりとか、最後の審判とかいうことを言いますが、もうそろそろ始まりかけてるのであります。
-
-それはどういうことかと言いますと、今度すばらしい光明世界ができるにつき、世界的大掃除をせられる。
-
-大掃除するとは、ご承知の通り汚いものをなくし、きれいにすることですが、それは物と事柄によって、いろいろな形式で行なわれる。
-
-そのうち一番判りやすくお話すれば、人間にしますと、人間がいかに汚れているかということについて、私が実見してるところをお話いたします。
-
-毎日ここで病人の方を扱っていますが、まずどんな方でも私がみると、実に汚いものがたくさん溜まっている。
-
-勿論、汚いものが溜まっているから病気になり、病気になるからここへ来られることになりますが、ここが悪いという所、病気の所だけが汚いのじゃなく、なんでもない所にもたくさんにある。
-
-大人によらず子供によらず、一様にある。ちょっとみて健康そうにみえていても、触ってみると、とてもよく判る。
-
-してみると、本当の意味からいうと、百％の健康の人は一人もないでしょう。
-
-上等の人として、九十％の人が一番上で、これもごく少ないだろうと思う。
-
-遠慮なく言ってみれば、よく今日の人が生命を保っていられると思う。
-
-実に体中が毒血と膿で埋まっていると言っていいくらいです。
-
-これは全体ですから、お互いで、お腹の立つこともなかろうと思います。
-
-これが本当に審判が始まれば、ほとんど助かる人はないと思う。
-
-審判とは、どういう意味かというと、神様の御光りがだんだんに強くなる。
-
-つまり、東方の光がだんだん強くなって出る。
-
-それは、ちょうど太陽が黎明からだんだん天の中心へ上って行く形で、天心へ上って行くほど太陽の光が強くなる。
-
-一遍に昇ってはたいへんですが、神様の大慈悲によって、だんだん昇っている。
-
-
-そのなによりの実例としては、観音様を祭るとおデキができる。
-
-おデキが出るというのは、汚いものが光に照らされるために浮いて出る。
-
-そして、排除されるために皮膚へ出るのです。
-
-それでいまはごく緩慢に穏やかにされているのですが、だんだん日が経ち、光が出ると、汚いものはいよいよ出てくることになる。
-
-そうなると汚れが多いと堪えられぬ。
-
-それに堪えられるのは、よほど汚れの少ない人でないといけない。倒れてしまう。
-
-それでまず、それが一番最初始められるのが観音会の人だけで、そのために観音会の人だけは軽くすまされるわけで、いまから掃除をされる。
-
-ここで掃除されなければ堪えきれず倒れるのです。
-
-
-このことを考えただけでも一般人は光が強くなってきたときはたいへんだと思う。
-
-今度は本当の真善美の光明世界ができるんですから、立派な家を建てるには、どうしてもその辺を浄めて、雑草など刈りとらなければならぬ。
-
-それがまず土台であります。
-
-そういうことはきっと行なわれるわけで、そう考えると今後は、早く観音会へ入り、少しでも浄めておかなければならぬ。
-
-少しでも浄められてた方は安全ですが、そうでない方は、生命の安全は期せられぬ。
-
-ですから、神様は一人でも多く助けられるんで、そのために観音運動は発展となるんであります。
-
-東方の光、すなわち太陽は一つしかない。
-
-太陽の光は観音会が照らすだけで、これ一つなんですから、観音会へ入らなければ陽に照らされぬから、掃除ができないことになっている。
-
-これは決して手前味噌ではない。そうなっているんであります。これが最後の審判であります。
-
-世の終わりは、夜の暗が終わるということで、今度は昼間の世界になる。
-
-ちょうどいまその境目になって来たから、一人でも多く観音会へ入れて、救い上げなければならない。
-
-それが観音運動の根本なんで、だいぶその時期が近づいてきたんであります。
-
-そしてちょうど、観音会の発展が、日が上へ昇って行くことになるんです。
-
-
-
-## 明主様御垂示　「御神体奉斎により豊作になる」　（昭和25年4月23日）
-
-「農作物がよく育たないっていうのはそこの霊界が曇ってるからなんです。
-
-悪い曇りって言うのは、つまり水素で冷たいんですから、そこの霊界が冷たいんですよ。
-
-所が、この浄霊は火素を放射するんですから霊界が暖かくなるんです。
-
-だから、光明如来様（註　御神体のこと）を御祀りするとそこの田地はずっとよく出来る様になるんですが、
-
-これは、光明如来様から光が放射されてその人の範囲だけ明るくなるんです、
-
-光は火素が多いんですから、光が沢山行くとあたたまるから、そこでよく出来るんです。
-
-それから虫とか黴菌なんかも火素にあうと、いろんな作物を災いする力が弱るんです。
-
-だからよく出来る、とそういう意味なんです。」
-
-
-
-## 明主様御講話　「御神体の光で田んぼが暖かくなる」　（昭和28年9月16日）
-
-「それで今言った「ここが高い」ということは私がいるからです。
-
-つまり私の光は熱ですから、霊界が暑いから、そういうわけで影響するのです。
-
-ですから信者の田が二度高いということは、やはり光明如来様から光が出ていることと、それから信者になると曇りが減るからして、それだけ霊に光が出るわけです。
-
-ですからそこの霊界が明るくなるとともに、温かくなるわけです。
-
-今年の信州辺りも非常な冷害でやられているそうですが、無論越後辺りもそうに違いありません。
-
-そうするとそこにいる人たちに愛が欠乏しているということになります。
-
-愛が少ないと、そこの気候が、気候といっても物質的の寒暖計で計るのより、霊の方の暑い寒いの方が影響がずっとはなはだしいのです。
-
-そこで霊界がつめたいために作物が冷害を受けるという理屈になります。
-
-ですから根本は霊界なのです。そこでそういう結果になるのです。」
-
-
-
-## 明主様御講話　「信者宅奉斎の御神体により田んぼが暖かくなる」　（昭和28年10月6日）
-
-「それからもう一つ、自然栽培が非常に良くできるということは、霊的のわけがあるのです。
-
-それは信者になって光明如来様をお祀りしますと、無論光が出ますが、その光がその人の田地内に漲（みなぎ）るのです。
-
-光が充満するのです。そこで光は熱ですから温かくなるのです。
-
-温かくなるといっても、ふつうの火のようにはっきりはしないが、なんとなく温かくなるのです。
-
-前に試験した人が、他人の田より二度温かいと言われましたが、とにかく温かいのです。
-
-その光がだんだん強くなってきました。私はいつも注意してますが、今日のここの温度は十六度です。
-
-東京が十六度、鹿児島と福岡が十四度ですから、鹿児島より高いのです。
-
-今日の全国で一番高いのが東京とここです。
-
-それで平均してみるとここは東京よりいくらか高いでしょう。
-
-高い日の方が多いです。
-
-というのは、私の光が強くなってきたので温かくなったので、それが体的にも温かさが現われるわけです。
-
-そういうわけですから、御神体から出る光も強いからして、どうしてもそこの田が温かくなり、そのために良くできるということも大いにあります。
-
-しかしそれをあんまり言うと、どうも信者にならないと良い成績が上がらない、
-
-というように思われると普及が遅れますから、それを未信者には言わない方がよいです。
-
-信者の人だけ心得ていればよいのです。
-
-そうして信者になったらその説明をしてやればよいので、そうでなければ入りにくいのです。
-
-そういうわけで、そこの囲いなら囲いのそこだけの霊界が違ってくるのです。
-
-それで隣が信者でないと、そこにはっきりと境界されるのです。
-
-ですからよく信者の田は良くできて、お隣はまるっきり違う、ということがあるのはそういうわけです。」
-
-
-
-## 明主様御垂示　「御神体奉斎で売春婦が次々逃げ出す」　（昭和23年12月18日）
-
-信者の質問
-「ある特殊料理屋（註　料理屋と売春宿をまぜた商売）で御軸（註　御神体のこと）をいただきお祀りいたしましたところ、
-
-接待婦が次々逃げてしまいます。いかがいたすべきでしょうか。」
-
-明主様御垂示
-「おっかないね。こいつは弱るな。
-
-観音様の絵か、ほかの意味の書をかけたらいいでしょう。」
-
-
-信者の質問
-「そこの娘がどこかよそへお祀りし直して教導所にしたいと申します。」
-
-明主様御垂示
-「それがいいでしょう。」
-
-
-
-## 参考　明主様御垂示　「地上天国の幻燈に観音様のお姿が出現した事例」　（昭和26年8月1日）
-
-信者の質問
-「地上天国の幻燈をお写しになられましたが、あれをお借りいたしまして、他の無肥料の写真、十国峠の景色と一緒に写しましたところ、
-
-地上天国のを写させていただきますと、観音様のお姿が拝されたというのでございます。
-
-他の無肥料や十国峠の景色には見えないそうです」
-
-
-明主様御垂示
-「別に不思議はないですがね。だから、ぜんぜん気分が違いますね。」
-
-
-
-## 体験談　福井地方震災田畑教導所関係会員一同御守護報告書　（地上天国　創刊号　昭和23年12月1日発行）
-
-岐阜県恵那郡中津町那須教導所支部
-
-福井県坂井郡東十郷村宮領田畑教導所　教導師　ＴＳ（男性）その他1名
-
-「穢埃極まりない福井の地に今度の大浄化、その洗礼のただ中に、この魂とこの手足を戴きました。
-
-洪大無辺なる御守護に感泣措くところを知らず。頭尖、足端にほとばしり湧く感謝と感激をまず以て捧げ申す私達で御座います。
-
-その日、私は丁度浄霊の帰途を国際劇場の階下中央にいましたが、晴天のヘきれき一瞬の大惨事でした。
-
-総立ちになった人々の群が、さっと入口の方へ殺到したかと思う間もなく、三階建の大建築がそれら千数百の観衆をもみつぶしてしまったのです。
-
-固定された椅子と建築材に挟まれ右腕を振りほどくすべもなく、力なくうなだれ、腹ばいに打ちのめされた自分を見出したのは、どれ程経ってからのことでしようか・・・それから後の無気味な静寂は生れてかつて味わったことがありません。
-
-その静寂の中で私は初めて（大光明如来守り給え）と御名を称号していたのです。
-
-ふと頭を挙げると実に不思議一寸も動かせなかった右腕がするりと抜けるではありませんか。
-
-そして全身にみなぎり来る精気のままもうもうたる壁煙の中を無我夢中で飛び出しました。
-
-私は途中何の障碍もありませんでしたが、火の手は眼前に迫っておりました。
-
-後で判明致しましたが、ここでの生存者は数える程しかなかったそうです。
-
-嗚呼この感激を如何にして愚筆に表わせ得ましょうか、回顧しますればかつて在台湾中の空襲の中でも九死に一生を得て来た私ではございますが、
-
-この度の惨劇の中で阿鼻叫喚する人々の間に混りて終始、自分は助かるという信念を持ちつつ行動出来たのは、本教団会員としてのみ処し得たものと思います。
-
-直ぐさま光明如来様のもとに馳せ参じましたが、ここでも一帯の凄惨をよそに拙宅では二階の浄霊部屋はガラス一枚の被害もなく二本の木によってあたかも御光を讃え示す如くあたりをはらっているのです。
-
-それから方々で浄霊の依頼を受けましたが、不思議に痛んでいる筈の右腕が浄霊の際は全然苦痛を感じないのであります。
-
-列車に乗っていて棟木を背に受けたまま埋もれて他人に我が子と間違えられて堀り出された者、かかと三寸の所に家屋の倒壊から免れた者、市営住宅に住んでいて会員の住む棟から倒壊を免がれた等々、会員に一名の負傷者もない奇びなる御救いの御業は枚挙にいとまなく一同蕭として声をのみ、ただ感涙に咽ぶのでございます。」
-
-
-
-## 体験談　地震に於ける御守護の実状　（地上天国　創刊号　昭和23年12月1日発行）
-
-福井市松本中町　ＯＨ（女性）
-
-「二十八日五時十分頃物凄いうなりと共に教導所の建物が三尺位東に動いたかと思うと、今度は西に三尺位戻り、上下に動き、渦巻にゆれ、壁は落ち始めた。
-
-勿論建具の開閉等思いもよらず自分等一家に観音様が御守護下さるから大丈夫だと云う信念は不思議に心を落着かせてくれました。
-
-それでいつも子供が道路で遊んでいる事を思い、表へ飛び出したが、み当らない、その時「救けて・・・」と呼ぶ家内の声がするので、無意識に家の中に取って返し子供と家内を両脇へ引抱え屋外に出た間一髪凄い音を立てながら右隣の二階が教導所に倒れて来た。
-
-一同前の空地に避難し互い無事なる事を喜び合い、尊い御守護を頂いた事を自ら観音様に御礼申上げました。
-
-地震がやや落着いた頃潰れ落ちた屋根下にもぐり込み、観音様光明如来様の御掛軸、大先生の御写真御額、御守等次ぎ次ぎ皆無事に運出する事が出来ました。
-
-ところが不思議にも観音様、光明如来様を御祭り申上げておりました床の間が荒壁のため床張紙の替りにしてあったところの山水静物画の軸物が、バラバラに破れ飛んでおるのにかかわらず、
-
-観音様、光明如来様は丁度最も取出しよいようにはずれており、大先生のお写真はガラスの破損のみで御額、御書体等はいずれも無きずのままなる事実をみて、自分初め信者一同異口同音、不思議な御守護に驚き、かつ観音様にお礼申上げました。
-
-倒壊した家屋と共々に当然落すべき生命を救われた自分達止むにやまれぬ感謝と歓びの情を代表し今日ここに復興のさきがけとして御礼をかね、御報告に参拝さしていただきました、と共に自分達の徳の足らざるをお詫び致し、今後の努力を誓うものであります。」
-
-
-
-## 体験談　光溢るる吾家　（地上天国　創刊号　昭和23年12月1日発行）
-
-愛媛県温泉郡浅海村　ＨＴ（男性）
-
-「私の家は以前には十人前後の家族を持っておりましたが、現在では八人の家族であります。
-
-私の少年時代から毎年病人が絶えず、収入のほとんどが、そのために費されていました。
-
-お金に幾分の余裕が出来たと思う頃になると大病人が出来てすっかり、それに費してしまうという有様でした。
-
-私が結婚したところの妻も、これまた病弱でありました。
-
-けれどもそう重い病気でもありませんでしたから、それだけがせめてもの慰めでありました。
-
-ところが六年前弟（小一）が胸を患い、とうとう亡くなりました。
-
-弟が入院していた時には、一度に四人もの病人を出して、全く途方にくれました。
-
-それからと云うものは、年々病人は絶えませんでした。
-
-そして昨年九月末には、父が六十三才胃癌で倒れました。
-
-それより以前弟（保）は北條の胡田先生の所で観音様の教修を受けておりました。
-
-亡くなった兄卓一と同じ胸を患っていた保は、医者に駄目だと言われましたのに、浄霊を受けて七ケ月目には全快致し、今では結婚し元気で毎日楽しく農業にいそしんでおります。
-
-その弟が胡田先生から「兄さんの家は曇があるから光明如来様の御書体をお受して家を浄めていただかなければ今後不幸せは絶えぬだろう」と言われ、私にその話をしてくれました。
-
-その当時私は体を害しておりましたので、その話を聞くと早速、二月十七日頃かと思いますが北條の先生の所でへお詣りしてお守り、光明如来様御書体をお受けして帰りました。
-
-ところが不思議なことが起りました。
-
-それは御書体をお床にお祭り申しますと同時に、何とも云い知れぬ良い香りが、座敷一杯にただよい急に家が明るくなったような気が致しました。
-
-翌日御書体を表具師の所へ持って行きました、けれども何とも言い知れぬ香りは、その後一週間ばかり続きました。
-
-驚きましてそのことを先生に申し上げますと、それは光明如来様がお出で下された証拠だと話されました。
-
-それで色々とお話をきいているうちに自分の家に不幸の続く訳や観音様が素晴しいお力をもって、世の中をお救い下さる有難い思召を知り得ました。
-
-そして三月には胡田先生に連れられて上京し、大先生に御面会させていただきました。
-
-それ以来家は明るく病気の心配もすっかりなくなり、家人は皆元気で朗らかな日々を送っております。
-
-本当に有難いことで毎日感謝致しております。
-
-この嬉しさ、有難さを世人に知らせるべく毎日観音様の御用をお手伝させていただいております。」
-"""
-
-with open(filename, "a") as f:
-    f.write(content)
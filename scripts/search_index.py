@@ -0,0 +1,205 @@
+import os
+import json
+import hashlib
+import unicodedata
+
+from shards import dump_compact
+
+# Full-text search index written by generate_json.py --search-index
+#
+# Layout (relative to the data directory):
+#   search/meta.json              shard count, shard file names and the doc table
+#   search/<sha256[:16]>.json     { gram: postings } for the grams hashed to that shard
+#
+# A doc is one publication; docs[doc_id] = [volumeIndex, themeIndex, titleIndex, pubIndex]
+# in the generated data (titleIndex counts '---' separators, as in theme.titles).
+# The indexed text is title + header + content, NFKC-normalized and lower-cased; every
+# character bigram that contains no whitespace is indexed, and so is every single non-whitespace
+# character, so one-character queries (common in CJK) have postings too.
+# Postings are the sorted doc ids of a gram, delta-encoded in base 36 and joined by ','.
+#
+# A bigram goes to shard (ord(a) * 31 + ord(b)) % shard_count, a single character to
+# ord(a) % shard_count, so a client only fetches the shards for the grams of its query
+# (iterate code points, not UTF-16 units, in JS). A query term of one character is looked up
+# as a unigram, longer terms by their bigrams.
+SEARCH_DIRNAME = "search"
+SEARCH_META_NAME = "meta.json"
+SEARCH_INDEX_VERSION = 2
+DEFAULT_SHARD_COUNT = 64
+
+def normalize_text(text):
+    return unicodedata.normalize('NFKC', text).lower()
+
+def text_bigrams(text):
+    """Returns the set of indexable bigrams of an already normalized text."""
+    return {a + b for a, b in zip(text, text[1:]) if not a.isspace() and not b.isspace()}
+
+def text_grams(text):
+    """Returns the indexable grams (bigrams and single characters) of an already normalized text."""
+    return text_bigrams(text) | {ch for ch in text if not ch.isspace()}
+
+def query_grams(query):
+    """Returns the grams to look up for a query: the character of one-character terms, the bigrams of the others."""
+    grams = set()
+    for term in normalize_text(query).split():
+        grams |= {term} if len(term) == 1 else text_bigrams(term)
+    return grams
+
+def gram_shard(gram, shard_count):
+    if len(gram) == 1:
+        return ord(gram) % shard_count
+    return (ord(gram[0]) * 31 + ord(gram[1])) % shard_count
+
+def to_base36(n):
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    if n == 0:
+        return '0'
+    out = []
+    while n:
+        n, r = divmod(n, 36)
+        out.append(digits[r])
+    return ''.join(reversed(out))
+
+# Deltas are almost always small: a lookup table avoids millions of to_base36 calls
+BASE36_TABLE = [to_base36(n) for n in range(36 ** 3)]
+
+def encode_postings(doc_ids):
+    # doc_ids are appended in increasing order while building
+    table = BASE36_TABLE
+    limit = len(table)
+    out = []
+    last = 0
+    for doc_id in doc_ids:
+        delta = doc_id - last
+        out.append(table[delta] if delta < limit else to_base36(delta))
+        last = doc_id
+    return ','.join(out)
+
+def build_search_index(data, shard_count=DEFAULT_SHARD_COUNT):
+    """
+    Builds the gram index for the generated data.
+    Returns (docs, postings) where postings maps gram -> [doc_id, ...] (ascending).
+    Identical bodies are tokenized once; only title and header are tokenized per publication.
+    """
+    docs = []
+    postings = {}
+    body_grams = {}
+
+    for v_idx, volume in enumerate(data):
+        for t_idx, theme in enumerate(volume["themes"]):
+            for ti_idx, title in enumerate(theme["titles"]):
+                if title["title"] == '---':
+                    continue
+
+                title_grams = text_grams(normalize_text(title["title"]))
+
+                for p_idx, pub in enumerate(title["publications"]):
+                    doc_id = len(docs)
+                    docs.append([v_idx, t_idx, ti_idx, p_idx])
+
+                    content = pub["content"]
+                    grams = body_grams.get(content)
+                    if grams is None:
+                        grams = text_grams(normalize_text(content))
+                        body_grams[content] = grams
+
+                    for gram in grams:
+                        doc_list = postings.get(gram)
+                        if doc_list is None:
+                            postings[gram] = [doc_id]
+                        else:
+                            doc_list.append(doc_id)
+
+                    # Title and header grams are few; skip the ones the body already posted
+                    for gram in title_grams | text_grams(normalize_text(pub["header"])):
+                        doc_list = postings.get(gram)
+                        if doc_list is None:
+                            postings[gram] = [doc_id]
+                        elif doc_list[-1] != doc_id:
+                            doc_list.append(doc_id)
+
+    return docs, postings
+
+def write_search_index(data, data_dir, shard_count=DEFAULT_SHARD_COUNT):
+    """
+    Writes search/meta.json and the postings shards under data_dir.
+    Shard files are content-addressed; unreferenced ones are removed.
+    """
+    docs, postings = build_search_index(data, shard_count)
+
+    shard_maps = [{} for _ in range(shard_count)]
+    for gram in sorted(postings):
+        shard_maps[gram_shard(gram, shard_count)][gram] = encode_postings(postings[gram])
+
+    search_dir = os.path.join(data_dir, SEARCH_DIRNAME)
+    os.makedirs(search_dir, exist_ok=True)
+
+    files = []
+    total_bytes = 0
+    for shard_map in shard_maps:
+        shard_text = dump_compact(shard_map)
+        digest = hashlib.sha256(shard_text.encode('utf-8')).hexdigest()[:16]
+        shard_name = f"{digest}.json"
+        files.append(f"{SEARCH_DIRNAME}/{shard_name}")
+
+        full_path = os.path.join(search_dir, shard_name)
+        if not os.path.exists(full_path):
+            with open(full_path, 'w', encoding='utf-8') as f:
+                f.write(shard_text)
+        total_bytes += len(shard_text.encode('utf-8'))
+
+    current = {os.path.basename(p) for p in files}
+    for filename in os.listdir(search_dir):
+        if filename.endswith('.json') and filename != SEARCH_META_NAME and filename not in current:
+            os.remove(os.path.join(search_dir, filename))
+
+    meta = {
+        "version": SEARCH_INDEX_VERSION,
+        "normalize": "NFKC+lower",
+        "shard_count": shard_count,
+        "files": files,
+        "docs": docs
+    }
+    meta_path = os.path.join(search_dir, SEARCH_META_NAME)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact(meta))
+
+    print(f"Search index generated at: {search_dir} "
+          f"({len(docs)} docs, {len(postings)} grams, {total_bytes // 1024} KB in {shard_count} shards)")
+    return meta
+
+def search(data_dir, query):
+    """
+    Returns the doc ids containing every gram of query (candidate set for a phrase match).
+    Reference implementation of the client lookup, used to check the index from Python.
+    """
+    with open(os.path.join(data_dir, SEARCH_DIRNAME, SEARCH_META_NAME), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+
+    grams = query_grams(query)
+    if not grams:
+        return []
+
+    result = None
+    loaded = {}
+    for gram in grams:
+        shard_idx = gram_shard(gram, meta["shard_count"])
+        if shard_idx not in loaded:
+            with open(os.path.join(data_dir, meta["files"][shard_idx]), 'r', encoding='utf-8') as f:
+                loaded[shard_idx] = json.load(f)
+
+        encoded = loaded[shard_idx].get(gram)
+        if not encoded:
+            return []
+
+        doc_ids = set()
+        doc_id = 0
+        for delta in encoded.split(','):
+            doc_id += int(delta, 36)
+            doc_ids.add(doc_id)
+
+        result = doc_ids if result is None else result & doc_ids
+        if not result:
+            return []
+
+    return sorted(result)
@@ -0,0 +1,156 @@
+import os
+import json
+import hashlib
+
+# Sharded output layout (relative to the data directory):
+#   catalog.json               volumes, themes, titles, title groups and per-publication content ids (no bodies)
+#   shards/<sha256[:16]>.json  publications of one theme, addressed by the hash of the shard itself
+#
+# A body is stored once: publications repeating the content of an earlier publication (same
+# content id, identical text) are written without "content"; the app takes it from the first
+# publication with that content id in catalog order, loading that shard if needed.
+CATALOG_NAME = "catalog.json"
+SHARDS_DIRNAME = "shards"
+CATALOG_VERSION = 3
+
+def dump_compact(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+def build_shards(data, cache=None):
+    """
+    Splits the generated data into a catalog and one content shard per theme.
+    Returns (catalog, {shard_relative_path: shard_json_text}).
+
+    Shard N holds, for every title of the theme (separators included), the full list of
+    publications (repeated bodies left out), so catalog titles and shard entries line up by position.
+    Each catalog title carries "content_ids": one id per publication, shared by identical
+    bodies (null for empty ones), which lets the app count unique articles without content.
+
+    cache (watch.py) keeps the serialized shard of each theme object between calls: a theme
+    that is the same object, with the same repeated bodies left out, is not serialized again.
+    """
+    content_ids = {}
+    canonical_bodies = {}   # content id -> content of its first publication
+    shards = {}
+    counts = {"volumes": 0, "themes": 0, "titles": 0, "publications": 0}
+    catalog_volumes = []
+
+    for volume in data:
+        catalog_themes = []
+
+        for theme in volume["themes"]:
+            catalog_titles = []
+            shard_titles = []
+            omitted = []   # (title index, publication index) of the repeated bodies left out
+
+            for title_index, title in enumerate(theme["titles"]):
+                ids = []
+                shard_pubs = []
+                for pub in title["publications"]:
+                    body = pub["content"].strip()
+                    if not body:
+                        ids.append(None)
+                        shard_pubs.append(pub)
+                        continue
+
+                    content_id = content_ids.setdefault(body, len(content_ids))
+                    ids.append(content_id)
+                    canonical = canonical_bodies.get(content_id)
+                    if canonical is None:
+                        canonical_bodies[content_id] = pub["content"]
+                        shard_pubs.append(pub)
+                    elif canonical == pub["content"]:
+                        shard_pubs.append({k: v for k, v in pub.items() if k != "content"})
+                        omitted.append((title_index, len(shard_pubs) - 1))
+                    else:
+                        shard_pubs.append(pub)
+
+                catalog_title = {
+                    "title": title["title"],
+                    "content_ids": ids
+                }
+                if "origin_filename" in title:
+                    catalog_title["origin_filename"] = title["origin_filename"]
+
+                catalog_titles.append(catalog_title)
+                shard_titles.append(shard_pubs)
+
+                if title["title"] != '---':
+                    counts["titles"] += 1
+                    counts["publications"] += len(ids)
+
+            cached = cache.get(id(theme)) if cache is not None else None
+            if cached is not None and cached[0] is theme and cached[1] == omitted:
+                shard_path, shard_text = cached[2], cached[3]
+            else:
+                shard_text = dump_compact({"theme": theme["theme"], "titles": shard_titles})
+                digest = hashlib.sha256(shard_text.encode('utf-8')).hexdigest()[:16]
+                shard_path = f"{SHARDS_DIRNAME}/{digest}.json"
+                if cache is not None:
+                    cache[id(theme)] = (theme, omitted, shard_path, shard_text)
+            shards[shard_path] = shard_text
+
+            catalog_theme = {
+                "theme": theme["theme"],
+                "shard": shard_path,
+                "titles": catalog_titles,
+                "groups": theme["groups"]
+            }
+            if "html" in theme:
+                catalog_theme["html"] = theme["html"]
+            catalog_themes.append(catalog_theme)
+            counts["themes"] += 1
+
+        catalog_volumes.append({
+            "volume": volume["volume"],
+            "themes": catalog_themes
+        })
+        counts["volumes"] += 1
+
+    if cache is not None:
+        # Drop the themes replaced since the previous call
+        current = {id(theme) for volume in data for theme in volume["themes"]}
+        for key in set(cache) - current:
+            del cache[key]
+
+    counts["articles"] = len(content_ids)
+
+    catalog = {
+        "version": CATALOG_VERSION,
+        "counts": counts,
+        "volumes": catalog_volumes
+    }
+    return catalog, shards
+
+def write_sharded_output(data, data_dir, cache=None):
+    """
+    Writes catalog.json and the theme shards under data_dir.
+    Shards are content-addressed, so unchanged themes keep their file name (and HTTP cache);
+    shard files no longer referenced by the catalog are removed.
+    """
+    catalog, shards = build_shards(data, cache)
+
+    shards_dir = os.path.join(data_dir, SHARDS_DIRNAME)
+    os.makedirs(shards_dir, exist_ok=True)
+
+    written = 0
+    for shard_path, shard_text in shards.items():
+        full_path = os.path.join(data_dir, shard_path)
+        if os.path.exists(full_path):
+            continue
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(shard_text)
+        written += 1
+
+    current = {os.path.basename(p) for p in shards}
+    for filename in os.listdir(shards_dir):
+        if filename.endswith('.json') and filename not in current:
+            os.remove(os.path.join(shards_dir, filename))
+
+    catalog_path = os.path.join(data_dir, CATALOG_NAME)
+    with open(catalog_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact(catalog))
+
+    print(f"Catalog generated at: {catalog_path} ({os.path.getsize(catalog_path) // 1024} KB)")
+    print(f"Shards: {len(shards)} total, {written} written")
+    return catalog
@@ -1,6 +1,20 @@
 import os
 import re
+import sys
 import glob
+import argparse
+
+import paths
+
+BASE_DIR = paths.MARKDOWN_DIR
+# Folders processed when no directory is given
+DEFAULT_DIRS = [
+    "2.浄霊・神示の健康法・自然農法編",
+    "3.信仰編",
+    "4.その他",
+]
+
+H1_PATTERN = re.compile(r'^#\s+')
 
 def get_base_title(title):
     # Remove H1 marker
@@ -15,132 +29,160 @@ def get_base_title(title):
     # Let's keep "について" for now as it usually persists in the series.
     return base
 
-def process_file(filepath):
-    print(f"Processing {filepath}...")
-    with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-
-    sections = []
-    current_section = []
-    current_title = ""
-    
-    # Identify boundaries
-    for line in lines:
-        if re.match(r'^#\s+', line):
-            if current_section:
-                sections.append({'title': current_title, 'lines': current_section})
-            current_section = [line]
-            current_title = line.strip()
+def split_names(filepath):
+    """Returns (prefix_num, core_name) used to name the "_NN_edited.md" parts."""
+    basename = os.path.basename(filepath)
+    # Expected basename: "Number - Name_edited.md" or "Name_edited.md"
+    # We want "Number - Name_01_edited.md"
+    match = re.match(r'^(\d+)\s*-\s*(.*)_edited\.md$', basename)
+    if match:
+        return match.group(1), match.group(2)
+    # Fallback
+    return "0", basename.replace('_edited.md', '')
+
+def iter_group_lines(f):
+    """
+    Yields (group_index, base_title, line) for every line of f.
+    A section starts at each H1 (lines before the first H1 form a section titled "");
+    consecutive sections with the same base title belong to the same group.
+    """
+    group_index = -1
+    last_base = None
+
+    for line in f:
+        if H1_PATTERN.match(line):
+            this_base = get_base_title(line.strip())
+        elif group_index < 0:
+            this_base = get_base_title("")
         else:
-            current_section.append(line)
-    
-    if current_section:
-        sections.append({'title': current_title, 'lines': current_section})
+            yield group_index, last_base, line
+            continue
 
-    if not sections:
+        if group_index < 0 or this_base != last_base:
+            group_index += 1
+            last_base = this_base
+        yield group_index, last_base, line
+
+def count_groups(filepath, limit=None):
+    """Number of groups in filepath; stops reading once limit groups are found."""
+    count = 0
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for group_index, _, _ in iter_group_lines(f):
+            count = group_index + 1
+            if limit is not None and count >= limit:
+                break
+    return count
+
+def process_file(filepath, check=False):
+    """
+    Splits filepath into one "_NN_edited.md" file per group, streaming line by line:
+    each part is written while it is read and closed as soon as its group ends.
+    A file with a single group is left alone before anything is written (a first pass
+    stops at the second group), so re-running over split corpora writes nothing.
+    Parts go to hidden temp files first and are renamed into place once all are written.
+    With check=True nothing is written.
+    Returns the number of groups written (0 when the file is left as is).
+    """
+    print(f"Processing {filepath}...")
+
+    groups = count_groups(filepath, limit=2)
+    if groups == 0:
         print("No sections found.")
-        return
-
-    # Group sections
-    groups = []
-    if sections:
-        current_group = [sections[0]]
-        last_base = get_base_title(sections[0]['title'])
-        
-        for i in range(1, len(sections)):
-            sec = sections[i]
-            this_base = get_base_title(sec['title'])
-            
-            # Logic: If base title is same or very similar, keep in group.
-            # Also handle the case where title changes slightly but logic implies group?
-            # E.g. "浄霊の原理　１" -> "浄霊の原理 ２" (Base: 浄霊の原理) -> Match
-            # "浄霊の原理について　１" (Base: 浄霊の原理について) -> Mismatch with "浄霊の原理"
-            # But maybe we want them separate if they are different series?
-            # Yes, "浄霊の原理" and "浄霊の原理について" might be distinct series.
-            
-            if this_base == last_base:
-                current_group.append(sec)
-            else:
-                groups.append(current_group)
-                current_group = [sec]
-                last_base = this_base
-        
-        groups.append(current_group)
-
-    if len(groups) <= 1:
+        return 0
+    if groups == 1:
         print(f"File {filepath} contains only 1 group. No need to split (or already split).")
-        # However, if the file is HUGE and has 1 group? Unlikely if base title is identical.
-        # But if the file was named "Theme_edited.md" and we want "Theme_01_edited.md", we should rename it.
-        # For now, only split if > 1 group.
-        return
+        return 0
 
-    # Write groups
     dirname = os.path.dirname(filepath)
-    basename = os.path.basename(filepath)
-    # Expected basename: "Number - Name_edited.md" or "Name_edited.md"
-    # We want "Number - Name_01_edited.md"
-    
-    # Extract prefix number if present
-    # Regex for "1 - Name_edited.md"
-    match = re.match(r'^(\d+)\s*-\s*(.*)_edited\.md$', basename)
-    if match:
-        prefix_num = match.group(1)
-        core_name = match.group(2)
-    else:
-        # Fallback
-        prefix_num = "0"
-        core_name = basename.replace('_edited.md', '')
-
-    print(f"Found {len(groups)} groups.")
-    
-    for idx, group in enumerate(groups):
-        suffix = f"{idx+1:02d}"
-        new_filename = f"{prefix_num} - {core_name}_{suffix}_edited.md"
-        new_path = os.path.join(dirname, new_filename)
-        
-        print(f"Writing {new_filename}...")
-        with open(new_path, 'w', encoding='utf-8') as f:
-            for sec in group:
-                f.writelines(sec['lines'])
+    prefix_num, core_name = split_names(filepath)
+
+    parts = []   # (tmp_path, final_path, base_title)
+    out = None
+    current = -1
+
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for group_index, base_title, line in iter_group_lines(f):
+                if group_index != current:
+                    current = group_index
+                    new_filename = f"{prefix_num} - {core_name}_{group_index + 1:02d}_edited.md"
+                    final_path = os.path.join(dirname, new_filename)
+                    tmp_path = os.path.join(dirname, f".{new_filename}.tmp")
+                    parts.append((tmp_path, final_path, base_title))
+
+                    if not check:
+                        if out:
+                            out.close()
+                        out = open(tmp_path, 'w', encoding='utf-8')
+
+                if out:
+                    out.write(line)
+    except BaseException:
+        if out:
+            out.close()
+        for tmp_path, _, _ in parts:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+    if out:
+        out.close()
+
+    print(f"Found {len(parts)} groups.")
+
+    if check:
+        for _, final_path, base_title in parts:
+            print(f"  would write {os.path.basename(final_path)}  ({base_title or '(preamble)'})")
+        return len(parts)
+
+    for tmp_path, final_path, _ in parts:
+        print(f"Writing {os.path.basename(final_path)}...")
+        os.replace(tmp_path, final_path)
 
     # Rename original to .bak
     os.rename(filepath, filepath + ".bak")
     print(f"Renamed original to {filepath}.bak")
+    return len(parts)
 
-def main():
-    # Folder 2
-    target_dir = "/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown/2.浄霊・神示の健康法・自然農法編"
-    # Specific files to split
-    # files_to_check = glob.glob(os.path.join(target_dir, "*_edited.md"))
-    # We only want to process the monolithic ones.
-    # Exclude those that already have "_01_", "_02_" in name?
+def find_monolithic_files(target_dir):
     # Monolithic pattern: "Number - Name_edited.md"
-    # Split pattern: "Number - Name_XX_edited.md"
-    
-    files = glob.glob(os.path.join(target_dir, "*_edited.md"))
-    for f in files:
-        if re.search(r'_\d{2}_edited\.md$', f):
-            continue # Already split
-        
-        # Check size or content? Just process it.
-        # If it has only 1 group, process_file returns without doing anything.
-        process_file(f)
-
-    # Folder 3
-    target_dir_3 = "/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown/3.信仰編"
-    files_3 = glob.glob(os.path.join(target_dir_3, "*_edited.md"))
-    for f in files_3:
-        if re.search(r'_\d{2}_edited\.md$', f):
-            continue
-        process_file(f)
+    # Split pattern: "Number - Name_XX_edited.md" (already split, skipped)
+    files = sorted(glob.glob(os.path.join(target_dir, "*_edited.md")))
+    return [f for f in files if not re.search(r'_\d{2}_edited\.md$', f)]
+
+def add_arguments(parser):
+    parser.add_argument('dirs', nargs='*',
+                        help="Directories to process (default: the volume folders in DEFAULT_DIRS under BASE_DIR)")
+    parser.add_argument('--check', action='store_true',
+                        help="Only report which files would be split; exit with status 1 if any")
 
-    # Folder 4
-    target_dir_4 = "/Users/michael/Documents/Ensinamentos/ShinCollege/Markdown/4.その他"
-    files_4 = glob.glob(os.path.join(target_dir_4, "*_edited.md"))
-    for f in files_4:
-        if re.search(r'_\d{2}_edited\.md$', f):
+def split_dirs(target_dirs, check=False):
+    """Splits (or with check, reports) the monolithic files in target_dirs. Returns their count."""
+    would_split = 0
+    for target_dir in target_dirs:
+        if not os.path.isdir(target_dir):
+            print(f"Skipping {target_dir}: not a directory")
             continue
-        process_file(f)
+        for f in find_monolithic_files(target_dir):
+            # If it has only 1 group, process_file returns before writing anything.
+            if process_file(f, check=check):
+                would_split += 1
+
+    if check:
+        print(f"{would_split} file(s) would be split.")
+    return would_split
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Split monolithic theme files into one file per title group")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    target_dirs = args.dirs or [os.path.join(BASE_DIR, d) for d in DEFAULT_DIRS]
+    would_split = split_dirs(target_dirs, args.check)
+
+    if args.check:
+        return 1 if would_split else 0
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
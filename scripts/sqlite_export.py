@@ -0,0 +1,244 @@
+import sys
+import sqlite3
+import hashlib
+import argparse
+
+# SQLite export written by generate_json.py --sqlite (data/shin_college_data.sqlite)
+#
+# Tables mirror the JSON tree; positions are the indices in the JSON lists ('---'
+# separators are not stored but still count, so titles.position == titleIndex):
+#   volumes(id, name, position)
+#   themes(id, volume_id, name, position)
+#   titles(id, theme_id, position, title, origin_filename)
+#   publications(id, title_id, position, header, source, publication_title, date, type, content, content_hash)
+#   publications_fts  FTS5 over header and content (trigram tokenizer), kept in sync by triggers
+#   publication_view  publications joined with their volume/theme/title names
+#
+# Re-exporting into an existing database upserts by natural key (volume name, theme name,
+# title/publication position): unchanged rows are not touched, so the FTS index is only
+# updated for publications whose header or content changed.
+#
+# Example: every 御垂示 mentioning 浄霊 in 昭和24年
+#   python sqlite_export.py data/shin_college_data.sqlite 浄霊 --source 御垂示 --date 昭和24年
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS volumes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS themes (
+    id INTEGER PRIMARY KEY,
+    volume_id INTEGER NOT NULL REFERENCES volumes(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    UNIQUE (volume_id, name)
+);
+CREATE TABLE IF NOT EXISTS titles (
+    id INTEGER PRIMARY KEY,
+    theme_id INTEGER NOT NULL REFERENCES themes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    origin_filename TEXT,
+    UNIQUE (theme_id, position)
+);
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    title_id INTEGER NOT NULL REFERENCES titles(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    header TEXT NOT NULL,
+    source TEXT NOT NULL,
+    publication_title TEXT NOT NULL,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    content TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    UNIQUE (title_id, position)
+);
+CREATE INDEX IF NOT EXISTS publications_source ON publications(source);
+CREATE INDEX IF NOT EXISTS publications_date ON publications(date);
+CREATE INDEX IF NOT EXISTS publications_content_hash ON publications(content_hash);
+
+CREATE VIEW IF NOT EXISTS publication_view AS
+SELECT p.id, v.name AS volume, th.name AS theme, t.title, p.position,
+       p.header, p.source, p.publication_title, p.date, p.type, p.content
+FROM publications p
+JOIN titles t ON t.id = p.title_id
+JOIN themes th ON th.id = t.theme_id
+JOIN volumes v ON v.id = th.volume_id;
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS publications_fts USING fts5(
+    header, content, content='publications', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS publications_ai AFTER INSERT ON publications BEGIN
+    INSERT INTO publications_fts(rowid, header, content) VALUES (new.id, new.header, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS publications_ad AFTER DELETE ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, header, content) VALUES ('delete', old.id, old.header, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS publications_au AFTER UPDATE ON publications BEGIN
+    INSERT INTO publications_fts(publications_fts, rowid, header, content) VALUES ('delete', old.id, old.header, old.content);
+    INSERT INTO publications_fts(rowid, header, content) VALUES (new.id, new.header, new.content);
+END;
+"""
+
+def connect(path):
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    return conn
+
+def create_schema(conn):
+    conn.executescript(SCHEMA)
+    try:
+        conn.executescript(FTS_SCHEMA)
+    except sqlite3.OperationalError as e:
+        # The trigram tokenizer needs SQLite >= 3.34 built with FTS5
+        print(f"Warning: full-text index not created ({e}); SQLite {sqlite3.sqlite_version}")
+
+def _upsert_id(conn, insert_sql, insert_args, select_sql, select_args):
+    conn.execute(insert_sql, insert_args)
+    return conn.execute(select_sql, select_args).fetchone()[0]
+
+def export_sqlite(data, path):
+    """Creates or incrementally updates the SQLite database at path from the generated data."""
+    conn = connect(path)
+    try:
+        create_schema(conn)
+        changes_before = conn.total_changes
+
+        with conn:
+            volume_names = []
+            for v_pos, volume in enumerate(data):
+                volume_names.append(volume["volume"])
+                volume_id = _upsert_id(
+                    conn,
+                    "INSERT INTO volumes(name, position) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET position = excluded.position "
+                    "WHERE position IS NOT excluded.position",
+                    (volume["volume"], v_pos),
+                    "SELECT id FROM volumes WHERE name = ?", (volume["volume"],))
+
+                theme_names = []
+                for t_pos, theme in enumerate(volume["themes"]):
+                    theme_names.append(theme["theme"])
+                    theme_id = _upsert_id(
+                        conn,
+                        "INSERT INTO themes(volume_id, name, position) VALUES (?, ?, ?) "
+                        "ON CONFLICT(volume_id, name) DO UPDATE SET position = excluded.position "
+                        "WHERE position IS NOT excluded.position",
+                        (volume_id, theme["theme"], t_pos),
+                        "SELECT id FROM themes WHERE volume_id = ? AND name = ?", (volume_id, theme["theme"]))
+
+                    export_theme_titles(conn, theme_id, theme["titles"])
+
+                conn.execute(
+                    f"DELETE FROM themes WHERE volume_id = ? AND name NOT IN ({','.join('?' * len(theme_names))})",
+                    (volume_id, *theme_names))
+
+            conn.execute(f"DELETE FROM volumes WHERE name NOT IN ({','.join('?' * len(volume_names))})",
+                         volume_names)
+
+        changes = conn.total_changes - changes_before
+    finally:
+        conn.close()
+
+    print(f"SQLite database generated at: {path} ({changes} row changes)")
+
+def export_theme_titles(conn, theme_id, titles):
+    positions = []
+    for ti_pos, title in enumerate(titles):
+        if title["title"] == '---':
+            continue
+        positions.append(ti_pos)
+
+        title_id = _upsert_id(
+            conn,
+            "INSERT INTO titles(theme_id, position, title, origin_filename) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(theme_id, position) DO UPDATE SET title = excluded.title, "
+            "origin_filename = excluded.origin_filename "
+            "WHERE title IS NOT excluded.title OR origin_filename IS NOT excluded.origin_filename",
+            (theme_id, ti_pos, title["title"], title.get("origin_filename")),
+            "SELECT id FROM titles WHERE theme_id = ? AND position = ?", (theme_id, ti_pos))
+
+        rows = []
+        for p_pos, pub in enumerate(title["publications"]):
+            content_hash = hashlib.sha1(pub["content"].encode('utf-8')).hexdigest()
+            rows.append((title_id, p_pos, pub["header"], pub["source"], pub["publication_title"],
+                         pub["date"], pub["type"], pub["content"], content_hash))
+
+        conn.executemany(
+            "INSERT INTO publications(title_id, position, header, source, publication_title, date, type, "
+            "content, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(title_id, position) DO UPDATE SET header = excluded.header, source = excluded.source, "
+            "publication_title = excluded.publication_title, date = excluded.date, type = excluded.type, "
+            "content = excluded.content, content_hash = excluded.content_hash "
+            "WHERE header IS NOT excluded.header OR source IS NOT excluded.source "
+            "OR publication_title IS NOT excluded.publication_title OR date IS NOT excluded.date "
+            "OR type IS NOT excluded.type OR content_hash IS NOT excluded.content_hash",
+            rows)
+        conn.execute("DELETE FROM publications WHERE title_id = ? AND position >= ?", (title_id, len(rows)))
+
+    if positions:
+        conn.execute(f"DELETE FROM titles WHERE theme_id = ? AND position NOT IN ({','.join('?' * len(positions))})",
+                     (theme_id, *positions))
+    else:
+        conn.execute("DELETE FROM titles WHERE theme_id = ?", (theme_id,))
+
+def has_fts(conn):
+    """Whether the full-text index exists (create_schema skips it without FTS5 trigram support)."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'publications_fts'").fetchone() is not None
+
+def search_publications(conn, text=None, source=None, date=None, limit=50):
+    """
+    Publications whose header or content contains text, optionally filtered by source and
+    date substrings. Uses the trigram index for terms of 3+ characters; shorter terms, and
+    databases created without the index, fall back to a LIKE scan.
+    """
+    sql = "SELECT v.id, v.volume, v.theme, v.title, v.header FROM publication_view v"
+    where = []
+    args = []
+
+    if text:
+        if len(text) >= 3 and has_fts(conn):
+            sql += " JOIN publications_fts f ON f.rowid = v.id"
+            where.append("publications_fts MATCH ?")
+            args.append('"' + text.replace('"', '""') + '"')
+        else:
+            where.append("(v.content LIKE ? OR v.header LIKE ?)")
+            args += [f"%{text}%", f"%{text}%"]
+    if source:
+        where.append("v.source LIKE ?")
+        args.append(f"%{source}%")
+    if date:
+        where.append("v.date LIKE ?")
+        args.append(f"%{date}%")
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY v.id LIMIT ?"
+    args.append(limit)
+    return conn.execute(sql, args).fetchall()
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the SQLite export")
+    parser.add_argument('database')
+    parser.add_argument('text', nargs='?', help="Text to find in header or content")
+    parser.add_argument('--source', help="Substring of the source (e.g. 御垂示)")
+    parser.add_argument('--date', help="Substring of the date (e.g. 昭和24年)")
+    parser.add_argument('--limit', type=int, default=50)
+    args = parser.parse_args()
+
+    conn = connect(args.database)
+    try:
+        for pub_id, volume, theme, title, header in search_publications(
+                conn, args.text, args.source, args.date, args.limit):
+            print(f"{pub_id}\t{volume} / {theme} / {title}\t{header}")
+    finally:
+        conn.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+import os
+import re
+import hashlib
+
+from shards import dump_compact
+
+# Stable ids for deep links and history, written by generate_json.py --ids (data/ids.json).
+#
+# Ids are hierarchical, "<volume>/<theme>/<group>/<publication>", and derived from names rather
+# than positions or bodies, so they survive reordering and renumbering of the source files and
+# editorial fixes of the text:
+#   volume       volume name without its "N." order prefix
+#   theme        theme name
+#   group        base title (the "id" of theme["groups"], see title_groups.py)
+#   publication  header; the body is only added to the key when several publications of the group
+#                share a header, and a "-2", "-3"... suffix (in order) when they share the body too
+# Each part only has to be unique among its siblings. Resolution does not depend on the order of
+# the siblings (unique_ids): an id is the sha1 of its key cut at the usual length, longer only when
+# another key of the siblings shares that prefix, so adding or moving a publication never changes
+# the id of another (short of a prefix collision with it).
+#
+# ids.json:
+#   {"version", "ids": {id: location, ...}}
+# with locations [v] for volumes, [v, t] for themes, [v, t, g] for groups (index into
+# theme["groups"]) and [v, t, ti, p] for publications (ti counts '---' separators, as in theme.titles).
+# The app resolves a deep link (#/<id>) or a history entry with one lookup.
+IDS_NAME = "ids.json"
+IDS_VERSION = 2
+
+VOLUME_ID_CHARS = 4
+THEME_ID_CHARS = 6
+PUBLICATION_ID_CHARS = 6
+
+VOLUME_ORDER_RE = re.compile(r'^\d+\.')
+
+def common_prefix_length(a, b):
+    n = 0
+    while n < len(a) and n < len(b) and a[n] == b[n]:
+        n += 1
+    return n
+
+def unique_ids(keys, length):
+    """
+    Ids of a list of sibling keys: each key's sha1, cut at `length` hex characters or at the first
+    character that tells it apart from every other distinct key (its sorted neighbours), so the
+    result does not depend on the order of keys. A repeated key gets "-2", "-3"... in list order.
+    """
+    digests = {key: hashlib.sha1(key.encode('utf-8')).hexdigest() for key in keys}
+    ordered = sorted(set(digests.values()))
+    sizes = {}
+    for i, digest in enumerate(ordered):
+        size = length
+        for j in (i - 1, i + 1):
+            if 0 <= j < len(ordered):
+                size = max(size, common_prefix_length(digest, ordered[j]) + 1)
+        sizes[digest] = size
+
+    ids = []
+    seen = {}
+    for key in keys:
+        seen[key] = seen.get(key, 0) + 1
+        base = digests[key][:sizes[digests[key]]]
+        ids.append(base if seen[key] == 1 else f"{base}-{seen[key]}")
+    return ids
+
+def publication_keys(pubs):
+    """Header of each publication, with the body added for headers repeated within the group."""
+    header_counts = {}
+    for pub in pubs:
+        header_counts[pub["header"]] = header_counts.get(pub["header"], 0) + 1
+    return [pub["header"] if header_counts[pub["header"]] == 1 else pub["header"] + "\n" + pub["content"]
+            for pub in pubs]
+
+def build_id_index(data):
+    ids = {}
+    volume_ids = unique_ids([VOLUME_ORDER_RE.sub('', volume["volume"]).strip() for volume in data], VOLUME_ID_CHARS)
+    for v, volume in enumerate(data):
+        volume_id = volume_ids[v]
+        ids[volume_id] = [v]
+
+        theme_ids = unique_ids([theme["theme"] for theme in volume["themes"]], THEME_ID_CHARS)
+        for t, theme in enumerate(volume["themes"]):
+            theme_id = f"{volume_id}/{theme_ids[t]}"
+            ids[theme_id] = [v, t]
+
+            for g, group in enumerate(theme["groups"]):
+                if "id" not in group:
+                    continue   # separator
+                group_id = f"{theme_id}/{group['id']}"
+                ids[group_id] = [v, t, g]
+
+                locations = [(ti, p) for ti in group["titles"]
+                             for p in range(len(theme["titles"][ti]["publications"]))]
+                pubs = [theme["titles"][ti]["publications"][p] for ti, p in locations]
+                for (ti, p), pub_id in zip(locations, unique_ids(publication_keys(pubs), PUBLICATION_ID_CHARS)):
+                    ids[f"{group_id}/{pub_id}"] = [v, t, ti, p]
+    return ids
+
+def write_id_index(data, data_dir):
+    ids = build_id_index(data)
+    path = os.path.join(data_dir, IDS_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(dump_compact({"version": IDS_VERSION, "ids": ids}))
+    os.replace(tmp_path, path)
+
+    print(f"Id index generated at: {path} ({len(ids)} ids, {os.path.getsize(path) // 1024} KB)")
+    return ids
@@ -0,0 +1,47 @@
+import re
+
+from stable_ids import unique_ids
+
+# Title groups of a theme, written by the build into every theme entry ("groups") and catalog theme.
+# Numbered parts of a series ("浄霊の原理　１", "浄霊の原理　２") are shown as one title; the app
+# lists theme["groups"] as is instead of regrouping the titles on each view.
+#
+#   {"id": <stable id>, "title": <base title>, "titles": [titleIndex, ...]}   a group
+#   {"title": "---", "titles": [titleIndex]}                                  a file separator
+#
+# Groups are in order of first appearance; a later part joins its group even across separators
+# (as split_markdown_groups.get_base_title, minus the H1 marker handling: titles are already clean).
+# The id only depends on the base title (stable_ids.unique_ids), so it survives reordering of the
+# source files; it is unique within its theme.
+SEPARATOR_TITLE = '---'
+GROUP_ID_CHARS = 8
+
+TRAILING_NUMBER_RE = re.compile(r'[　\s]*[0-9０-９１-９]+\s*$')
+
+def base_title(title):
+    return TRAILING_NUMBER_RE.sub('', title).strip()
+
+def build_title_groups(titles):
+    # A theme with separators only has nothing to show
+    if not any(title["title"] != SEPARATOR_TITLE and title.get("publications") for title in titles):
+        return []
+
+    groups = []
+    by_base = {}
+    for index, title in enumerate(titles):
+        if title["title"] == SEPARATOR_TITLE:
+            groups.append({"title": SEPARATOR_TITLE, "titles": [index]})
+            continue
+        if not title.get("publications"):
+            continue
+
+        base = base_title(title["title"])
+        group = by_base.get(base)
+        if group is None:
+            group = by_base[base] = {"id": None, "title": base, "titles": []}
+            groups.append(group)
+        group["titles"].append(index)
+
+    for group, group_id in zip(by_base.values(), unique_ids(list(by_base), GROUP_ID_CHARS)):
+        group["id"] = group_id
+    return groups
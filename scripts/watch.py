@@ -0,0 +1,184 @@
+import os
+import sys
+import time
+import argparse
+
+import paths
+import generate_json
+from generate_json import list_volumes, collect_theme_files, parse_file, build_theme_entries
+from shards import write_sharded_output
+from stable_ids import write_id_index
+from html_renderer import write_html_fragments
+from data_manifest import served_outputs, write_data_manifest
+from compress_artifacts import remove_compressed
+from dev_server import start_dev_server, notify_reload
+
+# Watch mode: rebuilds the sharded output (catalog.json + theme shards) whenever a Markdown file
+# changes, and tells the pages opened on the dev server to reload.
+#
+# The corpus stays in memory between rebuilds: parsed titles per file (keyed by mtime and size)
+# and theme entries per theme (keyed by its files), so a save re-parses one file and rebuilds
+# one theme; the other themes are not serialized again (shards.build_shards cache) and their
+# content-addressed shard files are left untouched.
+# Changes are found by polling (portable, and cheap for a few hundred files); a burst of
+# events (editors saving through a temp file, a split writing several parts) is debounced
+# until the tree has been stable for DEBOUNCE_SECONDS.
+#
+# Output goes to its own directory (paths.DEV_DATA_DIR, --dev-data-dir), which the dev server
+# serves as /data/: the published data directory, whose search index, duplicates and chronology
+# would no longer match the rebuilt shards, is never touched. The monolithic JSON, search index
+# and other outputs are not written while watching: run a full generate_json.py build before publishing.
+POLL_INTERVAL = 0.1
+DEBOUNCE_SECONDS = 0.15
+
+def snapshot():
+    """{path: (mtime_ns, size)} of the Markdown files of every volume."""
+    files = {}
+    for _, volume_path in list_volumes():
+        with os.scandir(volume_path) as entries:
+            for entry in entries:
+                if entry.name.endswith('.md') and not entry.name.startswith('.') and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+def new_corpus():
+    # files: path -> ((mtime_ns, size), titles); themes: (volume, theme_order) -> (signature, theme entries)
+    # shards: serialized shard per theme entry (shards.build_shards cache)
+    return {"files": {}, "themes": {}, "shards": {}}
+
+def rebuild(corpus):
+    """
+    Returns (data, parsed filenames, rebuilt theme names), reusing what did not change.
+    The data is the same as generate_json.build_data().
+    """
+    data = []
+    parsed = []
+    rebuilt = []
+    seen_files = set()
+    seen_themes = set()
+
+    for volume_name, volume_path in list_volumes():
+        themes_map = {}
+
+        for theme_order, theme_name, filename in collect_theme_files(volume_path):
+            file_path = os.path.join(volume_path, filename)
+            st = os.stat(file_path)
+            stat = (st.st_mtime_ns, st.st_size)
+
+            cached = corpus["files"].get(file_path)
+            if cached is None or cached[0] != stat:
+                cached = corpus["files"][file_path] = (stat, parse_file(file_path, filename))
+                parsed.append(filename)
+            seen_files.add(file_path)
+
+            theme = themes_map.setdefault(theme_order, {"name": theme_name, "titles": [], "files": []})
+            theme["titles"].extend(cached[1])
+            theme["files"].append((file_path, stat))
+
+        volume_data = {
+            "volume": volume_name,
+            "themes": []
+        }
+        for theme_order in sorted(themes_map):
+            theme = themes_map[theme_order]
+            key = (volume_name, theme_order)
+            signature = (theme["name"], tuple(theme["files"]))
+            seen_themes.add(key)
+
+            cached = corpus["themes"].get(key)
+            if cached is None or cached[0] != signature:
+                entries = build_theme_entries({theme_order: theme})
+                cached = corpus["themes"][key] = (signature, entries)
+                rebuilt.append(theme["name"])
+            volume_data["themes"].extend(cached[1])
+
+        data.append(volume_data)
+
+    # Forget deleted files and themes
+    for path in set(corpus["files"]) - seen_files:
+        del corpus["files"][path]
+    for key in set(corpus["themes"]) - seen_themes:
+        del corpus["themes"][key]
+
+    return data, parsed, rebuilt
+
+def write_outputs(corpus, data, data_dir, html=False, ids=False):
+    if html:
+        # Only the rebuilt themes are rendered: the others keep their "html" file
+        write_html_fragments(data, data_dir)
+    write_sharded_output(data, data_dir, corpus["shards"])
+    if ids:
+        write_id_index(data, data_dir)
+    outputs = served_outputs(os.path.basename(generate_json.OUTPUT_FILE), sharded=True, html=html, ids=ids)
+    version = write_data_manifest(data_dir, outputs)
+    remove_compressed(data_dir, os.path.basename(generate_json.OUTPUT_FILE), outputs)
+    return version
+
+def rebuild_and_write(corpus, data_dir, html=False, ids=False):
+    start = time.perf_counter()
+    try:
+        data, parsed, rebuilt = rebuild(corpus)
+        version = write_outputs(corpus, data, data_dir, html, ids)
+    except Exception as e:
+        # A file caught mid-save: the next change triggers another rebuild
+        print(f"Rebuild failed: {e}")
+        return None
+
+    elapsed = time.perf_counter() - start
+    print(f"Rebuilt in {elapsed * 1000:.0f} ms: {len(parsed)} file(s) parsed, "
+          f"{len(rebuilt)} theme(s) rebuilt{': ' + ', '.join(rebuilt) if len(rebuilt) <= 5 else ''}")
+    notify_reload(version)
+    return version
+
+def watch(html=False, ids=False, serve=True, host="127.0.0.1", port=8000, data_dir=None):
+    data_dir = data_dir or paths.DEV_DATA_DIR
+    os.makedirs(data_dir, exist_ok=True)
+
+    corpus = new_corpus()
+    last = snapshot()
+    rebuild_and_write(corpus, data_dir, html, ids)
+
+    if serve:
+        start_dev_server(paths.REPO_DIR, data_dir, host, port)
+    print(f"Watching {generate_json.BASE_DIR}, writing to {data_dir} (Ctrl+C to stop)")
+
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot()
+            if current == last:
+                continue
+
+            # Wait for the tree to settle before rebuilding
+            while True:
+                time.sleep(DEBOUNCE_SECONDS)
+                settled = snapshot()
+                if settled == current:
+                    break
+                current = settled
+
+            last = current
+            rebuild_and_write(corpus, data_dir, html, ids)
+    except KeyboardInterrupt:
+        print("Stopped watching")
+
+def add_arguments(parser):
+    parser.add_argument('--html', action='store_true', help="Also write the HTML fragments of rebuilt themes")
+    parser.add_argument('--ids', action='store_true',
+                        help="Also rewrite ids.json, so an open publication is restored after the reload")
+    parser.add_argument('--no-serve', action='store_true', help="Only rebuild, without the dev server")
+    parser.add_argument('--dev-data-dir', default=paths.DEV_DATA_DIR,
+                        help="Output directory of the rebuilds, served as /data/ (default: %(default)s)")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the sharded output on every change and live-reload the app")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    watch(args.html, args.ids, not args.no_serve, args.host, args.port, args.dev_data_dir)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+// ============================================
+// SERVICE WORKER
+// ============================================
+// Offline cache for the app shell and the data produced by scripts/generate_json.py.
+//
+// Shell (HTML, JS, CSS): served from cache, refreshed in the background.
+// Data: one cache per data version (data/version.json, scripts/data_manifest.py). When the
+// version changes, a new cache is filled with the files of the new manifest: files whose hash
+// did not change are copied from the current cache, only the others are downloaded. The new
+// version becomes current once complete; the previous cache is kept for pages still using it.
+
+const SHELL_CACHE = 'shin-shell-v1';
+const DATA_CACHE_PREFIX = 'shin-data-';
+const META_CACHE = 'shin-meta';
+const CURRENT_VERSION_KEY = 'current-data-version';
+const VERSION_URL = 'data/version.json';
+const DOWNLOAD_CONCURRENCY = 4;
+// Theme shards, search shards and HTML fragment files are named after the hash of their content
+const CONTENT_ADDRESSED_RE = /^(shards|search|html)\/[0-9a-f]{16}\.json$/;
+
+const SHELL_FILES = [
+    './',
+    'index.html',
+    'login.html',
+    'js/app.js',
+    'js/search-worker.js',
+    'style/styles.css'
+];
+
+let syncPromise = null;
+
+self.addEventListener('install', event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            .then(cache => cache.addAll(SHELL_FILES))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys
+                .filter(key => key.startsWith('shin-shell-') && key !== SHELL_CACHE)
+                .map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+            .then(() => { syncData(); })
+    );
+});
+
+self.addEventListener('fetch', event => {
+    const request = event.request;
+    if (request.method !== 'GET') return;
+
+    const url = new URL(request.url);
+    if (url.origin !== self.location.origin) return;
+
+    const path = url.pathname.slice(new URL(self.registration.scope).pathname.length);
+
+    if (path === VERSION_URL) {
+        event.respondWith(versionResponse(request));
+    } else if (path.startsWith('data/')) {
+        event.respondWith(dataResponse(request, path.slice('data/'.length)));
+    } else {
+        if (request.mode === 'navigate') {
+            // Each visit checks for a new data version, without delaying the page
+            event.waitUntil(syncData());
+        }
+        event.respondWith(shellResponse(request, event));
+    }
+});
+
+async function shellResponse(request, event) {
+    const cache = await caches.open(SHELL_CACHE);
+    const cached = await cache.match(request, { ignoreSearch: true });
+    const refresh = fetch(request)
+        .then(response => {
+            if (response.ok) cache.put(request, response.clone());
+            return response;
+        });
+
+    if (cached) {
+        event.waitUntil(refresh.catch(() => {}));
+        return cached;
+    }
+    return refresh;
+}
+
+// ---------- data versions ----------
+
+async function getCurrentVersion() {
+    const meta = await caches.open(META_CACHE);
+    const response = await meta.match(CURRENT_VERSION_KEY);
+    return response ? response.json() : null;   // the manifest of the current version
+}
+
+async function setCurrentVersion(manifest) {
+    const meta = await caches.open(META_CACHE);
+    await meta.put(CURRENT_VERSION_KEY, new Response(JSON.stringify(manifest)));
+}
+
+// Offline, version.json is the manifest of the current version: the one whose files are cached
+async function versionResponse(request) {
+    try {
+        return await fetch(request);
+    } catch (error) {
+        const current = await getCurrentVersion();
+        if (!current) throw error;
+        return new Response(JSON.stringify(current), { headers: { 'Content-Type': 'application/json' } });
+    }
+}
+
+// Data files are cached under their "data/..." URL
+async function dataResponse(request, dataPath) {
+    const current = await getCurrentVersion();
+    const currentKey = current ? DATA_CACHE_PREFIX + current.version : null;
+
+    // Current version first, then older ones (a page may still use the previous catalog).
+    // Only content-addressed files are taken from older versions: any other file missing from
+    // the current version was not written by the current build and must not be served stale.
+    const keys = CONTENT_ADDRESSED_RE.test(dataPath)
+        ? (await caches.keys()).filter(key => key.startsWith(DATA_CACHE_PREFIX) && key !== currentKey)
+        : [];
+    if (currentKey) keys.unshift(currentKey);
+    for (const key of keys) {
+        const cached = await (await caches.open(key)).match(request, { ignoreSearch: true });
+        if (cached) return cached;
+    }
+
+    const response = await fetch(request);
+    if (response.ok && current && current.files[dataPath]) {
+        (await caches.open(currentKey)).put(`data/${dataPath}`, response.clone());
+    }
+    return response;
+}
+
+function syncData() {
+    if (!syncPromise) {
+        syncPromise = runSync()
+            .catch(error => console.warn('Data sync failed:', error))
+            .finally(() => { syncPromise = null; });
+    }
+    return syncPromise;
+}
+
+async function runSync() {
+    const response = await fetch(VERSION_URL, { cache: 'no-store' });
+    if (!response.ok) return;
+    const manifest = await response.json();
+
+    const current = await getCurrentVersion();
+    if (current && current.version === manifest.version) return;
+
+    const newCache = await caches.open(DATA_CACHE_PREFIX + manifest.version);
+    const oldCache = current ? await caches.open(DATA_CACHE_PREFIX + current.version) : null;
+
+    const queue = Object.keys(manifest.files);
+    let downloaded = 0;
+
+    async function worker() {
+        while (queue.length > 0) {
+            const path = queue.shift();
+            const url = `data/${path}`;
+            if (await newCache.match(url)) continue;   // resumed sync
+
+            if (oldCache && current.files[path] === manifest.files[path]) {
+                const cached = await oldCache.match(url);
+                if (cached) {
+                    await newCache.put(url, cached);
+                    continue;
+                }
+            }
+
+            const fileResponse = await fetch(url, { cache: 'no-cache' });
+            if (!fileResponse.ok) throw new Error(`${path}: HTTP ${fileResponse.status}`);
+            await newCache.put(url, fileResponse);
+            downloaded++;
+        }
+    }
+    await Promise.all(Array.from({ length: DOWNLOAD_CONCURRENCY }, worker));
+
+    await setCurrentVersion(manifest);
+
+    // Keep the new version and the one just replaced
+    const keep = new Set([DATA_CACHE_PREFIX + manifest.version]);
+    if (current) keep.add(DATA_CACHE_PREFIX + current.version);
+    const keys = await caches.keys();
+    await Promise.all(keys
+        .filter(key => key.startsWith(DATA_CACHE_PREFIX) && !keep.has(key))
+        .map(key => caches.delete(key)));
+
+    const clients = await self.clients.matchAll();
+    clients.forEach(client => client.postMessage({
+        type: 'data-updated',
+        version: manifest.version,
+        downloaded,
+        total: Object.keys(manifest.files).length
+    }));
+}
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, SCRIPTS_DIR)
+
+import generate_json
+import split_markdown_groups
+
+SAMPLE_THEME = """# 浄霊の原理　１
+
+## **明主様御教え　「浄霊の原理」　（昭和24年5月～6月）**
+
+浄霊は**光**である。
+
+## **明主様御垂示　「水供養」　（昭和元年3月1日）**
+
+**信者の質問**
+
+水供養について
+
+# 霊界の構成
+
+## **明主様御教え　「霊界」　（昭和10年8月5日発行）**
+
+霊界は三段階に分かれている。
+"""
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    """A one-volume Markdown corpus under tmp_path/Markdown; the build globals are restored afterwards."""
+    for name in ("BASE_DIR", "OUTPUT_FILE", "MANIFEST_FILE", "CACHE_DIR"):
+        monkeypatch.setattr(generate_json, name, getattr(generate_json, name))
+    monkeypatch.setattr(split_markdown_groups, "BASE_DIR", split_markdown_groups.BASE_DIR)
+
+    markdown_dir = tmp_path / "Markdown"
+    volume_dir = markdown_dir / "1.経綸編"
+    volume_dir.mkdir(parents=True)
+    (volume_dir / "1 - 浄霊_edited.md").write_text(SAMPLE_THEME, encoding='utf-8')
+    (markdown_dir / "Indices").mkdir()
+    return markdown_dir
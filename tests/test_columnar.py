@@ -0,0 +1,16 @@
+import json
+
+import generate_json
+from columnar import ColumnarCorpus
+
+def test_round_trip_with_html(corpus, tmp_path):
+    data_dir = tmp_path / "data"
+    generate_json.configure(str(corpus), str(data_dir))
+    generate_json.convert_to_json(columnar=True, html=True)
+
+    with open(data_dir / "shin_college_data.json", encoding='utf-8') as f:
+        data = json.load(f)
+    assert all("html" in theme for volume in data for theme in volume["themes"])
+
+    with ColumnarCorpus(str(data_dir / "shin_college_data.shcc")) as columnar:
+        assert columnar.to_data() == data
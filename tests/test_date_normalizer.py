@@ -0,0 +1,24 @@
+import pytest
+
+from date_normalizer import normalize_date
+
+@pytest.mark.parametrize("raw, start, end", [
+    ("昭和24年5月～6月", "1949-05-01", "1949-06-30"),
+    ("昭和24年5月10日～20日", "1949-05-10", "1949-05-20"),
+    ("昭和24年5月10日～6月2日", "1949-05-10", "1949-06-02"),
+    ("昭和24年冬～3月", "1949-12-01", "1950-03-31"),
+    ("昭和23年10月～24年4月", "1948-10-01", "1949-04-30"),
+])
+def test_range_end_inherits_year_and_month(raw, start, end):
+    date = normalize_date(raw)
+    assert (date["precision"], date["start"], date["end"]) == ("range", start, end)
+
+@pytest.mark.parametrize("raw, start, end", [
+    ("昭和元年3月1日", "1926-03-01", "1926-03-01"),
+    ("大正元年", "1912-01-01", "1912-12-31"),
+    ("大正15年～昭和元年", "1926-01-01", "1926-12-31"),
+    ("昭和元年～2年", "1926-01-01", "1927-12-31"),
+])
+def test_gannen_is_first_year_of_era(raw, start, end):
+    date = normalize_date(raw)
+    assert (date["start"], date["end"]) == (start, end)
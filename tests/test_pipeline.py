@@ -0,0 +1,22 @@
+import json
+
+import pipeline
+
+def test_split_stages_keeps_option_values():
+    global_argv, stages = pipeline.split_stages(
+        ["--data-dir", "build", "insert", "x.md", "--target", "lint", "lint", "--rules", "build"])
+    assert global_argv == ["--data-dir", "build"]
+    assert stages == [("insert", ["x.md", "--target", "lint"]), ("lint", ["--rules", "build"])]
+
+def test_bench_then_build(corpus, tmp_path):
+    data_dir = tmp_path / "data"
+    status = pipeline.main([
+        "--markdown-dir", str(corpus), "--data-dir", str(data_dir),
+        "bench", "--scales", "1,2", "--work-dir", str(tmp_path / "bench"),
+        "--output", str(tmp_path / "bench.json"),
+        "build"])
+
+    assert status == 0
+    with open(data_dir / "shin_college_data.json", encoding='utf-8') as f:
+        data = json.load(f)
+    assert [volume["volume"] for volume in data] == ["1.経綸編"]